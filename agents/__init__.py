@@ -1,6 +1,11 @@
-# agents/__init__.py
 from .code_generator import BioCodeGenerator
+from .dose_response import DoseResponseAnalyzer
+from .schemas import AnalysisResult, VisionResult
 from .validator import ExperimentValidator
 from .vision_analyzer import GeminiVisionAnalyzer
+from .vision_store import VisionResultStore
 
-__all__ = ['BioCodeGenerator', 'ExperimentValidator', 'GeminiVisionAnalyzer']
+__all__ = [
+    'BioCodeGenerator', 'AnalysisResult', 'ExperimentValidator', 'DoseResponseAnalyzer',
+    'GeminiVisionAnalyzer', 'VisionResult', 'VisionResultStore'
+]
@@ -0,0 +1,240 @@
+"""Standard Curve 보정(calibration) 및 미지 시료 농도 역추정 (선형 / 4PL / 5PL)"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+from scipy.optimize import curve_fit
+
+CALIBRATION_MODELS = ('linear', '4pl', '5pl')
+
+
+def four_pl(x, bottom, top, ec50, hill):
+    """4-parameter logistic: hill > 0이면 증가, hill < 0이면 감소 곡선"""
+    with np.errstate(divide='ignore', over='ignore', invalid='ignore'):
+        return bottom + (top - bottom) / (1.0 + (ec50 / np.asarray(x, dtype=float)) ** hill)
+
+
+def five_pl(x, bottom, top, ec50, hill, asym):
+    """5-parameter logistic (비대칭 계수 asym, asym=1이면 4PL과 동일)"""
+    with np.errstate(divide='ignore', over='ignore', invalid='ignore'):
+        base = 1.0 + (ec50 / np.asarray(x, dtype=float)) ** hill
+        return bottom + (top - bottom) / base ** asym
+
+
+def inverse_four_pl(y, bottom, top, ec50, hill):
+    """4PL 역함수 (점근선 밖의 y는 NaN)"""
+    with np.errstate(divide='ignore', over='ignore', invalid='ignore'):
+        ratio = (top - bottom) / (np.asarray(y, dtype=float) - bottom) - 1.0
+        x = ec50 / ratio ** (1.0 / hill)
+    return np.where(ratio > 0, x, np.nan)
+
+
+def inverse_five_pl(y, bottom, top, ec50, hill, asym):
+    """5PL 역함수 (점근선 밖의 y는 NaN)"""
+    with np.errstate(divide='ignore', over='ignore', invalid='ignore'):
+        ratio = ((top - bottom) / (np.asarray(y, dtype=float) - bottom)) ** (1.0 / asym) - 1.0
+        x = ec50 / ratio ** (1.0 / hill)
+    return np.where(ratio > 0, x, np.nan)
+
+
+def logistic_initial_guess(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """
+    4PL 초기값 (bottom, top, ec50, hill)
+
+    bottom/top은 최소/최대 반응, ec50은 반응 중간값에 가장 가까운 농도(양수 농도 기준),
+    hill 부호는 농도-반응 상관의 부호로 정합니다.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    positive = x > 0
+    xp = x[positive] if positive.any() else np.abs(x) + 1e-12
+    yp = y[positive] if positive.any() else y
+    mid = (np.nanmin(y) + np.nanmax(y)) / 2
+    ec50 = xp[np.nanargmin(np.abs(yp - mid))]
+    direction = np.sign(np.corrcoef(np.log(xp), yp)[0, 1]) if len(xp) > 2 else 1.0
+    return np.array([np.nanmin(y), np.nanmax(y), ec50, direction if direction else 1.0])
+
+
+@dataclass
+class CalibrationCurve:
+    """적합된 Standard Curve (역추정/신뢰구간 계산에 필요한 통계 포함)"""
+
+    model: str
+    params: np.ndarray
+    covariance: np.ndarray
+    residual_std: float
+    dof: int
+    n: int
+    x_range: tuple
+    y_range: tuple
+    r_squared: float
+    extra: Dict[str, float] = field(default_factory=dict)
+
+    def predict(self, x) -> np.ndarray:
+        """농도 → 반응"""
+        if self.model == 'linear':
+            slope, intercept = self.params
+            return intercept + slope * np.asarray(x, dtype=float)
+        if self.model == '4pl':
+            return four_pl(x, *self.params)
+        return five_pl(x, *self.params)
+
+    def inverse(self, y, params: Optional[np.ndarray] = None) -> np.ndarray:
+        """반응 → 농도 (params를 주면 해당 모수로 계산, 기울기 계산용)"""
+        p = self.params if params is None else params
+        if self.model == 'linear':
+            slope, intercept = p
+            return (np.asarray(y, dtype=float) - intercept) / slope
+        if self.model == '4pl':
+            return inverse_four_pl(y, *p)
+        return inverse_five_pl(y, *p)
+
+    def inverse_predict(self, y, n_replicates: int = 1,
+                        confidence: float = 0.95) -> Dict[str, np.ndarray]:
+        """
+        미지 시료 반응값들을 한 번에 농도로 역추정
+
+        선형: 고전적 역추정 구간 (s/|b|)·sqrt(1/m + 1/n + (y0 - ȳ)² / (b²·Sxx))
+        4PL/5PL: 델타 방법 - 반응 측정오차(s²/m)와 모수 공분산을 모두 전파
+
+        Returns:
+            {'concentration', 'ci_lower', 'ci_upper', 'range_flag'} 배열
+            range_flag: 'ok' / 'below_range' / 'above_range' / 'no_solution'
+        """
+        y = np.asarray(y, dtype=float)
+        x0 = self.inverse(y)
+        t_crit = stats.t.ppf(0.5 + confidence / 2, max(self.dof, 1))
+        m = max(1, n_replicates)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if self.model == 'linear':
+                slope = self.params[0]
+                se = (self.residual_std / abs(slope)) * np.sqrt(
+                    1.0 / m + 1.0 / self.n
+                    + (y - self.extra['mean_y']) ** 2 / (slope ** 2 * self.extra['sxx'])
+                )
+            else:
+                se = self._delta_method_se(y, x0, m)
+
+        half_width = t_crit * se
+        lo, hi = self.x_range
+        flag = np.full(y.shape, 'ok', dtype=object)
+        flag[x0 < lo] = 'below_range'
+        flag[x0 > hi] = 'above_range'
+        flag[~np.isfinite(x0)] = 'no_solution'
+
+        return {
+            'concentration': x0,
+            'ci_lower': x0 - half_width,
+            'ci_upper': x0 + half_width,
+            'range_flag': flag
+        }
+
+    def _delta_method_se(self, y: np.ndarray, x0: np.ndarray, m: int) -> np.ndarray:
+        """역함수의 y 및 모수에 대한 수치 미분으로 표준오차 계산 (y 배열 전체 벡터화)"""
+        step_y = 1e-6 * max(1.0, abs(self.y_range[1] - self.y_range[0]))
+        dx_dy = (self.inverse(y + step_y) - self.inverse(y - step_y)) / (2 * step_y)
+        variance = dx_dy ** 2 * self.residual_std ** 2 / m
+
+        grads = []
+        for i, value in enumerate(self.params):
+            step = 1e-6 * max(1.0, abs(value))
+            p_hi = self.params.copy()
+            p_lo = self.params.copy()
+            p_hi[i] += step
+            p_lo[i] -= step
+            grads.append((self.inverse(y, p_hi) - self.inverse(y, p_lo)) / (2 * step))
+        grad = np.vstack(grads)  # (n_params, n_samples)
+        variance = variance + np.einsum('is,ij,js->s', grad, self.covariance, grad)
+        return np.sqrt(variance)
+
+
+def fit_calibration_curve(x, y, model: str = 'linear') -> CalibrationCurve:
+    """
+    Standard 농도(x)와 반응(y)으로 보정 곡선 적합
+
+    Args:
+        model: 'linear', '4pl', '5pl'
+
+    Raises:
+        ValueError: 지원하지 않는 모델이거나 측정점이 모수 수보다 적은 경우
+        RuntimeError: 4PL/5PL 적합이 수렴하지 않은 경우
+    """
+    if model not in CALIBRATION_MODELS:
+        raise ValueError(f"지원하지 않는 모델: {model} (가능: {', '.join(CALIBRATION_MODELS)})")
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    valid = np.isfinite(x) & np.isfinite(y)
+    x, y = x[valid], y[valid]
+
+    n_params = {'linear': 2, '4pl': 4, '5pl': 5}[model]
+    if len(x) <= n_params:
+        raise ValueError(f"{model} 적합에는 {n_params + 1}개 이상의 측정점이 필요합니다 (현재 {len(x)}개).")
+
+    extra = {}
+    if model == 'linear':
+        mean_x, mean_y = x.mean(), y.mean()
+        sxx = np.sum((x - mean_x) ** 2)
+        slope = np.sum((x - mean_x) * (y - mean_y)) / sxx
+        intercept = mean_y - slope * mean_x
+        params = np.array([slope, intercept])
+        residuals = y - (intercept + slope * x)
+        dof = len(x) - 2
+        s2 = np.sum(residuals ** 2) / dof
+        covariance = s2 * np.array([
+            [1.0 / sxx, -mean_x / sxx],
+            [-mean_x / sxx, 1.0 / len(x) + mean_x ** 2 / sxx]
+        ])
+        extra = {'mean_x': mean_x, 'mean_y': mean_y, 'sxx': sxx}
+    else:
+        p0 = logistic_initial_guess(x, y)
+        func = four_pl
+        lower = [-np.inf, -np.inf, 1e-12, -np.inf]
+        upper = [np.inf, np.inf, np.inf, np.inf]
+        if model == '5pl':
+            p0 = np.append(p0, 1.0)
+            func = five_pl
+            lower.append(1e-3)
+            upper.append(1e3)
+        try:
+            params, covariance = curve_fit(func, x, y, p0=p0, bounds=(lower, upper), maxfev=20000)
+        except (RuntimeError, ValueError) as e:
+            raise RuntimeError(f"{model.upper()} 곡선 적합 실패: {str(e)}")
+        residuals = y - func(x, *params)
+        dof = len(x) - n_params
+        covariance = np.nan_to_num(covariance, nan=0.0, posinf=0.0, neginf=0.0)
+
+    ss_res = float(np.sum(residuals ** 2))
+    ss_tot = float(np.sum((y - y.mean()) ** 2))
+    return CalibrationCurve(
+        model=model,
+        params=np.asarray(params, dtype=float),
+        covariance=np.asarray(covariance, dtype=float),
+        residual_std=float(np.sqrt(ss_res / dof)),
+        dof=dof,
+        n=len(x),
+        x_range=(float(x.min()), float(x.max())),
+        y_range=(float(y.min()), float(y.max())),
+        r_squared=1.0 - ss_res / ss_tot if ss_tot > 0 else float('nan'),
+        extra=extra
+    )
+
+
+def calibration_params_frame(curves: Dict) -> pd.DataFrame:
+    """곡선별 모수/적합도를 DataFrame으로 정리"""
+    names = {
+        'linear': ['slope', 'intercept'],
+        '4pl': ['bottom', 'top', 'ec50', 'hill'],
+        '5pl': ['bottom', 'top', 'ec50', 'hill', 'asym']
+    }
+    rows = []
+    for key, curve in curves.items():
+        row = {'curve': key, 'model': curve.model, 'n': curve.n,
+               'r_squared': curve.r_squared, 'residual_std': curve.residual_std}
+        row.update(dict(zip(names[curve.model], curve.params)))
+        rows.append(row)
+    return pd.DataFrame(rows)
@@ -2,21 +2,37 @@
 import os
 import google.generativeai as genai
 from dotenv import load_dotenv
-from typing import Optional
-import re
+from typing import Optional, List, Tuple, Dict, Iterator, Union
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from google.api_core import exceptions as google_exceptions
 
+from .context_cache import PromptContextCache
+from .model_router import ModelRouter
+from .qpcr import STANDALONE_IMPORT as QPCR_STANDALONE_IMPORT, is_qpcr_request
+from .schemas import AnalysisResult, SchemaValidationError, ANALYSIS_RESPONSE_SCHEMA, \
+    supports_response_schema
+from utils.data_profiler import DataProfile
+
 load_dotenv()
 
 class BioCodeGenerator:
     """Google Gemini를 활용한 바이오 실험 코드 생성기"""
     
-    def __init__(self, model_name: str = "gemini-2.5-flash"):
+    def __init__(
+        self,
+        model_name: str = "gemini-2.5-flash",
+        auto_route: bool = True,
+        fallback_models: Optional[List[str]] = None,
+        use_context_cache: bool = True
+    ):
         """
         Args:
             model_name: 'gemini-2.0-flash' (빠름, 추천) 또는
                        'gemini-2.5-flash' (비전 가능)
+            auto_route: True면 요청 복잡도에 따라 모델을 자동 선택
+            fallback_models: 할당량/지연 오류 시 자동 대체할 모델 목록
+            use_context_cache: True면 정적 접두부에 Gemini 서버 캐시 사용 (가능한 경우)
         """
         # API 키 설정 - Streamlit secrets 우선, 그 다음 .env
         api_key = None
@@ -40,16 +56,29 @@ class BioCodeGenerator:
         genai.configure(api_key=api_key)
         
         # 모델 초기화 (JSON 모드 지원을 위해 config 확장)
-        self.model = genai.GenerativeModel(
-            model_name=model_name,
-            generation_config={
-                "temperature": 0.2, # Lower temperature for more stable code
-                "top_p": 0.95,
-                "top_k": 40,
-                "max_output_tokens": 8192,
-                "response_mime_type": "application/json"
-            }
+        self.generation_config = {
+            "temperature": 0.2,  # Lower temperature for more stable code
+            "top_p": 0.95,
+            "top_k": 40,
+            "max_output_tokens": 8192,
+            "response_mime_type": "application/json"
+        }
+        # SDK가 지원하면 서버 측에서 응답 스키마를 강제
+        if supports_response_schema():
+            self.generation_config["response_schema"] = ANALYSIS_RESPONSE_SCHEMA
+        self._models = {}
+        self.model_name = model_name
+        self.model = self._get_model(model_name)
+
+        # 복잡도 기반 라우팅 + 할당량/지연 오류 시 자동 대체
+        self.router = ModelRouter(
+            primary_model=model_name,
+            models=fallback_models or [ModelRouter.STRONG_MODEL, ModelRouter.FAST_MODEL],
+            auto_route=auto_route
         )
+
+        # 정적 프롬프트 접두부 캐시 (SDK 미지원 시 로컬 에뮬레이션)
+        self.context_cache = PromptContextCache(use_remote=use_context_cache)
         
         # 시스템 프롬프트 (v7.0 - Student-Friendly Educational Analysis)
         self.system_instruction = """
@@ -127,6 +156,20 @@ fig_resid.add_hline(y=0, line_dash='dash', line_color='red')
 fig_resid
 ```
 
+**qPCR (Ct 값) 상대 정량 [Python]:**
+- ΔΔCt/fold change는 직접 구현하지 말고 내장 엔진 `agents.qpcr.delta_delta_ct`를 사용
+  (참조 유전자 정규화, 기술 반복 집계, 효율 보정, 오차 전파, 플레이트별 대조군 처리 포함)
+```python
+from agents.qpcr import delta_delta_ct
+
+qpcr = delta_delta_ct(df, sample_col='Sample', gene_col='Target', ct_col='Ct',
+                      reference_genes=['GAPDH'], control_sample='Control',
+                      plate_col=None, efficiencies=None)  # 예: {'IL6': 1.95}
+결과표 = qpcr['results']  # fold_change, fold_change_low/high (±1 SE), delta_delta_ct
+print(결과표)
+print(qpcr['warnings'])
+```
+
 **기술적 요구사항:**
 - 모든 코드는 **복사-붙여넣기 후 바로 실행 가능**해야 함
 - Plotly 사용 시 `fig.show()`가 아닌 `fig`만 작성 (Quarto가 자동 렌더링)
@@ -145,24 +188,97 @@ fig_resid
         self, 
         user_input: str, 
         language: str = "python",
-        data_info: Optional[str] = None,
-        target_variable: Optional[str] = None
-    ) -> dict:
+        data_info: Union[str, DataProfile, None] = None,
+        target_variable: Optional[str] = None,
+        complexity: Optional[str] = None
+    ) -> AnalysisResult:
         """
         사용자 입력을 분석 코드로 변환
         
         Args:
             user_input: "PCR 결과를 CT 값으로 비교하고 싶어요"
             language: "python" 또는 "r"
-            data_info: 데이터 상세 프로필 (stats, dtypes 포함)
+            data_info: 데이터 상세 프로필 (DataProfile 또는 get_data_profile 텍스트)
             target_variable: 분석의 핵심이 되는 종속 변수명
+            complexity: 'simple' 또는 'complex' (None이면 요청 내용으로 자동 판단)
         """
         
-        prompt = f"""
-{self.system_instruction}
+        columns = data_info.column_names if isinstance(data_info, DataProfile) else []
+        if isinstance(data_info, DataProfile):
+            data_info = data_info.to_markdown()
+
+        # 세션/데이터셋 동안 변하지 않는 접두부와 요청마다 바뀌는 변경분을 분리
+        prefix = self._build_static_prefix(data_info)
+        delta = f"""
+**[분석 설정]**
+- 언어: {language.upper()}
+- 종속 변수(Target): {target_variable if target_variable else "미지정 (사용자 요청에 따라 판단)"}
 
 **[사용자 요청]**
 {user_input}
+"""
+        # qPCR 요청에만 독립 실행용 import 블록을 덧붙임 (공유 접두부는 작게 유지)
+        if language == "python" and is_qpcr_request(user_input, columns):
+            delta += f"""
+**[qPCR 코드 독립 실행]**
+`from agents.qpcr import delta_delta_ct` 대신 아래 블록을 코드 맨 앞에 그대로 넣어
+앱 밖에서도 실행되게 하세요.
+```python
+{QPCR_STANDALONE_IMPORT}```
+"""
+
+        try:
+            # JSON 모드를 명시적으로 요청하는 프롬프트 습합
+            json_delta = delta + "\n\nIMPORTANT: Respond strictly in JSON format."
+
+            # 라우터가 고른 모델 순서대로 호출 (할당량/지연 오류 시 다음 모델로 대체)
+            full_text, model_used = self._generate_with_fallback(
+                prefix,
+                json_delta,
+                complexity or self.router.classify(user_input)
+            )
+
+            # 스키마 검증은 여기서 한 번만 수행 (이후 단계는 AnalysisResult를 그대로 사용)
+            result = AnalysisResult.from_response(full_text, language=language, model=model_used)
+
+            # [핵심] 코드 정밀 세척 (Detox)
+            result.code = self._detox_code(result.code, language)
+
+            return result
+
+        except SchemaValidationError as e:
+            raise RuntimeError(f"Gemini 응답 형식 오류 (JSON 스키마 불일치): {str(e)}")
+        except RuntimeError:
+            # Re-raise our custom errors (rate limit messages)
+            raise
+        except Exception as e:
+            error_str = str(e)
+            # Check if it's a rate limit error that we didn't catch
+            if "429" in error_str or "quota" in error_str.lower() or "rate" in error_str.lower():
+                retry_seconds = self._extract_retry_delay(error_str)
+                raise RuntimeError(
+                    f"❌ API 할당량 초과 (대체 모델 {', '.join(self.router.models)} 모두 실패)\n\n"
+                    f"**오류 내용:**\n{error_str}\n\n"
+                    f"**해결 방법:**\n"
+                    f"1. 약 {retry_seconds}초 후 다시 시도하세요\n"
+                    f"2. 할당량 확인: https://ai.dev/usage?tab=rate-limit\n"
+                    f"3. Free tier는 하루 20회 제한이 있습니다"
+                )
+            raise RuntimeError(f"Gemini API 호출 및 데이터 처리 실패: {str(e)}")
+    
+    def _get_model(self, model_name: str):
+        """모델 인스턴스를 이름별로 재사용"""
+        if model_name not in self._models:
+            self._models[model_name] = genai.GenerativeModel(
+                model_name=model_name,
+                generation_config=self.generation_config
+            )
+        return self._models[model_name]
+
+    def _build_static_prefix(self, data_info: Optional[str]) -> str:
+        """system_instruction + 데이터 프로필 + 공통 지시 사항 (요청 간 동일한 부분)"""
+        return f"""
+{self.system_instruction}
 
 **[중요: 요청 분석 가이드]**
 - 사용자 요청이 "A, B에 따른 C 회귀 분석" 형태라면:
@@ -171,10 +287,6 @@ fig_resid
   * 반드시 이 변수들을 정확히 사용하여 회귀모델을 구축하세요
 - 예: "dev, exp에 따른 cd 회귀 분석" → X=['dev', 'exp'], y='cd'
 
-**[분석 설정]**
-- 언어: {language.upper()}
-- 종속 변수(Target): {target_variable if target_variable else "미지정 (사용자 요청에 따라 판단)"}
-
 **[데이터 상세 프로필]**
 {data_info if data_info else "사용자가 제공한 data.csv 파일"}
 
@@ -192,75 +304,39 @@ fig_resid
 3. 시각화는 산점도, 박스플롯 등 데이터 관계를 가장 잘 보여주는 형식을 선택하세요.
 4. 모든 코드는 실행 가능해야 하며, 데이터 로드 경로는 'data.csv'로 가정하거나 data_info에 언급된 내용을 참고하세요.
 5. 반드시 JSON 형식으로만 응답하세요.
+6. 아래 [분석 설정]과 [사용자 요청]에 따라 코드를 작성하세요.
 """
 
-        # 변수 초기화 (모든 경로에서 사용 가능하도록 함수 시작 부분에 배치)
-        code = ""
-        interpretation = ""
-        warnings = ""
-
-        try:
-            # JSON 모드를 명시적으로 요청하는 프롬프트 습합
-            json_prompt = prompt + "\n\nIMPORTANT: Respond strictly in JSON format."
-
-            # Direct API call - let exceptions bubble up for handling
-            response = self.model.generate_content(json_prompt)
-            full_text = response.text
-
-            # JSON 파싱
-            import json
+    def _generate_with_fallback(self, prefix: str, delta: str,
+                                complexity: str) -> Tuple[str, str]:
+        """
+        라우터 순서대로 모델을 호출하고 (응답 텍스트, 사용한 모델명)을 반환
 
+        정적 접두부는 컨텍스트 캐시를 거쳐 한 번만 등록되고 이후에는 delta만 전송됩니다.
+        할당량(429)이나 시간 초과 오류는 다음 모델로 넘어가고,
+        그 외 오류와 마지막 모델의 오류는 그대로 전달됩니다.
+        """
+        last_error = None
+        for model_name in self.router.candidates(complexity):
+            start = time.perf_counter()
             try:
-                data = json.loads(full_text)
-                code_raw = data.get('code', '')
-                interpretation = data.get('interpretation', '')
-                warnings = data.get('warnings', '')
-
-                # Handle case where code might be returned as a list
-                if isinstance(code_raw, list):
-                    code = '\n'.join(str(item) for item in code_raw)
-                else:
-                    code = str(code_raw) if code_raw else ''
-
-            except json.JSONDecodeError:
-                # Fallback: 기존의 텍스트 파싱 로직 (만약 JSON 모드가 실패할 경우 대비)
-                code_pattern = rf"```(?:{language}|[a-zA-Z]+)?(.*?)```"
-                code_matches = re.findall(code_pattern, full_text, re.DOTALL | re.IGNORECASE)
-                code = max(code_matches, key=len).strip() if code_matches else full_text
-
-                interp_match = re.search(r'"interpretation":\s*"(.*?)"', full_text, re.DOTALL)
-                interpretation = interp_match.group(1) if interp_match else ""
-                warnings = ""
-
-            # [핵심] 코드 정밀 세척 (Detox)
-            code = self._detox_code(code, language)
-            
-            return {
-                'code': code,
-                'interpretation': interpretation,
-                'warnings': warnings,
-                'raw_response': full_text
-            }
-            
-        except RuntimeError:
-            # Re-raise our custom errors (rate limit messages)
-            raise
-        except Exception as e:
-            error_str = str(e)
-            # Check if it's a rate limit error that we didn't catch
-            if "429" in error_str or "quota" in error_str.lower() or "rate" in error_str.lower():
-                retry_seconds = self._extract_retry_delay(error_str)
-                raise RuntimeError(
-                    f"❌ API 할당량 초과\n\n"
-                    f"**오류 내용:**\n{error_str}\n\n"
-                    f"**해결 방법:**\n"
-                    f"1. 약 {retry_seconds}초 후 다시 시도하세요\n"
-                    f"2. 사이드바에서 모델을 'gemini-2.0-flash'로 변경해보세요\n"
-                    f"3. 할당량 확인: https://ai.dev/usage?tab=rate-limit\n"
-                    f"4. Free tier는 하루 20회 제한이 있습니다"
+                response = self.context_cache.generate_content(
+                    model_name, prefix, delta,
+                    self.generation_config, self._get_model(model_name)
                 )
-            raise RuntimeError(f"Gemini API 호출 및 데이터 처리 실패: {str(e)}")
-    
+                text = response.text
+            except Exception as e:
+                retry_delay = self._extract_retry_delay(str(e)) \
+                    if ModelRouter.is_quota_error(e) else None
+                self.router.record_failure(model_name, e, retry_delay)
+                if not ModelRouter.is_retryable(e):
+                    raise
+                last_error = e
+                continue
+            self.router.record_success(model_name, time.perf_counter() - start)
+            return text, model_name
+        raise last_error
+
     def _extract_retry_delay(self, error_str: str) -> int:
         """Extract retry delay in seconds from error message"""
         import re
@@ -286,28 +362,8 @@ fig_resid
         """뭉친 코드 분해 및 텍스트 자동 주석 처리 (v4.3)"""
         if not code: return ""
 
-        # 0. JSON 구조가 남아있다면 제거
-        import json
         import re
 
-        # Check if code starts with { (JSON object)
-        code_stripped = code.strip()
-        if code_stripped.startswith('{') and '"code"' in code_stripped:
-            try:
-                # Try to parse as JSON and extract code field
-                json_obj = json.loads(code_stripped)
-                if isinstance(json_obj, dict) and 'code' in json_obj:
-                    code = json_obj['code']
-                    if isinstance(code, list):
-                        code = '\n'.join(str(item) for item in code)
-            except:
-                # If JSON parsing fails, try regex extraction
-                code_match = re.search(r'"code"\s*:\s*"([^"]*(?:\\.[^"]*)*)"', code_stripped, re.DOTALL)
-                if code_match:
-                    code = code_match.group(1)
-                    # Unescape JSON strings
-                    code = code.replace('\\n', '\n').replace('\\t', '\t').replace('\\"', '"')
-
         # 1. 문자열 정규화
         code = code.replace("```", "").strip()
         
@@ -387,9 +443,9 @@ fig_resid
         user_input: str,
         previous_code: list,
         language: str = "python",
-        data_info: Optional[str] = None,
+        data_info: Union[str, DataProfile, None] = None,
         target_variable: Optional[str] = None
-    ) -> dict:
+    ) -> AnalysisResult:
         """
         이전 분석을 고려한 연속 코드 생성
         """
@@ -409,9 +465,59 @@ fig_resid
 위 분석을 기반으로 다음 단계를 진행하세요.
 """
         
+        # 이전 분석을 이어가는 요청은 다단계 분석이므로 상위 모델로 보냄
         return self.generate_analysis_code(
             enhanced_prompt, 
             language=language, 
             data_info=data_info, 
-            target_variable=target_variable
+            target_variable=target_variable,
+            complexity='complex'
         )
+
+    def generate_batch(
+        self,
+        requests: List[Dict],
+        language: str = "python",
+        data_info: Union[str, DataProfile, None] = None,
+        target_variable: Optional[str] = None,
+        max_workers: int = 3
+    ) -> Iterator[Dict]:
+        """
+        여러 분석 요청(템플릿)을 동시에 생성하고 완료되는 순서대로 반환
+
+        Args:
+            requests: [{'caption': str, 'prompt': str}, ...]
+            max_workers: 동시에 실행할 최대 Gemini 호출 수
+
+        Yields:
+            {
+                'request': dict,    # 입력 요청
+                'result': AnalysisResult,  # 생성 결과 (실패 시 None)
+                'error': str,       # 실패 시 오류 메시지
+                'elapsed': float    # 소요 시간 (초)
+            }
+        """
+        if isinstance(data_info, DataProfile):
+            # 모든 요청이 같은 프롬프트 텍스트를 쓰므로 한 번만 변환
+            data_info = data_info.to_markdown()
+
+        def _run(request: Dict) -> Dict:
+            start = time.perf_counter()
+            outcome = {'request': request, 'result': None, 'error': ''}
+            try:
+                outcome['result'] = self.generate_analysis_code(
+                    request['prompt'],
+                    language=language,
+                    data_info=data_info,
+                    target_variable=target_variable,
+                    complexity=request.get('complexity')
+                )
+            except Exception as e:
+                outcome['error'] = str(e)
+            outcome['elapsed'] = time.perf_counter() - start
+            return outcome
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+            futures = [pool.submit(_run, request) for request in requests]
+            for future in as_completed(futures):
+                yield future.result()
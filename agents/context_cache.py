@@ -0,0 +1,189 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Dict, Optional, Tuple
+
+import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
+
+
+class PromptContextCache:
+    """
+    정적 프롬프트 접두부(system_instruction + 데이터 프로필) 캐시
+
+    세션/데이터셋마다 변하지 않는 접두부를 한 번만 등록하고 이후 요청에는
+    변경분(delta)만 보냅니다. SDK가 Gemini Context Caching(`genai.caching`)을
+    지원하면 서버 캐시를 사용하고, 지원하지 않거나 생성에 실패하면 로컬 에뮬레이션으로
+    동작합니다. 로컬 모드에서는 전체 프롬프트를 보내지만 재사용 횟수와 절약 가능한
+    문자/토큰 수를 기록하므로 오프라인에서도 절감 효과를 측정할 수 있습니다.
+
+    서버 캐시는 TTL이 지나기 직전이나 서버에서 찾을 수 없을 때(NotFound) 다시 만들고,
+    LRU로 밀려나거나 무효화된 항목의 서버 캐시는 삭제합니다.
+    """
+
+    CHARS_PER_TOKEN = 3  # 한글/영문 혼합 프롬프트의 대략적인 토큰 환산 비율
+    EXPIRY_MARGIN_SECONDS = 30  # 만료 직전 요청이 NotFound로 실패하지 않도록 미리 재생성
+
+    def __init__(self, use_remote: bool = True, ttl_minutes: int = 60, max_entries: int = 32):
+        """
+        Args:
+            use_remote: True면 가능한 경우 Gemini 서버 측 캐시 사용
+            ttl_minutes: 서버 캐시 유지 시간 (분)
+            max_entries: 보관할 최대 접두부 수 (LRU 방식으로 제거)
+        """
+        self.use_remote = use_remote and hasattr(genai, 'caching')
+        self.ttl_minutes = ttl_minutes
+        self.max_entries = max_entries
+
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {
+            'registrations': 0,
+            'hits': 0,
+            'remote_failures': 0,
+            'remote_rebuilds': 0,
+            'chars_saved': 0
+        }
+
+    @staticmethod
+    def make_key(model_name: str, prefix: str) -> str:
+        """모델명 + 접두부 내용으로 캐시 키 생성 (서버 캐시는 모델별로 분리됨)"""
+        digest = hashlib.sha256(prefix.encode('utf-8')).hexdigest()[:16]
+        return f"{model_name}:{digest}"
+
+    def resolve(self, model_name: str, prefix: str, delta: str,
+                generation_config: Dict, default_model) -> Tuple[object, str]:
+        """
+        호출에 사용할 (모델, 프롬프트)를 반환
+
+        서버 캐시가 있으면 캐시된 모델과 delta만, 없으면 기본 모델과 전체 프롬프트를 돌려줍니다.
+        만료된 서버 캐시는 다시 만들고, 재생성에 실패하면 전체 프롬프트로 대체합니다.
+        """
+        key = self.make_key(model_name, prefix)
+        evicted = []
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                entry['hits'] += 1
+                entry['last_used'] = time.time()
+                self._counters['hits'] += 1
+                self._counters['chars_saved'] += len(prefix)
+            else:
+                entry = {
+                    'key': key,
+                    'model_name': model_name,
+                    'prefix_chars': len(prefix),
+                    'hits': 0,
+                    'created_at': time.time(),
+                    'last_used': time.time(),
+                    'remote_model': None,
+                    'remote_cache': None,
+                    'expires_at': None
+                }
+                self._entries[key] = entry
+                self._counters['registrations'] += 1
+                while len(self._entries) > self.max_entries:
+                    evicted.append(self._entries.popitem(last=False)[1])
+
+        for old_entry in evicted:
+            self._delete_remote(old_entry)
+
+        rebuild = False
+        if entry['remote_model'] is not None and time.time() >= entry['expires_at']:
+            self._delete_remote(entry)
+            rebuild = True
+
+        if self.use_remote and entry['remote_model'] is None and (entry['hits'] == 0 or rebuild):
+            self._create_remote(entry, prefix, generation_config)
+            if rebuild:
+                with self._lock:
+                    self._counters['remote_rebuilds'] += 1
+
+        if entry['remote_model'] is not None:
+            return entry['remote_model'], delta
+        return default_model, prefix + delta
+
+    def generate_content(self, model_name: str, prefix: str, delta: str,
+                         generation_config: Dict, default_model):
+        """
+        resolve()로 고른 모델에 프롬프트를 보내고 응답을 반환
+
+        서버 캐시가 TTL 전에 삭제되어 NotFound가 나면 해당 항목을 만료 처리하고
+        캐시를 다시 만들어(실패 시 전체 프롬프트) 한 번만 재시도합니다.
+        """
+        model, prompt = self.resolve(model_name, prefix, delta, generation_config, default_model)
+        try:
+            return model.generate_content(prompt)
+        except google_exceptions.NotFound:
+            if model is default_model:
+                raise
+            self._expire(self.make_key(model_name, prefix))
+        model, prompt = self.resolve(model_name, prefix, delta, generation_config, default_model)
+        return model.generate_content(prompt)
+
+    def _create_remote(self, entry: Dict, prefix: str, generation_config: Dict):
+        """서버 측 캐시를 만들어 항목에 연결 (최소 토큰 수 미달 등으로 실패하면 연결하지 않음)"""
+        try:
+            cached = genai.caching.CachedContent.create(
+                model=f"models/{entry['model_name']}",
+                system_instruction=prefix,
+                ttl=timedelta(minutes=self.ttl_minutes)
+            )
+            remote_model = genai.GenerativeModel.from_cached_content(
+                cached_content=cached,
+                generation_config=generation_config
+            )
+        except Exception:
+            with self._lock:
+                self._counters['remote_failures'] += 1
+            return
+        entry['remote_cache'] = cached
+        entry['expires_at'] = time.time() + self.ttl_minutes * 60 - self.EXPIRY_MARGIN_SECONDS
+        entry['remote_model'] = remote_model
+
+    @staticmethod
+    def _delete_remote(entry: Dict):
+        """항목에 연결된 서버 캐시 삭제 (이미 만료/삭제된 경우의 오류는 무시)"""
+        cached = entry['remote_cache']
+        entry['remote_model'] = None
+        entry['remote_cache'] = None
+        if cached is None:
+            return
+        try:
+            cached.delete()
+        except Exception:
+            pass
+
+    def _expire(self, key: str):
+        """서버 캐시를 즉시 만료 처리 (다음 resolve에서 재생성)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry['remote_model'] is not None:
+                entry['expires_at'] = 0.0
+
+    def invalidate(self, model_name: Optional[str] = None):
+        """캐시 항목 제거 (model_name 지정 시 해당 모델만, 연결된 서버 캐시도 삭제)"""
+        with self._lock:
+            removed = [
+                self._entries.pop(key) for key in list(self._entries)
+                if model_name is None or self._entries[key]['model_name'] == model_name
+            ]
+        for entry in removed:
+            self._delete_remote(entry)
+
+    def stats(self) -> Dict:
+        """재사용 횟수와 절약된 접두부 크기 (로컬 에뮬레이션 기준 추정치 포함)"""
+        with self._lock:
+            return {
+                'mode': 'remote' if self.use_remote else 'local',
+                'entries': len(self._entries),
+                'registrations': self._counters['registrations'],
+                'hits': self._counters['hits'],
+                'remote_failures': self._counters['remote_failures'],
+                'remote_rebuilds': self._counters['remote_rebuilds'],
+                'chars_saved': self._counters['chars_saved'],
+                'approx_tokens_saved': self._counters['chars_saved'] // self.CHARS_PER_TOKEN
+            }
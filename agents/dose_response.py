@@ -0,0 +1,175 @@
+"""화합물별 용량-반응(4PL) 곡선 병렬 적합"""
+
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from scipy.optimize import OptimizeWarning, curve_fit
+
+from .calibration import four_pl
+
+
+def _fit_chunk(chunk: List[Dict]) -> List[Dict]:
+    """
+    화합물 묶음을 순차 적합 (프로세스 풀 작업 단위)
+
+    각 항목: {'compound', 'dose', 'response', 'p0'}
+    수렴하지 않는 곡선은 status='failed'로 표시하고 건너뜁니다.
+    """
+    results = []
+    for item in chunk:
+        dose, response = item['dose'], item['response']
+        row = {'compound': item['compound'], 'n': len(dose), 'status': 'ok', 'message': ''}
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', OptimizeWarning)
+                params, cov = curve_fit(
+                    four_pl, dose, response, p0=item['p0'],
+                    bounds=([-np.inf, -np.inf, 1e-12, -20], [np.inf, np.inf, np.inf, 20]),
+                    maxfev=5000
+                )
+        except (RuntimeError, ValueError) as e:
+            row.update(status='failed', message=str(e)[:200])
+            results.append(row)
+            continue
+
+        fitted = four_pl(dose, *params)
+        ss_res = float(np.sum((response - fitted) ** 2))
+        ss_tot = float(np.sum((response - response.mean()) ** 2))
+        perr = np.sqrt(np.clip(np.diag(cov), 0, None)) if np.all(np.isfinite(cov)) \
+            else np.full(4, np.nan)
+        row.update(
+            bottom=params[0], top=params[1], ec50=params[2], hill_slope=params[3],
+            ec50_std_err=perr[2], hill_std_err=perr[3],
+            r_squared=1.0 - ss_res / ss_tot if ss_tot > 0 else np.nan,
+            rmse=np.sqrt(ss_res / len(dose))
+        )
+        results.append(row)
+    return results
+
+
+class DoseResponseAnalyzer:
+    """화합물 스크리닝 데이터의 4PL 용량-반응 곡선을 병렬로 적합"""
+
+    def __init__(self, max_workers: Optional[int] = None,
+                 chunk_size: int = 32, min_points: int = 5,
+                 min_r_squared: float = 0.9):
+        """
+        Args:
+            max_workers: 프로세스 수 (None이면 CPU 코어 수)
+            chunk_size: 프로세스 하나에 한 번에 넘길 화합물 수
+            min_points: 적합에 필요한 최소 측정점 수 (미만이면 건너뜀, 4PL 매개변수 4개보다
+                        많아야 하므로 5 이상)
+            min_r_squared: fit_quality='good'으로 판정할 최소 R²
+        """
+        if min_points < 5:
+            raise ValueError(f"min_points는 5 이상이어야 합니다 (4PL 매개변수 4개): {min_points}")
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunk_size = max(1, chunk_size)
+        self.min_points = min_points
+        self.min_r_squared = min_r_squared
+
+    def initial_guesses(self, df: pd.DataFrame, compound_col: str,
+                        dose_col: str, response_col: str) -> pd.DataFrame:
+        """
+        모든 화합물의 4PL 초기값을 groupby 연산으로 한 번에 계산
+
+        bottom/top = 최소/최대 반응, ec50 = 반응이 중간값에 가장 가까운 용량,
+        hill 부호 = log(용량)과 반응의 상관 부호 (감소 곡선이면 음수)
+        """
+        data = df[[compound_col, dose_col, response_col]].dropna()
+        data = data[data[dose_col] > 0].reset_index(drop=True)  # 중복 인덱스에도 행 위치로 조회
+        grouped = data.groupby(compound_col, sort=False, observed=True)
+
+        bottom = grouped[response_col].min()
+        top = grouped[response_col].max()
+        mid = (grouped[response_col].transform('min') + grouped[response_col].transform('max')) / 2
+        distance = (data[response_col] - mid).abs()
+        nearest = distance.groupby(data[compound_col], sort=False).idxmin()
+        ec50 = data.iloc[nearest.to_numpy()].set_index(compound_col)[dose_col]
+
+        log_dose = np.log(data[dose_col])
+        d_log = log_dose - log_dose.groupby(data[compound_col], sort=False).transform('mean')
+        d_resp = data[response_col] - grouped[response_col].transform('mean')
+        covariance = (d_log * d_resp).groupby(data[compound_col], sort=False).sum()
+        hill = np.sign(covariance).replace(0, 1.0)
+
+        return pd.DataFrame({
+            'bottom': bottom, 'top': top, 'ec50': ec50, 'hill': hill,
+            'n': grouped.size(),
+            'dose_min': grouped[dose_col].min(),
+            'dose_max': grouped[dose_col].max()
+        })
+
+    def fit(self, df: pd.DataFrame, compound_col: str, dose_col: str,
+            response_col: str, parallel: bool = True) -> pd.DataFrame:
+        """
+        화합물별 4PL 적합
+
+        Args:
+            parallel: True면 화합물을 chunk_size 단위로 나눠 여러 프로세스에서 적합
+
+        Returns:
+            화합물당 1행 DataFrame: ['compound', 'n', 'status', 'message', 'bottom', 'top',
+            'ec50', 'hill_slope', 'ec50_std_err', 'hill_std_err', 'r_squared', 'rmse',
+            'direction', 'ic50', 'ec50_extrapolated', 'fit_quality']
+            status는 'ok' / 'failed'(수렴 실패) / 'skipped'(측정점 부족),
+            행 순서는 입력에서 화합물이 처음 등장한 순서
+        """
+        guesses = self.initial_guesses(df, compound_col, dose_col, response_col)
+        data = df[[compound_col, dose_col, response_col]].dropna()
+        data = data[data[dose_col] > 0]
+        positions = data.groupby(compound_col, sort=False, observed=True).indices
+        dose_all = data[dose_col].to_numpy(dtype=float)
+        response_all = data[response_col].to_numpy(dtype=float)
+
+        jobs, skipped = [], []
+        for compound, guess in guesses.iterrows():
+            if guess['n'] < self.min_points:
+                skipped.append({
+                    'compound': compound,
+                    'n': int(guess['n']),
+                    'status': 'skipped',
+                    'message': f"측정점 {int(guess['n'])}개 (최소 {self.min_points}개 필요)"
+                })
+                continue
+            rows = positions[compound]
+            jobs.append({
+                'compound': compound,
+                'dose': dose_all[rows],
+                'response': response_all[rows],
+                'p0': guess[['bottom', 'top', 'ec50', 'hill']].to_numpy(dtype=float)
+            })
+
+        chunks = [jobs[i:i + self.chunk_size] for i in range(0, len(jobs), self.chunk_size)]
+        if parallel and self.max_workers > 1 and len(chunks) > 1:
+            with ProcessPoolExecutor(max_workers=min(self.max_workers, len(chunks))) as pool:
+                fitted = [row for rows in pool.map(_fit_chunk, chunks) for row in rows]
+        else:
+            fitted = [row for chunk in chunks for row in _fit_chunk(chunk)]
+
+        columns = ['compound', 'n', 'status', 'message', 'bottom', 'top', 'ec50', 'hill_slope',
+                   'ec50_std_err', 'hill_std_err', 'r_squared', 'rmse']
+        order = {compound: i for i, compound in enumerate(guesses.index)}
+        rows = sorted(fitted + skipped, key=lambda row: order[row['compound']])
+        result = pd.DataFrame(rows, columns=columns)
+
+        # 감소 곡선(hill < 0)이면 억제 실험으로 보고 EC50을 IC50으로도 보고
+        result['direction'] = np.where(result['hill_slope'] < 0, 'inhibition',
+                                       np.where(result['hill_slope'] > 0, 'activation', None))
+        result['ic50'] = result['ec50'].where(result['direction'] == 'inhibition')
+        dose_range = guesses.reindex(result['compound'])
+        result['ec50_extrapolated'] = (
+            (result['ec50'].to_numpy() < dose_range['dose_min'].to_numpy())
+            | (result['ec50'].to_numpy() > dose_range['dose_max'].to_numpy())
+        )
+
+        # 적합 품질: R² 기준 + EC50 상대 표준오차 (평탄한 곡선은 EC50을 식별할 수 없음)
+        relative_se = result['ec50_std_err'] / result['ec50']
+        good = (result['r_squared'] >= self.min_r_squared) & (relative_se < 1.0)
+        result['fit_quality'] = np.where(result['status'] != 'ok', None,
+                                         np.where(good, 'good', 'poor'))
+        return result
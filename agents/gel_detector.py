@@ -0,0 +1,272 @@
+"""젤 전기영동 이미지의 로컬 레인/밴드 검출 (NumPy/SciPy 강도 프로파일 기반)"""
+
+from dataclasses import dataclass, asdict, field
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from PIL import Image, ImageOps
+from scipy import ndimage
+from scipy.signal import find_peaks
+
+QUALITY_LEVELS = ((0.75, 'Good'), (0.5, 'Fair'), (0.0, 'Poor'))
+
+
+def load_grayscale(image_path: str, max_side: int = 1024) -> np.ndarray:
+    """이미지를 EXIF 회전 보정 후 max_side 이하로 축소한 float32 그레이스케일 배열로 로드"""
+    with Image.open(image_path) as source:
+        if source.format == 'JPEG':
+            source.draft('L', (max_side, max_side))
+        image = ImageOps.exif_transpose(source)
+        image.load()
+    if image.mode not in ('I;16', 'I;16B', 'I;16L', 'I;16N', 'I', 'F', 'L'):
+        image = image.convert('L')
+    if max(image.size) > max_side:
+        # 16비트 모드는 thumbnail이 지원되지 않으므로 배열로 변환 후 축소
+        if image.mode == 'L':
+            image.thumbnail((max_side, max_side), Image.BILINEAR)
+        else:
+            factor = max(image.size) / max_side
+            array = np.asarray(image, dtype=np.float32)
+            return ndimage.zoom(array, 1.0 / factor, order=1)
+    return np.asarray(image, dtype=np.float32)
+
+
+@dataclass
+class GelAnalysis:
+    """로컬 젤 분석 결과"""
+
+    lanes: int
+    lane_centers: List[int]
+    bands: List[Dict]                  # {'lane', 'position', 'intensity', 'size_bp'}
+    ladder_lane: Optional[int]
+    ladder_r_squared: Optional[float]
+    snr: float
+    smear_index: float
+    saturation: float
+    quality_score: float
+    quality: str
+    confidence: float
+    issues: List[str] = field(default_factory=list)
+
+    def is_confident(self, threshold: float = 0.7) -> bool:
+        return self.confidence >= threshold
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+    def to_markdown(self) -> str:
+        """원격 분석(Gemini)과 같은 형식의 요약"""
+        lines = ["**밴드 분석:**"]
+        for lane in range(self.lanes):
+            lane_bands = [b for b in self.bands if b['lane'] == lane]
+            label = " (ladder)" if lane == self.ladder_lane else ""
+            if not lane_bands:
+                lines.append(f"- Lane {lane + 1}{label}: 밴드 없음")
+                continue
+            sizes = [
+                f"~{b['size_bp']:,.0f} bp" if b['size_bp'] else f"{b['position']}px"
+                for b in lane_bands
+            ]
+            lines.append(f"- Lane {lane + 1}{label}: {len(lane_bands)}개 ({', '.join(sizes)})")
+        lines.append("")
+        lines.append(f"**품질 평가:** {self.quality} (점수 {self.quality_score:.2f}, "
+                     f"SNR {self.snr:.1f}, 번짐 지수 {self.smear_index:.2f})")
+        if self.issues:
+            lines.append("")
+            lines.append("**제안사항:**")
+            lines.extend(f"- {issue}" for issue in self.issues)
+        return "\n".join(lines)
+
+
+class GelBandDetector:
+    """
+    강도 프로파일로 레인과 밴드를 찾는 젤 분석기
+
+    1. 배경이 밝으면(염색 젤) 반전 → 밴드가 밝은 이미지로 통일, 1~99 백분위 정규화
+    2. 세로 방향 white top-hat으로 레인 배경(번짐) 제거
+    3. 열별 최대 강도의 반치 구간 = 레인, 레인별 행 평균 프로파일의 피크 = 밴드
+    4. ladder 크기가 주어지면 log10(bp) ~ 이동 거리 선형 적합으로 밴드 크기 추정
+    5. SNR, 번짐, 포화, 레인 간격 규칙성, ladder 적합도로 품질 점수와 신뢰도 계산
+    """
+
+    def __init__(self, max_side: int = 1024, min_lanes: int = 2):
+        self.max_side = max_side
+        self.min_lanes = min_lanes
+
+    def analyze_path(self, image_path: str,
+                     ladder_sizes: Optional[Sequence[float]] = None) -> GelAnalysis:
+        return self.analyze(load_grayscale(image_path, self.max_side), ladder_sizes)
+
+    def analyze(self, image: np.ndarray,
+                ladder_sizes: Optional[Sequence[float]] = None) -> GelAnalysis:
+        """
+        Args:
+            image: 2차원 그레이스케일 배열 (행 = 이동 방향, 위쪽이 웰)
+            ladder_sizes: ladder 밴드 크기(bp), 큰 것부터 (위 → 아래 순서)
+        """
+        image = np.asarray(image, dtype=np.float32)
+        height, width = image.shape
+        issues = []
+
+        low, high = np.percentile(image, (1, 99))
+        saturation = float(np.mean(image >= image.max())) if image.max() > low else 1.0
+        norm = np.clip((image - low) / (high - low), 0, 1) if high > low else np.zeros_like(image)
+        if np.median(norm) > 0.5:
+            norm = 1.0 - norm
+
+        background = ndimage.grey_opening(norm, size=(max(3, height // 6), 1))
+        signal = norm - background
+
+        # 레인: 열별 최대 밴드 강도 프로파일이 반치(half maximum)를 넘는 구간의 강도 중심
+        # (평균을 쓰면 밴드가 많은 ladder 레인이 지배해 밴드가 적은 레인을 놓침)
+        row_smoothed = ndimage.gaussian_filter1d(signal, sigma=max(1.0, height / 300), axis=0)
+        column_profile = ndimage.gaussian_filter1d(row_smoothed.max(axis=0),
+                                                   sigma=max(1.0, width / 200))
+        lane_centers = self._lane_centers(column_profile, min_width=max(3, width // 100))
+        if len(lane_centers) < self.min_lanes:
+            issues.append(f"레인을 {len(lane_centers)}개만 찾았습니다 (원격 분석 권장)")
+        spacing = np.diff(lane_centers)
+        half_width = max(1, int(0.3 * np.median(spacing))) if len(spacing) else max(1, width // 20)
+        spacing_cv = float(spacing.std() / spacing.mean()) if len(spacing) > 1 else 1.0
+
+        # 밴드: 레인 중심 ± half_width 열 평균의 세로 프로파일 (레인 × 높이 행렬)
+        cumulative = np.concatenate([np.zeros((height, 1)), np.cumsum(signal, axis=1)], axis=1)
+        left = np.clip(lane_centers - half_width, 0, width)
+        right = np.clip(lane_centers + half_width + 1, 0, width)
+        profiles = (cumulative[:, right] - cumulative[:, left]) / np.maximum(right - left, 1)
+        profiles = ndimage.gaussian_filter1d(profiles.T, sigma=max(1.0, height / 300), axis=1)
+        lane_floor = np.median(norm[:, lane_centers], axis=0) if len(lane_centers) else np.array([])
+
+        # 잡음: 평활화 전 프로파일의 인접 차분 MAD (차분은 분산이 2배이므로 √2로 나눔)
+        raw_diff = np.diff((cumulative[:, right] - cumulative[:, left]).T, axis=1) \
+            / np.maximum(right - left, 1)[:, None]
+        noise = float(np.median(np.abs(raw_diff))) * 1.4826 / np.sqrt(2) + 1e-6 \
+            if raw_diff.size else 1e-6
+        min_prominence = max(5 * noise, 0.05 * float(profiles.max()) if profiles.size else 0.0)
+
+        bands = []
+        prominences = []
+        for lane, profile in enumerate(profiles):
+            peaks, props = find_peaks(profile, prominence=min_prominence,
+                                      distance=max(2, height // 100))
+            prominences.extend(props['prominences'])
+            bands.extend(
+                {'lane': lane, 'position': int(p), 'intensity': float(profile[p]), 'size_bp': None}
+                for p in peaks
+            )
+
+        ladder_lane, ladder_r2 = self._fit_ladder(bands, len(lane_centers), ladder_sizes, issues)
+
+        snr = float(np.median(prominences) / noise) if prominences else 0.0
+        peak_level = float(np.median(prominences)) if prominences else 1.0
+        smear_index = float(np.clip(
+            np.median(background[:, lane_centers]) / (peak_level + 1e-6), 0, 1
+        )) if len(lane_centers) else 1.0
+
+        components = {
+            'snr': float(np.clip(snr / 20.0, 0, 1)),
+            'smear': 1.0 - smear_index,
+            'regularity': float(np.clip(1.0 - spacing_cv / 0.3, 0, 1)),
+            'saturation': float(np.clip(1.0 - saturation / 0.02, 0, 1))
+        }
+        if ladder_r2 is not None:
+            components['ladder'] = float(np.clip((ladder_r2 - 0.9) / 0.09, 0, 1))
+        quality_score = float(np.mean(list(components.values())))
+        quality = next(label for cutoff, label in QUALITY_LEVELS if quality_score >= cutoff)
+
+        if components['snr'] < 0.5:
+            issues.append("밴드 신호 대비 잡음이 큽니다 (노출 시간/염색 농도 확인)")
+        if smear_index > 0.5:
+            issues.append("레인 번짐(smear)이 심합니다 (DNA 분해, 과량 로딩 가능성)")
+        if components['saturation'] < 0.5:
+            issues.append("포화된 픽셀이 많습니다 (노출 시간 단축 권장)")
+        if len(lane_centers) and float(np.median(lane_floor)) > 0.6:
+            issues.append("배경이 밝습니다 (탈색/세척 부족 가능성)")
+
+        # 신뢰도: 로컬 결과를 그대로 써도 되는지 (가장 약한 구성 요소 기준)
+        confidence_parts = [components['snr'], components['regularity'], components['smear']]
+        if len(lane_centers) < self.min_lanes:
+            confidence_parts.append(0.0)
+        if ladder_sizes is not None:
+            confidence_parts.append(components.get('ladder', 0.0))
+        confidence = float(min(confidence_parts))
+
+        return GelAnalysis(
+            lanes=len(lane_centers),
+            lane_centers=[int(c) for c in lane_centers],
+            bands=bands,
+            ladder_lane=ladder_lane,
+            ladder_r_squared=ladder_r2,
+            snr=snr,
+            smear_index=smear_index,
+            saturation=saturation,
+            quality_score=quality_score,
+            quality=quality,
+            confidence=confidence,
+            issues=issues
+        )
+
+    @staticmethod
+    def _lane_centers(column_profile: np.ndarray, min_width: int) -> np.ndarray:
+        """
+        반치 이상 구간(run)마다 강도 가중 중심을 레인 중심으로 사용
+
+        이웃 레인이 붙어 하나의 넓은 구간이 되면 중앙 구간 폭 기준으로 등분합니다.
+        """
+        floor, peak = float(column_profile.min()), float(column_profile.max())
+        if peak - floor <= 1e-9:
+            return np.array([], dtype=int)
+        above = column_profile > floor + 0.5 * (peak - floor)
+        edges = np.flatnonzero(np.diff(np.r_[0, above.astype(np.int8), 0]))
+        runs = [(start, stop) for start, stop in zip(edges[::2], edges[1::2])
+                if stop - start >= min_width]
+        if not runs:
+            return np.array([], dtype=int)
+
+        typical = np.median([stop - start for start, stop in runs])
+        weights = column_profile - floor
+        centers = []
+        for start, stop in runs:
+            parts = max(1, int(round((stop - start) / typical)))
+            bounds = np.linspace(start, stop, parts + 1).round().astype(int)
+            for lo, hi in zip(bounds[:-1], bounds[1:]):
+                w = weights[lo:hi]
+                centers.append(int(round(np.sum(np.arange(lo, hi) * w) / w.sum())))
+        return np.asarray(centers, dtype=int)
+
+    @staticmethod
+    def _fit_ladder(bands: List[Dict], n_lanes: int,
+                    ladder_sizes: Optional[Sequence[float]], issues: List[str]):
+        """
+        가장자리 레인 중 ladder 크기 수와 밴드 수가 맞는 쪽을 ladder로 보고 반로그 적합
+
+        Returns:
+            (ladder 레인 번호, R²) - ladder를 못 찾으면 (None, None)
+        """
+        if not ladder_sizes or n_lanes == 0:
+            return None, None
+        sizes = np.sort(np.asarray(ladder_sizes, dtype=float))[::-1]
+        candidates = [0, n_lanes - 1] if n_lanes > 1 else [0]
+        counts = {lane: sum(1 for b in bands if b['lane'] == lane) for lane in candidates}
+        lane = min(candidates, key=lambda c: (abs(counts[c] - len(sizes)), c))
+        if counts[lane] != len(sizes):
+            issues.append(
+                f"ladder 밴드 수 불일치 (기대 {len(sizes)}개, 검출 {counts[lane]}개) - 크기 추정 생략"
+            )
+            return lane, None
+
+        positions = np.array(sorted(b['position'] for b in bands if b['lane'] == lane), dtype=float)
+        log_sizes = np.log10(sizes)
+        slope, intercept = np.polyfit(positions, log_sizes, 1)
+        fitted = slope * positions + intercept
+        ss_tot = float(np.sum((log_sizes - log_sizes.mean()) ** 2))
+        r_squared = 1.0 - float(np.sum((log_sizes - fitted) ** 2)) / ss_tot if ss_tot > 0 else 0.0
+        if r_squared < 0.95:
+            issues.append(f"ladder 적합도가 낮습니다 (R² = {r_squared:.3f})")
+
+        lo, hi = positions.min(), positions.max()
+        for band in bands:
+            # ladder 범위 밖 외삽은 하지 않음
+            if lo <= band['position'] <= hi:
+                band['size_bp'] = float(10 ** (slope * band['position'] + intercept))
+        return lane, r_squared
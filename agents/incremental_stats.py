@@ -0,0 +1,274 @@
+"""추가(append)되는 실험 데이터용 증분 검증 통계 - 새 행만 처리해 전체 재계산과 같은 결과 유지"""
+
+from typing import List, Optional, Union
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import IsolationForest
+
+
+def _as_list(cols: Union[str, List[str], None]) -> List[str]:
+    if cols is None:
+        return []
+    return [cols] if isinstance(cols, str) else list(cols)
+
+
+def _align(frame: Optional[pd.DataFrame], index: pd.Index, columns) -> np.ndarray:
+    """누적 통계를 새 그룹 인덱스에 맞춰 정렬 (없는 그룹은 0)"""
+    if frame is None:
+        return np.zeros((len(index), len(columns)))
+    return frame.reindex(index).fillna(0.0).to_numpy(dtype=float)
+
+
+def _merged_index(current: Optional[pd.Index], new: pd.Index) -> pd.Index:
+    """기존 그룹 순서 유지 + 처음 나온 그룹을 뒤에 추가 (전체 groupby(sort=False)와 같은 순서)"""
+    if current is None:
+        return new
+    return current.append(new.difference(current, sort=False))
+
+
+def _chan_merge(n_a, mean_a, m2_a, n_b, mean_b, m2_b):
+    """
+    두 부분 집합의 (개수, 평균, 편차 제곱합)을 병합 (Chan et al. 병렬 Welford 공식)
+
+    M2 = M2_a + M2_b + δ²·n_a·n_b / n,  δ = mean_b - mean_a
+    """
+    n = n_a + n_b
+    delta = mean_b - mean_a
+    with np.errstate(divide='ignore', invalid='ignore'):
+        weight = np.where(n > 0, n_b / n, 0.0)
+        mean = np.where(n_a == 0, mean_b, np.where(n_b == 0, mean_a, mean_a + delta * weight))
+        m2 = m2_a + m2_b + delta ** 2 * n_a * weight
+    return n, mean, m2
+
+
+class IncrementalValidator:
+    """
+    ExperimentValidator의 증분 모드 - update(새 행)마다 O(새 행 수)로 상태 갱신
+
+    유지하는 상태:
+    - 반복 측정 그룹 × 측정 컬럼별 (n, 평균, 편차 제곱합)  → replicate_stats()
+    - Standard Curve 그룹별 (n, x/y 평균, Sxx, Syy, Sxy)    → standard_curves()
+    - 이상치 컬럼 값 + 누적 데이터로 재학습하는 Isolation Forest → outlier_mask()
+
+    병합은 Chan/Welford 공식으로 하므로 replicate_stats()/standard_curves()는 누적 데이터 전체에
+    compute_replicate_stats()/validate_standard_curves()를 다시 호출한 결과와 (부동소수점 오차
+    범위에서) 같습니다. 이상치 모델은 min_fit_rows 행이 모이면 처음 학습하고, 누적 행 수가
+    마지막 학습 때의 refit_growth배가 될 때마다 detect_outliers_scalable과 같은 표본 추출로
+    다시 학습해 모든 행을 다시 채점합니다 (재학습 직후 결과는 누적 데이터에
+    detect_outliers_scalable을 호출한 것과 같고, 그 사이 새 행은 마지막 모델로 채점).
+    재채점을 위해 outlier_cols 값(행 수 × 컬럼 수 float)만 보관합니다.
+    """
+
+    def __init__(self, validator,
+                 group_col: Union[str, List[str], None] = None,
+                 value_cols: Union[str, List[str], None] = None,
+                 curve_group_col: Union[str, List[str], None] = None,
+                 x_col: Optional[str] = None, y_col: Optional[str] = None,
+                 outlier_cols: Union[str, List[str], None] = None,
+                 min_fit_rows: int = 256, max_samples: int = 100_000,
+                 random_state: int = 42, refit_growth: float = 2.0):
+        """
+        Args:
+            validator: 결과 형식/임계값을 공유할 ExperimentValidator
+            group_col / value_cols: 반복 측정 통계 대상 (compute_replicate_stats와 같은 의미)
+            curve_group_col / x_col / y_col: Standard Curve 대상 (validate_standard_curves와 같은 의미)
+            outlier_cols: Isolation Forest 이상치 탐지 컬럼
+            min_fit_rows: 이상치 모델 학습 전에 모을 최소 행 수 (그 전 행은 학습 후 한 번에 채점)
+            refit_growth: 누적 행 수가 마지막 학습 때의 이 배수가 되면 이상치 모델 재학습
+                          (2.0이면 재학습 비용 합계가 전체 행 수에 비례)
+        """
+        if refit_growth <= 1.0:
+            raise ValueError(f"refit_growth는 1보다 커야 합니다: {refit_growth}")
+        self.validator = validator
+        self.group_col = group_col
+        self.value_cols = _as_list(value_cols)
+        self.curve_keys = _as_list(curve_group_col)
+        self.x_col, self.y_col = x_col, y_col
+        self.outlier_cols = _as_list(outlier_cols)
+        self.min_fit_rows = max(1, min_fit_rows)
+        self.max_samples = max_samples
+        self.random_state = random_state
+        self.refit_growth = refit_growth
+        self.n_rows = 0
+
+        # 반복 측정 그룹 상태 (index=그룹, columns=value_cols)
+        self._rep_n = self._rep_mean = self._rep_m2 = None
+        # Standard Curve 상태 (index=곡선 그룹, columns=['n', 'mean_x', 'mean_y', 'sxx', 'syy', 'sxy'])
+        self._curves: Optional[pd.DataFrame] = None
+        # 이상치 모델 상태 (재학습 시 전체 재채점용 컬럼 값, 청크별 인덱스/마스크)
+        self._outlier_model = None
+        self._fitted_rows = 0
+        self._features: List[np.ndarray] = []
+        self._feature_index: List[pd.Index] = []
+        self._outlier_masks: List[np.ndarray] = []
+
+    def update(self, new_rows: pd.DataFrame) -> "IncrementalValidator":
+        """새로 추가된 행만 반영 (이전에 넣은 행을 다시 넣으면 중복 집계됩니다)"""
+        if len(new_rows) == 0:
+            return self
+        if self.group_col is not None and self.value_cols:
+            self._update_replicates(new_rows)
+        if self.curve_keys and self.x_col and self.y_col:
+            self._update_curves(new_rows)
+        if self.outlier_cols:
+            self._update_outliers(new_rows)
+        self.n_rows += len(new_rows)
+        return self
+
+    # ------------------------------------------------------------------ 반복 측정
+    def _update_replicates(self, batch: pd.DataFrame):
+        grouped = batch.groupby(self.group_col, sort=False, observed=True)[self.value_cols]
+        n_b = grouped.count()
+        mean_b = grouped.mean()
+        deviations = batch[self.value_cols] - grouped.transform('mean')
+        keys = [batch[k] for k in _as_list(self.group_col)]
+        m2_b = (deviations ** 2).groupby(keys, sort=False, observed=True).sum().reindex(n_b.index)
+
+        index = _merged_index(None if self._rep_n is None else self._rep_n.index, n_b.index)
+        cols = self.value_cols
+        n, mean, m2 = _chan_merge(
+            _align(self._rep_n, index, cols), _align(self._rep_mean, index, cols),
+            _align(self._rep_m2, index, cols),
+            _align(n_b, index, cols), _align(mean_b, index, cols), _align(m2_b, index, cols)
+        )
+        self._rep_n = pd.DataFrame(n, index=index, columns=cols)
+        self._rep_mean = pd.DataFrame(mean, index=index, columns=cols)
+        self._rep_m2 = pd.DataFrame(m2, index=index, columns=cols)
+
+    def replicate_stats(self, cv_threshold: float = 0.15) -> pd.DataFrame:
+        """누적 데이터의 compute_replicate_stats() 결과"""
+        if self._rep_n is None:
+            raise ValueError("반복 측정 통계가 없습니다 (group_col/value_cols를 지정하고 update()를 호출하세요).")
+        n = self._rep_n.to_numpy()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            std = np.where(n > 1, np.sqrt(self._rep_m2.to_numpy() / (n - 1)), np.nan)
+            mean = np.where(n > 0, self._rep_mean.to_numpy(), np.nan)
+        return self.validator._replicate_stats_frame(
+            self._rep_n.index, self.value_cols, n.astype(np.int64), mean, std, cv_threshold
+        )
+
+    # ------------------------------------------------------------------ Standard Curve
+    def _update_curves(self, batch: pd.DataFrame):
+        data = batch[self.curve_keys + [self.x_col, self.y_col]].dropna(
+            subset=[self.x_col, self.y_col]
+        )
+        if data.empty:
+            return
+        grouped = data.groupby(self.curve_keys, sort=False, observed=True)
+        means = grouped[[self.x_col, self.y_col]].transform('mean')
+        dx = data[self.x_col].to_numpy(dtype=float) - means[self.x_col].to_numpy()
+        dy = data[self.y_col].to_numpy(dtype=float) - means[self.y_col].to_numpy()
+        moments = pd.DataFrame(
+            {'sxx': dx * dx, 'syy': dy * dy, 'sxy': dx * dy}, index=data.index
+        ).groupby([data[k] for k in self.curve_keys], sort=False, observed=True).sum()
+        agg = grouped[[self.x_col, self.y_col]].agg(['count', 'mean']).reindex(moments.index)
+        batch_stats = pd.DataFrame({
+            'n': agg[(self.x_col, 'count')].to_numpy(dtype=float),
+            'mean_x': agg[(self.x_col, 'mean')].to_numpy(),
+            'mean_y': agg[(self.y_col, 'mean')].to_numpy(),
+            'sxx': moments['sxx'].to_numpy(),
+            'syy': moments['syy'].to_numpy(),
+            'sxy': moments['sxy'].to_numpy()
+        }, index=moments.index)
+
+        cols = list(batch_stats.columns)
+        previous = None if self._curves is None else self._curves.index
+        index = _merged_index(previous, batch_stats.index)
+        a = _align(self._curves, index, cols).T
+        b = _align(batch_stats, index, cols).T
+        n_a, mx_a, my_a, sxx_a, syy_a, sxy_a = a
+        n_b, mx_b, my_b, sxx_b, syy_b, sxy_b = b
+
+        n, mean_x, sxx = _chan_merge(n_a, mx_a, sxx_a, n_b, mx_b, sxx_b)
+        _, mean_y, syy = _chan_merge(n_a, my_a, syy_a, n_b, my_b, syy_b)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cross = np.where(n > 0, (mx_b - mx_a) * (my_b - my_a) * n_a * n_b / n, 0.0)
+        sxy = sxy_a + sxy_b + cross
+
+        self._curves = pd.DataFrame(
+            {'n': n, 'mean_x': mean_x, 'mean_y': mean_y, 'sxx': sxx, 'syy': syy, 'sxy': sxy},
+            index=index
+        )
+
+    def standard_curves(self, r2_threshold: float = 0.95,
+                        p_threshold: float = 0.05) -> pd.DataFrame:
+        """누적 데이터의 validate_standard_curves() 결과"""
+        if self._curves is None:
+            raise ValueError("Standard Curve 통계가 없습니다 (curve_group_col/x_col/y_col을 지정하세요).")
+        c = self._curves
+        return self.validator._curves_from_moments(
+            c.index,
+            n=c['n'].to_numpy().astype(np.int64),
+            mean_x=c['mean_x'].to_numpy(), mean_y=c['mean_y'].to_numpy(),
+            sxx=c['sxx'].to_numpy(), syy=c['syy'].to_numpy(), sxy=c['sxy'].to_numpy(),
+            r2_threshold=r2_threshold, p_threshold=p_threshold
+        )
+
+    # ------------------------------------------------------------------ 이상치
+    def _update_outliers(self, batch: pd.DataFrame):
+        X = batch[self.outlier_cols].to_numpy(dtype=float)
+        self._features.append(X)
+        self._feature_index.append(batch.index)
+        n_seen = self.n_rows + len(batch)
+        if self._outlier_model is None:
+            if n_seen < self.min_fit_rows:
+                self._outlier_masks.append(np.zeros(len(X), dtype=bool))
+                return
+            self.refit_outliers()
+        elif n_seen >= self.refit_growth * self._fitted_rows:
+            self.refit_outliers()
+        else:
+            self._outlier_masks.append(self._predict(X))
+
+    def refit_outliers(self) -> "IncrementalValidator":
+        """
+        누적된 모든 행으로 이상치 모델을 다시 학습하고 전체 행을 다시 채점
+
+        표본 추출(max_samples, random_state)과 채점은 ExperimentValidator.detect_outliers_scalable과
+        같으므로, 결과는 누적 데이터에 그 메서드를 호출한 것과 같습니다.
+        """
+        if not self._features:
+            raise ValueError("이상치 모델을 학습할 행이 없습니다 (outlier_cols를 지정하고 update()를 호출하세요).")
+        X = np.concatenate(self._features) if len(self._features) > 1 else self._features[0]
+        self._features = [X]
+        valid_rows = np.flatnonzero(~np.isnan(X).any(axis=1))
+        if len(valid_rows) == 0:
+            raise ValueError("이상치 모델을 학습할 결측 없는 행이 없습니다.")
+        sample_rows = valid_rows
+        if len(sample_rows) > self.max_samples:
+            rng = np.random.default_rng(self.random_state)
+            sample_rows = np.sort(rng.choice(sample_rows, self.max_samples, replace=False))
+        self._outlier_model = IsolationForest(
+            contamination=self.validator.contamination,
+            random_state=self.random_state,
+            n_jobs=-1
+        ).fit(X[sample_rows])
+        self._fitted_rows = len(X)
+
+        mask = np.zeros(len(X), dtype=bool)
+        mask[valid_rows] = self._outlier_model.predict(X[valid_rows]) == -1
+        self._outlier_masks = [mask]
+        return self
+
+    def _predict(self, X: np.ndarray) -> np.ndarray:
+        """마지막 모델로 새 행만 채점 (결측 행은 False)"""
+        valid = ~np.isnan(X).any(axis=1)
+        mask = np.zeros(len(X), dtype=bool)
+        if valid.any():
+            mask[valid] = self._outlier_model.predict(X[valid]) == -1
+        return mask
+
+    def outlier_mask(self) -> pd.Series:
+        """
+        지금까지 추가된 모든 행의 이상치 여부 (입력 인덱스 그대로 이어 붙임)
+
+        모델 학습 전(min_fit_rows 미만)인 행은 False로 반환합니다. 마지막 재학습 이후 추가된
+        행은 그때의 모델로 채점되므로, 누적 데이터 기준 결과가 필요하면 refit_outliers()를
+        먼저 호출하세요.
+        """
+        if not self._feature_index:
+            return pd.Series(dtype=bool, name='is_outlier')
+        index = self._feature_index[0].append(self._feature_index[1:]) \
+            if len(self._feature_index) > 1 else self._feature_index[0]
+        return pd.Series(np.concatenate(self._outlier_masks), index=index, name='is_outlier')
@@ -0,0 +1,168 @@
+import re
+import threading
+import time
+from typing import Dict, List, Optional
+
+from google.api_core import exceptions as google_exceptions
+
+
+class ModelRouter:
+    """요청 복잡도와 모델별 성능 통계에 따라 Gemini 모델을 선택하는 라우터"""
+
+    FAST_MODEL = "gemini-2.0-flash"
+    STRONG_MODEL = "gemini-2.5-flash"
+
+    # 여러 단계 분석 또는 고급 통계를 의미하는 키워드
+    COMPLEX_KEYWORDS = [
+        '회귀', 'regression', 'anova', '사후검정', 'tukey', '다중', '혼합',
+        'mixed', 'pca', '주성분', '클러스터', 'cluster', '머신러닝', '예측 모델',
+        '시계열', 'time series', '생존', 'survival', '비선형', 'curve_fit', '4pl',
+        '그리고', '이후', '다음으로', '비교한 뒤', '단계'
+    ]
+    COMPLEX_LENGTH = 200  # 이 길이를 넘는 요청은 복잡한 요청으로 간주
+    MIN_CALLS_FOR_STATS = 3  # 통계 기반 강등을 적용하기 위한 최소 호출 수
+    EWMA_ALPHA = 0.3
+
+    def __init__(
+        self,
+        primary_model: str = STRONG_MODEL,
+        models: Optional[List[str]] = None,
+        auto_route: bool = True,
+        latency_budget: float = 60.0
+    ):
+        """
+        Args:
+            primary_model: 사용자가 지정한 기본 모델 (auto_route=False일 때 항상 우선)
+            models: 대체(failover) 가능한 전체 모델 목록
+            auto_route: True면 요청 복잡도에 따라 모델 순서를 결정
+            latency_budget: 평균 응답 시간(초)이 이 값을 넘는 모델은 후순위로 강등
+        """
+        self.primary_model = primary_model
+        self.models = list(dict.fromkeys(
+            [primary_model] + (models or [self.STRONG_MODEL, self.FAST_MODEL])
+        ))
+        self.auto_route = auto_route
+        self.latency_budget = latency_budget
+
+        self._lock = threading.Lock()
+        self._stats = {name: self._empty_stats() for name in self.models}
+
+    @staticmethod
+    def _empty_stats() -> Dict:
+        return {
+            'calls': 0,
+            'successes': 0,
+            'failures': 0,
+            'quota_errors': 0,
+            'latency_errors': 0,
+            'avg_latency': None,  # EWMA (초)
+            'cooldown_until': 0.0
+        }
+
+    def classify(self, user_input: str) -> str:
+        """요청을 'simple' 또는 'complex'로 분류"""
+        text = (user_input or '').lower()
+        score = 0
+        if len(text) > self.COMPLEX_LENGTH:
+            score += 1
+        score += sum(1 for kw in self.COMPLEX_KEYWORDS if kw in text)
+        # "1. ... 2. ..." 형태의 다단계 요청
+        if len(re.findall(r'(?:^|\s)\d+[.)]\s', text)) >= 2:
+            score += 2
+        return 'complex' if score >= 2 else 'simple'
+
+    def candidates(self, complexity: str = 'simple') -> List[str]:
+        """호출을 시도할 모델 순서를 반환 (건강한 모델 우선)"""
+        if self.auto_route:
+            preferred = self.FAST_MODEL if complexity == 'simple' else self.STRONG_MODEL
+            if preferred not in self.models:
+                preferred = self.primary_model
+        else:
+            preferred = self.primary_model
+        ordered = [preferred] + [m for m in self.models if m != preferred]
+
+        now = time.time()
+        with self._lock:
+            healthy, degraded, cooling = [], [], []
+            for name in ordered:
+                stats = self._stats[name]
+                if stats['cooldown_until'] > now:
+                    cooling.append(name)
+                elif self._is_degraded(stats):
+                    degraded.append(name)
+                else:
+                    healthy.append(name)
+        return healthy + degraded + cooling
+
+    def _is_degraded(self, stats: Dict) -> bool:
+        if stats['calls'] < self.MIN_CALLS_FOR_STATS:
+            return False
+        success_rate = stats['successes'] / stats['calls']
+        slow = stats['avg_latency'] is not None and stats['avg_latency'] > self.latency_budget
+        return success_rate < 0.5 or slow
+
+    def record_success(self, model_name: str, latency: float):
+        """성공한 호출의 지연 시간 기록"""
+        with self._lock:
+            stats = self._stats.setdefault(model_name, self._empty_stats())
+            stats['calls'] += 1
+            stats['successes'] += 1
+            if stats['avg_latency'] is None:
+                stats['avg_latency'] = latency
+            else:
+                stats['avg_latency'] = (
+                    self.EWMA_ALPHA * latency + (1 - self.EWMA_ALPHA) * stats['avg_latency']
+                )
+
+    def record_failure(self, model_name: str, error: Exception,
+                       retry_delay: Optional[float] = None):
+        """실패한 호출 기록 (할당량 초과 시 retry_delay 동안 후순위로 밀림)"""
+        with self._lock:
+            stats = self._stats.setdefault(model_name, self._empty_stats())
+            stats['calls'] += 1
+            stats['failures'] += 1
+            if self.is_quota_error(error):
+                stats['quota_errors'] += 1
+                stats['cooldown_until'] = time.time() + (retry_delay or 20)
+            elif self.is_latency_error(error):
+                stats['latency_errors'] += 1
+
+    def stats(self) -> Dict[str, Dict]:
+        """모델별 호출 통계 (UI/로그 표시용)"""
+        now = time.time()
+        with self._lock:
+            return {
+                name: {
+                    'calls': s['calls'],
+                    'success_rate': (s['successes'] / s['calls']) if s['calls'] else None,
+                    'avg_latency': s['avg_latency'],
+                    'quota_errors': s['quota_errors'],
+                    'latency_errors': s['latency_errors'],
+                    'cooling_down': s['cooldown_until'] > now
+                }
+                for name, s in self._stats.items()
+            }
+
+    @staticmethod
+    def is_quota_error(error: Exception) -> bool:
+        """429 / 할당량 초과 오류 여부"""
+        if isinstance(error, (google_exceptions.ResourceExhausted,
+                              google_exceptions.TooManyRequests)):
+            return True
+        error_str = str(error).lower()
+        return "429" in error_str or "quota" in error_str or "rate limit" in error_str
+
+    @staticmethod
+    def is_latency_error(error: Exception) -> bool:
+        """시간 초과 / 일시적 서버 오류 여부"""
+        if isinstance(error, (google_exceptions.DeadlineExceeded,
+                              google_exceptions.ServiceUnavailable,
+                              google_exceptions.InternalServerError)):
+            return True
+        error_str = str(error).lower()
+        return "deadline" in error_str or "timeout" in error_str or "503" in error_str
+
+    @classmethod
+    def is_retryable(cls, error: Exception) -> bool:
+        """다른 모델로 대체 시도할 가치가 있는 오류인지"""
+        return cls.is_quota_error(error) or cls.is_latency_error(error)
@@ -0,0 +1,267 @@
+"""세포 배양 플레이트 이미지의 웰 격자 검출과 웰별 confluency/오염 지표 (타일 병렬 계산)"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from PIL import Image, ImageOps
+from scipy import ndimage
+
+from utils.plate_parser import ROW_LABELS
+
+# 웰 수 → (행, 열)
+PLATE_LAYOUTS = {6: (2, 3), 12: (3, 4), 24: (4, 6), 48: (6, 8), 96: (8, 12), 384: (16, 24)}
+CONTAMINATION_Z = 3.5  # 강건 Z-점수(중앙값/MAD) 기준
+
+
+def load_plate_image(image_path: str, max_side: int = 1600) -> np.ndarray:
+    """EXIF 회전 보정 + 축소한 RGB float32 배열 (0~1)"""
+    with Image.open(image_path) as source:
+        if source.format == 'JPEG':
+            source.draft('RGB', (max_side, max_side))
+        image = ImageOps.exif_transpose(source)
+        image.load()
+    image = image.convert('RGB')
+    if max(image.size) > max_side:
+        image.thumbnail((max_side, max_side), Image.BILINEAR)
+    return np.asarray(image, dtype=np.float32) / 255.0
+
+
+def _local_std(gray: np.ndarray, window: int) -> np.ndarray:
+    """국소 표준편차 (세포가 있는 곳은 질감이 있어 값이 큼), 마지막 두 축 기준"""
+    size = (1,) * (gray.ndim - 2) + (window, window)
+    mean = ndimage.uniform_filter(gray, size)
+    return np.sqrt(np.clip(ndimage.uniform_filter(gray * gray, size) - mean * mean, 0, None))
+
+
+def _well_metrics(tiles: np.ndarray, mask: np.ndarray, texture_threshold: float,
+                  window: int) -> np.ndarray:
+    """
+    웰 타일 묶음의 지표 계산 (프로세스 풀 작업 단위)
+
+    Args:
+        tiles: (n, size, size, 3) RGB 타일
+        mask: (size, size) 원형 웰 내부 마스크
+
+    Returns:
+        (n, 5) 배열: confluency, mean_intensity, texture, hue_shift, haze
+    """
+    out = np.empty((len(tiles), 5))
+    inside = mask.astype(bool)
+    for i, tile in enumerate(tiles):
+        gray = tile.mean(axis=2)
+        values = _local_std(gray, window)[inside]
+        r, g, b = (float(tile[..., c][inside].mean()) for c in range(3))
+        high, low = max(r, g, b), min(r, g, b)
+        chroma = high - low
+        # 빨강 기준 색상각(도): 페놀레드 배지가 산성화되면 분홍(~0°) → 노랑(~50°)으로 이동
+        hue = 60.0 * (g - b) / chroma if chroma > 1e-6 and high == r else (
+            60.0 * ((b - r) / chroma + 2) if chroma > 1e-6 and high == g else
+            60.0 * ((r - g) / chroma + 4) if chroma > 1e-6 else 0.0
+        )
+        out[i] = (
+            float(np.mean(values > texture_threshold)),   # 세포가 덮은 면적 비율
+            float(gray[inside].mean()),
+            float(np.median(values)),
+            (hue + 180.0) % 360.0 - 180.0,
+            1.0 - (chroma / high if high > 0 else 0.0)      # 탁도: 채도 감소
+        )
+    return out
+
+
+def _robust_z(values: np.ndarray) -> np.ndarray:
+    median = np.median(values)
+    mad = np.median(np.abs(values - median)) * 1.4826
+    return (values - median) / mad if mad > 0 else np.zeros_like(values)
+
+
+class PlateWellDetector:
+    """
+    플레이트 이미지를 웰 격자로 나누고 웰별 지표를 병렬 계산
+
+    1. 에지 강도 투영으로 플레이트 영역(bounding box) 검출
+    2. 웰 수(layout)가 없으면 에지 투영의 자기상관 주기로 열 수를 추정해 표준 규격 선택
+    3. 격자 중심마다 원형 마스크 타일을 잘라 프로세스 풀에서 confluency/색/탁도 계산
+    4. 플레이트 전체 대비 색상(황변)/채도 감소(탁도) 강건 Z-점수로 오염 의심 웰 표시
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_side: int = 1600,
+                 parallel_min_wells: int = 24):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_side = max_side
+        self.parallel_min_wells = parallel_min_wells
+
+    def analyze_path(self, image_path: str, layout: Optional[int] = None,
+                     parallel: bool = True) -> Dict:
+        return self.analyze(load_plate_image(image_path, self.max_side), layout, parallel)
+
+    def analyze(self, image: np.ndarray, layout: Optional[int] = None,
+                parallel: bool = True) -> Dict:
+        """
+        Args:
+            image: (H, W, 3) RGB 배열 (0~1)
+            layout: 웰 수 (6/12/24/48/96/384, None이면 자동 추정)
+
+        Returns:
+            {
+                'layout': int,
+                'bbox': (top, bottom, left, right),
+                'wells': 웰당 1행 DataFrame ['well', 'row', 'col', 'center_y', 'center_x',
+                         'confluency', 'mean_intensity', 'texture', 'hue_shift', 'haze',
+                         'contamination_score', 'flagged', 'flag_reason'],
+                'tiles': (n, size, size, 3) 웰 타일 (원격 2차 분석용)
+            }
+        """
+        image = np.asarray(image, dtype=np.float32)
+        gray = image.mean(axis=2)
+        edges = np.hypot(ndimage.sobel(gray, axis=0), ndimage.sobel(gray, axis=1))
+        top, bottom, left, right = self._plate_bbox(edges)
+
+        if layout is None:
+            layout = self._estimate_layout(edges[top:bottom, left:right])
+        if layout not in PLATE_LAYOUTS:
+            raise ValueError(f"지원하지 않는 플레이트 규격: {layout} (가능: {sorted(PLATE_LAYOUTS)})")
+        n_rows, n_cols = PLATE_LAYOUTS[layout]
+
+        pitch_y = (bottom - top) / n_rows
+        pitch_x = (right - left) / n_cols
+        centers_y = top + (np.arange(n_rows) + 0.5) * pitch_y
+        centers_x = left + (np.arange(n_cols) + 0.5) * pitch_x
+        grid_y, grid_x = np.meshgrid(centers_y, centers_x, indexing='ij')
+        grid_y, grid_x = grid_y.ravel(), grid_x.ravel()
+
+        # 웰 테두리를 피하기 위해 피치의 80% 크기 타일 + 원형 마스크
+        half = max(2, int(0.4 * min(pitch_x, pitch_y)))
+        size = 2 * half
+        padded = np.pad(image, ((half, half), (half, half), (0, 0)), mode='edge')
+        offsets = np.arange(size)
+        ys = (np.round(grid_y).astype(int)[:, None] + offsets[None, :])  # 패딩으로 +half 상쇄
+        xs = (np.round(grid_x).astype(int)[:, None] + offsets[None, :])
+        tiles = padded[ys[:, :, None], xs[:, None, :]]                    # (n, size, size, 3)
+        yy, xx = np.mgrid[:size, :size] - (size - 1) / 2
+        mask = (yy ** 2 + xx ** 2) <= (0.9 * half) ** 2
+
+        window = max(3, size // 16)
+        texture_threshold = self._texture_threshold(tiles, mask, window)
+        metrics = self._compute_metrics(tiles, mask, texture_threshold, window, parallel)
+
+        wells = pd.DataFrame(metrics, columns=['confluency', 'mean_intensity', 'texture',
+                                               'hue_shift', 'haze'])
+        row_idx = np.repeat(np.arange(n_rows), n_cols)
+        col_idx = np.tile(np.arange(n_cols), n_rows)
+        row_names = np.asarray(ROW_LABELS, dtype=object)[row_idx]
+        wells.insert(0, 'well', [f"{r}{c + 1}" for r, c in zip(row_names, col_idx)])
+        wells.insert(1, 'row', row_names)
+        wells.insert(2, 'col', col_idx + 1)
+        wells.insert(3, 'center_y', grid_y.round().astype(int))
+        wells.insert(4, 'center_x', grid_x.round().astype(int))
+
+        yellow_z = _robust_z(wells['hue_shift'].to_numpy())
+        haze_z = _robust_z(wells['haze'].to_numpy())
+        wells['contamination_score'] = np.maximum(yellow_z, haze_z).clip(min=0)
+        reasons = np.select(
+            [yellow_z > CONTAMINATION_Z, haze_z > CONTAMINATION_Z, wells['confluency'] >= 0.95],
+            ['배지 황변 (산성화/세균 오염 의심)', '탁도 증가 (오염 의심)', '과밀 (계대 필요)'],
+            default=''
+        )
+        wells['flag_reason'] = reasons
+        wells['flagged'] = reasons != ''
+
+        return {'layout': layout, 'bbox': (top, bottom, left, right), 'wells': wells,
+                'tiles': tiles}
+
+    def _compute_metrics(self, tiles: np.ndarray, mask: np.ndarray, texture_threshold: float,
+                         window: int, parallel: bool) -> np.ndarray:
+        """타일을 작업자 수만큼 나눠 프로세스 풀에서 계산 (웰이 적으면 순차)"""
+        workers = min(self.max_workers, len(tiles))
+        if not parallel or workers <= 1 or len(tiles) < self.parallel_min_wells:
+            return _well_metrics(tiles, mask, texture_threshold, window)
+        chunks = np.array_split(np.arange(len(tiles)), workers)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = pool.map(
+                _well_metrics,
+                [tiles[c] for c in chunks],
+                [mask] * len(chunks),
+                [texture_threshold] * len(chunks),
+                [window] * len(chunks)
+            )
+            return np.concatenate(list(parts))
+
+    @staticmethod
+    def _texture_threshold(tiles: np.ndarray, mask: np.ndarray, window: int,
+                           max_tiles: int = 24) -> float:
+        """
+        세포/빈 배지 구분용 국소 표준편차 임계값 (웰 내부 픽셀의 Otsu 임계값)
+
+        웰별 계산과 같은 창 크기를 쓰되, 계산량을 줄이기 위해 최대 max_tiles개 웰만 사용합니다.
+        """
+        step = max(1, len(tiles) // max_tiles)
+        local_std = _local_std(tiles[::step].mean(axis=3), window)[:, mask].ravel()
+        if local_std.size == 0 or local_std.max() <= 0:
+            return np.inf
+        hist, bin_edges = np.histogram(local_std, bins=128)
+        centers = (bin_edges[:-1] + bin_edges[1:]) / 2
+        weight_bg = np.cumsum(hist)
+        weight_fg = weight_bg[-1] - weight_bg
+        mean_bg = np.cumsum(hist * centers) / np.maximum(weight_bg, 1)
+        mean_fg = (np.sum(hist * centers) - np.cumsum(hist * centers)) / np.maximum(weight_fg, 1)
+        between = weight_bg * weight_fg * (mean_bg - mean_fg) ** 2
+        return float(centers[int(np.argmax(between))])
+
+    @staticmethod
+    def _plate_bbox(edges: np.ndarray) -> Tuple[int, int, int, int]:
+        """에지 강도 행/열 투영이 최대의 10%를 넘는 범위 = 플레이트 영역"""
+        def _span(profile: np.ndarray) -> Tuple[int, int]:
+            profile = ndimage.uniform_filter1d(profile, max(3, len(profile) // 100))
+            active = np.flatnonzero(profile > 0.1 * profile.max()) if profile.max() > 0 else []
+            if len(active) == 0:
+                return 0, len(profile)
+            return int(active[0]), int(active[-1]) + 1
+
+        top, bottom = _span(edges.sum(axis=1))
+        left, right = _span(edges.sum(axis=0))
+        return top, bottom, left, right
+
+    @staticmethod
+    def _estimate_layout(edges: np.ndarray) -> int:
+        """열 방향 에지 투영의 자기상관 첫 피크(웰 간격)로 열 수를 구해 가장 가까운 규격 선택"""
+        profile = edges.sum(axis=0)
+        profile = profile - profile.mean()
+        n = len(profile)
+        spectrum = np.fft.rfft(profile, 2 * n)
+        autocorr = np.fft.irfft(spectrum * np.conj(spectrum))[:n]
+        min_lag = max(2, n // 30)   # 384-well(24열)보다 촘촘한 주기는 무시
+        search = autocorr[min_lag:n // 2]
+        if search.size == 0:
+            return 96
+        peaks = np.flatnonzero((search[1:-1] > search[:-2]) & (search[1:-1] >= search[2:])) + 1
+        lag = min_lag + (peaks[np.argmax(search[peaks])] if len(peaks) else int(np.argmax(search)))
+        n_cols = n / lag
+        return min(PLATE_LAYOUTS, key=lambda k: abs(PLATE_LAYOUTS[k][1] - n_cols))
+
+
+def flagged_tiles_montage(tiles: np.ndarray, wells: pd.DataFrame,
+                          max_wells: int = 12) -> Tuple[Image.Image, List[str]]:
+    """표시된 웰 타일을 한 장으로 이어 붙인 이미지와 웰 이름 목록 (원격 2차 분석용, 왼쪽→오른쪽)"""
+    flagged = wells.index[wells['flagged']][:max_wells]
+    if len(flagged) == 0:
+        raise ValueError("표시된 웰이 없습니다.")
+    strip = np.concatenate(list(tiles[flagged]), axis=1)
+    image = Image.fromarray((np.clip(strip, 0, 1) * 255).astype(np.uint8))
+    return image, wells.loc[flagged, 'well'].tolist()
+
+
+def plate_summary_markdown(analysis: Dict) -> str:
+    """로컬 웰 분석 결과를 원격 분석 답변과 같은 형식의 마크다운으로"""
+    wells = analysis['wells']
+    lines = [f"**레이아웃:** {analysis['layout']}-well plate", "", "**세포 밀도:**"]
+    lines += [f"- Well {w}: {c:.0%} confluent" for w, c in zip(wells['well'], wells['confluency'])]
+    contaminated = wells[wells['flag_reason'].str.contains('오염')]
+    lines += ["", f"**오염 여부:** {'확인됨' if len(contaminated) else '없음'}"]
+    lines += [f"- {w}: {r}" for w, r in zip(contaminated['well'], contaminated['flag_reason'])]
+    dense = wells.loc[wells['confluency'] >= 0.8, 'well'].tolist()
+    advice = f"{', '.join(dense)} 웰은 80% 이상 confluent - 계대 배양 권장" if dense else "계대 배양 시기 아님"
+    lines += ["", f"**권장사항:** {advice}"]
+    return '\n'.join(lines)
@@ -0,0 +1,224 @@
+"""qPCR 상대 정량 (ΔΔCt / Pfaffl 효율 보정) - 모든 플레이트·유전자를 groupby 연산으로 한 번에 계산"""
+
+import re
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_MAX_CT = 40.0          # 이 값 이상이면 미검출(Undetermined)로 간주
+DEFAULT_REPLICATE_SD = 0.5     # 기술 반복 Ct 표준편차 허용 기준 (cycle)
+
+# 요청 문구/컬럼명에서 qPCR 분석 여부를 판단하는 패턴 (Ct/Cq 컬럼, ΔΔCt, fold change 등)
+QPCR_PATTERN = re.compile(
+    r"q-?pcr|rt-pcr|δδ?ct|ddct|delta[\s_-]*delta|fold[\s_-]*change|\bc[tq](?![a-z])",
+    re.IGNORECASE
+)
+
+
+def _log2_efficiency(genes: pd.Series, efficiencies: Optional[Dict[str, float]]) -> np.ndarray:
+    """
+    유전자별 log2(증폭 효율) (효율 미지정 유전자는 2.0 → 1.0)
+
+    효율은 증폭 배수(예: 1.95) 또는 퍼센트(예: 95)로 받을 수 있습니다.
+    """
+    if not efficiencies:
+        return np.ones(len(genes))
+    factors = {
+        gene: (1.0 + value / 100.0) if value > 3 else float(value)
+        for gene, value in efficiencies.items()
+    }
+    return np.log2(genes.map(factors).fillna(2.0).to_numpy(dtype=float))
+
+
+def delta_delta_ct(df: pd.DataFrame,
+                   sample_col: str,
+                   gene_col: str,
+                   ct_col: str,
+                   reference_genes: Iterable[str],
+                   control_sample: str,
+                   plate_col: Optional[str] = None,
+                   efficiencies: Optional[Dict[str, float]] = None,
+                   max_ct: float = DEFAULT_MAX_CT,
+                   replicate_sd_threshold: float = DEFAULT_REPLICATE_SD) -> Dict:
+    """
+    상대 발현량(fold change)을 ΔΔCt 방법으로 계산
+
+    계산은 log2 공간에서 합니다. 유전자별 효율 E가 주어지면 -Ct·log2(E)를 log2 발현량으로 쓰며
+    (Pfaffl 방법), 모든 E가 2이면 고전적 2^-ΔΔCt와 같습니다. 참조 유전자가 여럿이면 log2
+    발현량의 평균(= 상대 발현량의 기하평균, geNorm 방식)으로 정규화합니다.
+    기술 반복의 표준오차(SD/√n)는 각 단계에서 제곱합의 제곱근으로 전파합니다.
+
+    Args:
+        sample_col / gene_col / ct_col: 시료, 유전자, Ct 컬럼 ('Undetermined' 등 문자열은 미검출)
+        reference_genes: 참조(housekeeping) 유전자 이름들
+        control_sample: 대조군 시료 이름 (fold change = 1 기준)
+        plate_col: 플레이트 컬럼 (지정하면 대조군과 참조 유전자를 같은 플레이트 안에서만 사용)
+        efficiencies: 유전자별 증폭 효율 {'GAPDH': 1.98, 'IL6': 94.5} (미지정이면 모두 2.0)
+        max_ct: 이 값 이상인 Ct는 미검출로 제외
+        replicate_sd_threshold: 기술 반복 Ct 표준편차가 이 값을 넘으면 high_variability 표시
+
+    Returns:
+        {
+            'replicates': 플레이트 × 시료 × 유전자별 n, ct_mean, ct_sd, ct_se, high_variability,
+            'results': 표적 유전자별 delta_ct, delta_delta_ct, log2_fold_change, log2_fold_change_se,
+                       fold_change, fold_change_low, fold_change_high (±1 SE), status,
+            'warnings': 경고 메시지 리스트
+        }
+    """
+    reference_genes = list(reference_genes)
+    if not reference_genes:
+        raise ValueError("참조 유전자(reference_genes)를 하나 이상 지정해야 합니다.")
+
+    sample_keys: List[str] = ([plate_col] if plate_col else []) + [sample_col]
+    plate_keys: List[str] = [plate_col] if plate_col else []
+    warnings_list = []
+
+    data = df[sample_keys + [gene_col, ct_col]].copy()
+    data[ct_col] = pd.to_numeric(data[ct_col], errors='coerce')
+    undetermined = data[ct_col].isna() | (data[ct_col] >= max_ct)
+    if undetermined.any():
+        warnings_list.append(f"미검출(Undetermined 또는 Ct ≥ {max_ct:g}) "
+                             f"{int(undetermined.sum())}개 웰 제외")
+
+    # 1. 기술 반복 집계 (플레이트 × 시료 × 유전자)
+    replicates = (
+        data[~undetermined]
+        .groupby(sample_keys + [gene_col], sort=False, observed=True)[ct_col]
+        .agg(['count', 'mean', 'std'])
+        .reset_index()
+        .rename(columns={'count': 'n', 'mean': 'ct_mean', 'std': 'ct_sd'})
+    )
+    replicates['ct_sd'] = replicates['ct_sd'].fillna(0.0)  # 반복 1개면 SD를 알 수 없으므로 0
+    replicates['ct_se'] = replicates['ct_sd'] / np.sqrt(replicates['n'])
+    replicates['high_variability'] = replicates['ct_sd'] > replicate_sd_threshold
+    if replicates['high_variability'].any():
+        warnings_list.append(
+            f"기술 반복 Ct SD > {replicate_sd_threshold:g}: "
+            f"{int(replicates['high_variability'].sum())}개 조합"
+        )
+
+    log2_eff = _log2_efficiency(replicates[gene_col], efficiencies)
+    replicates['log2_quantity'] = -replicates['ct_mean'] * log2_eff
+    replicates['log2_quantity_se'] = replicates['ct_se'] * log2_eff
+
+    # 2. 참조 유전자 정규화값 (시료별 log2 발현량 평균 = 기하평균)
+    is_reference = replicates[gene_col].isin(reference_genes)
+    reference = replicates[is_reference].assign(
+        _var=lambda d: d['log2_quantity_se'] ** 2
+    )
+    reference = (
+        reference.groupby(sample_keys, sort=False, observed=True)
+        .agg(ref_ct_mean=('ct_mean', 'mean'), ref_log2=('log2_quantity', 'mean'),
+             _var_sum=('_var', 'sum'), n_reference=(gene_col, 'nunique'))
+        .reset_index()
+    )
+    reference['ref_log2_se'] = np.sqrt(reference['_var_sum']) / reference['n_reference']
+    reference = reference.drop(columns='_var_sum')
+
+    results = replicates[~is_reference].merge(reference, on=sample_keys, how='left')
+    missing_reference = results['n_reference'].fillna(0) < len(reference_genes)
+    if missing_reference.any():
+        warnings_list.append(
+            f"참조 유전자가 일부/전부 없는 시료 {int(missing_reference.sum())}개 조합 "
+            "(있는 참조 유전자만으로 정규화, 하나도 없으면 계산 불가)"
+        )
+
+    # 3. ΔCt: 표적 - 참조 (log2 공간에서는 부호가 반대)
+    results['delta_ct'] = results['ct_mean'] - results['ref_ct_mean']
+    results['_norm'] = results['log2_quantity'] - results['ref_log2']
+    results['_norm_se'] = np.sqrt(results['log2_quantity_se'] ** 2 + results['ref_log2_se'] ** 2)
+
+    # 4. 같은 플레이트 대조군 대비 ΔΔCt
+    control = (
+        results.loc[results[sample_col] == control_sample,
+                    plate_keys + [gene_col, '_norm', '_norm_se']]
+        .rename(columns={'_norm': '_ctrl', '_norm_se': '_ctrl_se'})
+    )
+    if control.duplicated(plate_keys + [gene_col]).any():
+        raise ValueError(f"대조군 '{control_sample}'이(가) 같은 플레이트·유전자에 여러 번 있습니다.")
+    results = results.merge(control, on=plate_keys + [gene_col], how='left')
+
+    is_control = (results[sample_col] == control_sample).to_numpy()
+    results['log2_fold_change'] = results['_norm'] - results['_ctrl']
+    results['log2_fold_change_se'] = np.where(
+        is_control,
+        results['_norm_se'],
+        np.sqrt(results['_norm_se'] ** 2 + results['_ctrl_se'] ** 2)
+    )
+    results['delta_delta_ct'] = -results['log2_fold_change']
+    results['fold_change'] = np.exp2(results['log2_fold_change'])
+    log2_fc, log2_se = results['log2_fold_change'], results['log2_fold_change_se']
+    results['fold_change_low'] = np.exp2(log2_fc - log2_se)
+    results['fold_change_high'] = np.exp2(log2_fc + log2_se)
+
+    no_control = results['_ctrl'].isna()
+    results['status'] = np.select(
+        [results['ref_log2'].isna(), no_control],
+        ['no_reference', 'no_control'],
+        default='ok'
+    )
+    if no_control.any():
+        where = "같은 플레이트에 " if plate_col else ""
+        warnings_list.append(
+            f"{where}대조군 '{control_sample}' 측정값이 없어 계산하지 못한 조합 {int(no_control.sum())}개"
+        )
+
+    columns = sample_keys + [
+        gene_col, 'n', 'ct_mean', 'ct_se', 'ref_ct_mean', 'n_reference', 'delta_ct',
+        'delta_delta_ct', 'log2_fold_change', 'log2_fold_change_se',
+        'fold_change', 'fold_change_low', 'fold_change_high', 'status'
+    ]
+    return {
+        'replicates': replicates.drop(columns=['log2_quantity', 'log2_quantity_se']),
+        'results': results[columns],
+        'warnings': warnings_list
+    }
+
+
+def is_qpcr_request(text: str, columns: Iterable[str] = ()) -> bool:
+    """요청 문구 또는 데이터 컬럼명이 qPCR(Ct 값) 분석을 가리키는지 여부"""
+    return any(QPCR_PATTERN.search(str(value)) for value in [text, *columns])
+
+
+# 코드 생성 프롬프트에 qPCR 요청일 때만 덧붙이는 독립 실행용 import 블록.
+# 앱 밖(agents 패키지 없음)에서는 고전적 2^-ΔΔCt 최소 구현으로 대체하며,
+# delta_delta_ct와 결과가 같은지는 tests/test_qpcr.py가 확인합니다.
+STANDALONE_IMPORT = """import numpy as np
+import pandas as pd
+
+try:  # 앱 안에서 실행: 내장 엔진 사용
+    from agents.qpcr import delta_delta_ct
+except ImportError:  # 독립 실행: 효율 2.0을 가정한 최소 구현 (plate_col, efficiencies 미지원)
+    def delta_delta_ct(df, sample_col, gene_col, ct_col, reference_genes, control_sample,
+                       plate_col=None, efficiencies=None):
+        data = df[[sample_col, gene_col, ct_col]].copy()
+        data[ct_col] = pd.to_numeric(data[ct_col], errors='coerce')  # 'Undetermined' → NaN
+        rep = (data.dropna(subset=[ct_col])
+               .groupby([sample_col, gene_col], sort=False)[ct_col]
+               .agg(n='count', ct_mean='mean', ct_sd='std').reset_index())
+        rep['ct_se'] = rep['ct_sd'].fillna(0.0) / np.sqrt(rep['n'])
+        is_ref = rep[gene_col].isin(reference_genes)
+        ref = (rep[is_ref].assign(_var=rep['ct_se'] ** 2)
+               .groupby(sample_col, sort=False)
+               .agg(ref_ct_mean=('ct_mean', 'mean'), _var=('_var', 'sum'),
+                    _k=(gene_col, 'nunique'))
+               .reset_index())
+        ref['ref_ct_se'] = np.sqrt(ref['_var']) / ref['_k']
+        res = rep[~is_ref].merge(ref[[sample_col, 'ref_ct_mean', 'ref_ct_se']],
+                                 on=sample_col, how='left')
+        res['delta_ct'] = res['ct_mean'] - res['ref_ct_mean']
+        res['_se'] = np.sqrt(res['ct_se'] ** 2 + res['ref_ct_se'] ** 2)
+        ctrl = res.loc[res[sample_col] == control_sample, [gene_col, 'delta_ct', '_se']]
+        res = res.merge(ctrl.rename(columns={'delta_ct': '_ctrl', '_se': '_ctrl_se'}),
+                        on=gene_col, how='left')
+        res['delta_delta_ct'] = res['delta_ct'] - res['_ctrl']
+        se = np.where(res[sample_col] == control_sample, res['_se'],
+                      np.sqrt(res['_se'] ** 2 + res['_ctrl_se'] ** 2))
+        res['fold_change'] = np.exp2(-res['delta_delta_ct'])
+        res['fold_change_low'] = np.exp2(-res['delta_delta_ct'] - se)
+        res['fold_change_high'] = np.exp2(-res['delta_delta_ct'] + se)
+        return {'replicates': rep,
+                'results': res.drop(columns=['_se', '_ctrl', '_ctrl_se']),
+                'warnings': ['agents.qpcr 없이 실행: 효율 2.0 가정, 플레이트 구분 없음']}
+"""
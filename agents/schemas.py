@@ -0,0 +1,414 @@
+import json
+import re
+from dataclasses import dataclass, asdict, field, fields
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import google.generativeai as genai
+import numpy as np
+import pandas as pd
+
+# Gemini 응답 스키마 (OpenAPI subset) - 코드 생성 결과
+ANALYSIS_RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "code": {"type": "string"},
+        "interpretation": {"type": "string"},
+        "warnings": {"type": "string"}
+    },
+    "required": ["code"]
+}
+
+
+class SchemaValidationError(ValueError):
+    """LLM 응답이 기대한 스키마와 일치하지 않을 때 발생"""
+
+
+def supports_response_schema() -> bool:
+    """설치된 SDK가 generation_config의 response_schema를 지원하는지 확인"""
+    config_cls = getattr(getattr(genai, 'types', None), 'GenerationConfig', None)
+    fields = getattr(config_cls, '__dataclass_fields__', None) or {}
+    return 'response_schema' in fields
+
+
+def _as_text(value: Any, field: str) -> str:
+    """스키마의 문자열 필드를 str로 정규화 (문자열 리스트는 줄 단위로 결합)"""
+    if value is None:
+        return ''
+    if isinstance(value, str):
+        return value
+    if isinstance(value, list) and all(isinstance(item, (str, int, float)) for item in value):
+        return '\n'.join(str(item) for item in value)
+    raise SchemaValidationError(
+        f"'{field}' 필드는 문자열이어야 합니다 (받은 타입: {type(value).__name__})"
+    )
+
+
+@dataclass
+class AnalysisResult:
+    """검증이 끝난 코드 생성 결과 (에이전트 경계에서 한 번만 생성)"""
+
+    code: str
+    interpretation: str
+    warnings: str
+    language: str = "python"
+    model: str = ""
+    raw_response: str = ""
+
+    @classmethod
+    def from_response(cls, text: str, language: str = "python",
+                      model: str = "") -> "AnalysisResult":
+        """
+        JSON 응답 텍스트를 파싱하고 ANALYSIS_RESPONSE_SCHEMA로 검증
+
+        Raises:
+            SchemaValidationError: JSON이 아니거나 필수 필드가 없거나 타입이 맞지 않는 경우
+        """
+        try:
+            data = json.loads(text)
+        except (TypeError, json.JSONDecodeError) as e:
+            raise SchemaValidationError(f"JSON 응답이 아닙니다: {str(e)}")
+
+        if not isinstance(data, dict):
+            raise SchemaValidationError("응답 최상위가 JSON 객체가 아닙니다.")
+
+        missing = [key for key in ANALYSIS_RESPONSE_SCHEMA['required'] if key not in data]
+        if missing:
+            raise SchemaValidationError(f"응답에 필수 필드가 없습니다: {', '.join(missing)}")
+
+        return cls(
+            code=_as_text(data.get('code'), 'code'),
+            interpretation=_as_text(data.get('interpretation'), 'interpretation'),
+            warnings=_as_text(data.get('warnings'), 'warnings'),
+            language=language,
+            model=model,
+            raw_response=text
+        )
+
+    def to_dict(self) -> Dict[str, str]:
+        return asdict(self)
+
+
+# Gemini 응답 스키마 - 이미지 분석 결과 (젤 전기영동 / 세포 배양 플레이트)
+GEL_RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "lanes": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "lane": {"type": "integer"},
+                    "is_ladder": {"type": "boolean"},
+                    "bands": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "position": {"type": "number"},
+                                "size_bp": {"type": "number"},
+                                "intensity": {"type": "number"}
+                            }
+                        }
+                    },
+                    "note": {"type": "string"}
+                },
+                "required": ["lane"]
+            }
+        },
+        "quality": {"type": "string"},
+        "controls": {"type": "string"},
+        "recommendations": {"type": "array", "items": {"type": "string"}}
+    },
+    "required": ["lanes", "quality"]
+}
+
+CELL_PLATE_RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "layout": {"type": "integer"},
+        "wells": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "well": {"type": "string"},
+                    "confluency": {"type": "number"},
+                    "contaminated": {"type": "boolean"},
+                    "note": {"type": "string"}
+                },
+                "required": ["well"]
+            }
+        },
+        "contamination": {"type": "boolean"},
+        "recommendations": {"type": "array", "items": {"type": "string"}}
+    },
+    "required": ["wells"]
+}
+
+VISION_RESPONSE_SCHEMAS = {'gel': GEL_RESPONSE_SCHEMA, 'cell_plate': CELL_PLATE_RESPONSE_SCHEMA}
+QUALITY_GRADES = ('Good', 'Fair', 'Poor')
+
+
+def _as_float(value: Any) -> Optional[float]:
+    try:
+        return None if value is None else float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _normalize_quality(value: Any) -> str:
+    """'good' / 'Fair (번짐 있음)' 등 → 'Good'/'Fair'/'Poor' (알 수 없으면 '')"""
+    text = str(value or '').strip().lower()
+    return next((grade for grade in QUALITY_GRADES if text.startswith(grade.lower())), '')
+
+
+def _as_fraction(value: Any) -> Optional[float]:
+    """confluency를 0~1 비율로 (80, '80%', 0.8 모두 허용)"""
+    number = _as_float(str(value).rstrip('% ') if isinstance(value, str) else value)
+    if number is None:
+        return None
+    return number / 100.0 if number > 1.0 else number
+
+
+@dataclass
+class BandCall:
+    """레인 안의 밴드 하나 (position은 레인 위→아래 픽셀 또는 0~1 상대 위치)"""
+
+    position: Optional[float] = None
+    size_bp: Optional[float] = None
+    intensity: Optional[float] = None
+
+
+@dataclass
+class LaneCall:
+    """젤 레인 하나 (lane은 1부터 시작)"""
+
+    lane: int
+    is_ladder: bool = False
+    bands: List[BandCall] = field(default_factory=list)
+    note: str = ""
+
+
+@dataclass
+class WellCall:
+    """플레이트 웰 하나 (confluency는 0~1, metrics는 로컬 검출기 지표)"""
+
+    well: str
+    confluency: Optional[float] = None
+    contaminated: bool = False
+    note: str = ""
+    metrics: Dict[str, float] = field(default_factory=dict)
+
+
+@dataclass
+class VisionResult:
+    """
+    이미지 분석 결과 (로컬 검출기/Gemini 공통 형식, JSON으로 저장/복원 가능)
+
+    raw_analysis는 화면 표시용 마크다운이고, 집계/검색에는 구조화 필드를 사용합니다.
+    """
+
+    kind: str                                   # 'gel' | 'cell_plate'
+    image_hash: str = ""
+    image_path: str = ""
+    source: str = "remote"                      # 'local' | 'remote' | 'local+remote'
+    model: str = ""
+    quality: str = ""                           # 'Good' | 'Fair' | 'Poor' | ''
+    lanes: List[LaneCall] = field(default_factory=list)
+    layout: Optional[int] = None
+    wells: List[WellCall] = field(default_factory=list)
+    contamination: Optional[bool] = None
+    recommendations: List[str] = field(default_factory=list)
+    raw_analysis: str = ""
+    details: Dict[str, Any] = field(default_factory=dict)   # 로컬 분석 원본, 전처리 정보 등
+    experiment: str = ""
+    created_at: str = field(default_factory=lambda: datetime.now().isoformat(timespec='seconds'))
+    cached: bool = False
+
+    @property
+    def n_bands(self) -> int:
+        return sum(len(lane.bands) for lane in self.lanes)
+
+    @property
+    def flagged_wells(self) -> List[str]:
+        return [w.well for w in self.wells if w.contaminated or w.note]
+
+    def wells_frame(self) -> pd.DataFrame:
+        """웰당 1행 DataFrame (metrics 열 포함)"""
+        return pd.DataFrame([
+            {'well': w.well, 'confluency': w.confluency, 'contaminated': w.contaminated,
+             'note': w.note, **w.metrics}
+            for w in self.wells
+        ], columns=None if self.wells else ['well', 'confluency', 'contaminated', 'note'])
+
+    def bands_frame(self) -> pd.DataFrame:
+        """밴드당 1행 DataFrame ['lane', 'is_ladder', 'position', 'size_bp', 'intensity']"""
+        return pd.DataFrame([
+            {'lane': lane.lane, 'is_ladder': lane.is_ladder, **asdict(band)}
+            for lane in self.lanes for band in lane.bands
+        ], columns=['lane', 'is_ladder', 'position', 'size_bp', 'intensity'])
+
+    def summary(self) -> Dict[str, Any]:
+        """인덱스/배치 요약용 스칼라 필드"""
+        confluency = [w.confluency for w in self.wells if w.confluency is not None]
+        return {
+            'kind': self.kind,
+            'quality': self.quality,
+            'source': self.source,
+            'n_lanes': len(self.lanes),
+            'n_bands': self.n_bands,
+            'layout': self.layout,
+            'n_wells': len(self.wells),
+            'mean_confluency': float(np.mean(confluency)) if confluency else None,
+            'contaminated_wells': sum(w.contaminated for w in self.wells),
+            'contamination': self.contamination
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False, default=_json_default)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "VisionResult":
+        data = dict(data)
+        data['lanes'] = [
+            LaneCall(**{**lane, 'bands': [BandCall(**b) for b in lane.get('bands', [])]})
+            for lane in data.get('lanes', [])
+        ]
+        data['wells'] = [WellCall(**well) for well in data.get('wells', [])]
+        known = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in data.items() if k in known})
+
+    @classmethod
+    def from_response(cls, text: str, kind: str, **extra) -> "VisionResult":
+        """
+        Gemini 응답(JSON 스키마 또는 이전 마크다운 형식)을 구조화
+
+        JSON이 아니면 '**품질 평가:** Good', '- Lane 1: ...', '- Well A1: 80% confluent'
+        형식의 마크다운에서 가능한 필드만 추출합니다 (원문은 raw_analysis에 보존).
+        """
+        if kind not in VISION_RESPONSE_SCHEMAS:
+            raise SchemaValidationError(f"지원하지 않는 이미지 분석 종류: {kind}")
+        try:
+            data = json.loads(text)
+        except (TypeError, json.JSONDecodeError):
+            data = None
+
+        if not isinstance(data, dict):
+            result = cls._from_markdown(text or '', kind, **extra)
+            result.raw_analysis = text or ''
+            return result
+
+        missing = [key for key in VISION_RESPONSE_SCHEMAS[kind]['required'] if key not in data]
+        if missing:
+            raise SchemaValidationError(f"응답에 필수 필드가 없습니다: {', '.join(missing)}")
+
+        recommendations = data.get('recommendations') or []
+        if isinstance(recommendations, str):
+            recommendations = [recommendations]
+        result = cls(kind=kind, recommendations=[str(r) for r in recommendations], **extra)
+        if kind == 'gel':
+            result.quality = _normalize_quality(data.get('quality'))
+            result.lanes = [
+                LaneCall(
+                    lane=int(lane.get('lane', i + 1)),
+                    is_ladder=bool(lane.get('is_ladder', False)),
+                    bands=[
+                        BandCall(_as_float(b.get('position')), _as_float(b.get('size_bp')),
+                                 _as_float(b.get('intensity')))
+                        for b in lane.get('bands') or [] if isinstance(b, dict)
+                    ],
+                    note=str(lane.get('note') or '')
+                )
+                for i, lane in enumerate(data['lanes']) if isinstance(lane, dict)
+            ]
+            if data.get('controls'):
+                result.details['controls'] = str(data['controls'])
+        else:
+            result.layout = int(data['layout']) if _as_float(data.get('layout')) else None
+            result.wells = [
+                WellCall(
+                    well=str(w['well']).strip().upper(),
+                    confluency=_as_fraction(w.get('confluency')),
+                    contaminated=bool(w.get('contaminated', False)),
+                    note=str(w.get('note') or '')
+                )
+                for w in data['wells'] if isinstance(w, dict) and w.get('well')
+            ]
+            contamination = data.get('contamination')
+            result.contamination = (bool(contamination) if contamination is not None
+                                    else any(w.contaminated for w in result.wells))
+        result.raw_analysis = result.to_markdown()
+        return result
+
+    @classmethod
+    def _from_markdown(cls, text: str, kind: str, **extra) -> "VisionResult":
+        result = cls(kind=kind, **extra)
+        quality = re.search(r'품질\s*평가:?\**\s*:?\s*(Good|Fair|Poor)', text, re.IGNORECASE)
+        result.quality = _normalize_quality(quality.group(1)) if quality else ''
+        for match in re.finditer(r'^\s*[-*]\s*Lane\s*(\d+)([^:\n]*):\s*(.*)$', text,
+                                 re.MULTILINE | re.IGNORECASE):
+            description = match.group(2) + match.group(3)
+            result.lanes.append(LaneCall(
+                lane=int(match.group(1)),
+                is_ladder='ladder' in description.lower() or 'marker' in description.lower(),
+                bands=[BandCall(size_bp=float(size.replace(',', '')))
+                       for size in re.findall(r'([\d,]+(?:\.\d+)?)\s*bp', match.group(3))],
+                note=match.group(3).strip()
+            ))
+        for match in re.finditer(r'Well\s+([A-Z]{1,2}\d{1,2})\s*:\s*(\d+(?:\.\d+)?)\s*%', text,
+                                 re.IGNORECASE):
+            confluency = _as_fraction(float(match.group(2)))
+            result.wells.append(WellCall(match.group(1).upper(), confluency))
+        layout = re.search(r'(\d+)\s*-?\s*well', text, re.IGNORECASE)
+        if kind == 'cell_plate' and layout:
+            result.layout = int(layout.group(1))
+        contamination = re.search(r'오염\s*여부:?\**\s*:?\s*(확인됨|있음|없음)', text)
+        if contamination:
+            result.contamination = contamination.group(1) != '없음'
+        recommendations = re.search(r'(?:제안사항|권장사항):?\**\s*:?\s*(.*)', text, re.DOTALL)
+        if recommendations:
+            items = [line.strip(' -*') for line in recommendations.group(1).splitlines()]
+            result.recommendations = [item for item in items if item]
+        return result
+
+    def to_markdown(self) -> str:
+        """화면 표시용 요약 (이전 자유 형식 응답과 같은 구성)"""
+        lines = []
+        if self.kind == 'gel':
+            lines.append("**밴드 분석:**")
+            for lane in self.lanes:
+                label = " (ladder)" if lane.is_ladder else ""
+                sizes = [f"~{b.size_bp:,.0f} bp" for b in lane.bands if b.size_bp]
+                text = f"{len(lane.bands)}개" + (f" ({', '.join(sizes)})" if sizes else "")
+                note = f" - {lane.note}" if lane.note else ""
+                lines.append(f"- Lane {lane.lane}{label}: {text}{note}")
+            lines += ["", f"**품질 평가:** {self.quality or '판정 불가'}"]
+            if self.details.get('controls'):
+                lines += ["", f"**대조군:** {self.details['controls']}"]
+        else:
+            if self.layout:
+                lines += [f"**레이아웃:** {self.layout}-well plate", ""]
+            lines.append("**세포 밀도:**")
+            for w in self.wells:
+                confluency = (f"{w.confluency:.0%} confluent" if w.confluency is not None
+                              else "판정 불가")
+                lines.append(f"- Well {w.well}: {confluency}" + (f" - {w.note}" if w.note else ""))
+            status = {True: '확인됨', False: '없음', None: '판정 불가'}[self.contamination]
+            lines += ["", f"**오염 여부:** {status}"]
+        if self.recommendations:
+            lines += ["", "**제안사항:**" if self.kind == 'gel' else "**권장사항:**"]
+            lines += [f"- {item}" for item in self.recommendations]
+        return "\n".join(lines)
+
+
+def _json_default(value: Any):
+    """NumPy 스칼라/배열을 JSON 기본 타입으로"""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return str(value)
@@ -1,15 +1,208 @@
 # agents/validator.py
+import copy
+import functools
+import inspect
+import warnings
+
 import pandas as pd
 import numpy as np
 from sklearn.ensemble import IsolationForest
-from typing import Dict, List
+from typing import Dict, List, Optional, Union
+
+from utils.cache import BoundedCache, dataframe_fingerprint
+from utils.data_profiler import DataProfile
+from .calibration import fit_calibration_curve
+from .qpcr import delta_delta_ct
+
+_MISSING = object()
+
+
+def _freeze(value):
+    """캐시 키용으로 인자를 해시 가능한 형태로 변환 (리스트 → 튜플, dict → 정렬된 튜플)"""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, set):
+        return frozenset(value)
+    return value
+
+
+def _columns_read(arguments: Dict) -> tuple:
+    """메서드 인자 중 컬럼 지정(*_col / *_cols)을 모아 중복 없는 컬럼 튜플로 반환 (None은 제외)"""
+    columns = []
+    for name, value in arguments.items():
+        if not name.endswith(('_col', '_cols')) or value is None:
+            continue
+        for column in ([value] if isinstance(value, str) else value):
+            if column not in columns:
+                columns.append(column)
+    return tuple(columns)
+
+
+def _memoized(method):
+    """
+    입력을 수정하지 않는 검증 메서드의 결과를 (읽는 컬럼, 데이터 지문, 메서드, 인스턴스 설정, 인자)
+    기준으로 캐시
+
+    지문은 메서드가 읽는 컬럼(*_col / *_cols 인자)과 인덱스만으로 계산해, 넓은 DataFrame에서도
+    호출마다 전체 프레임을 해시하지 않습니다. 기본값까지 채운 인자로 키를 만들므로 위치/키워드
+    호출이 같은 키를 쓰고, contamination처럼 결과에 영향을 주는 인스턴스 설정(_cache_settings)도
+    키에 포함합니다. 캐시된 결과는 복사본으로 반환해 호출자가 결과를 수정해도 캐시가
+    바뀌지 않습니다. 지문이나 인자를 해시할 수 없으면(없는 컬럼 포함) 캐시 없이 실행합니다.
+    """
+    signature = inspect.signature(method)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        try:
+            params = tuple(
+                (name, _freeze(value)) for name, value in bound.arguments.items()
+                if name not in ('self', 'df')
+            )
+            columns = _columns_read(bound.arguments)
+            fingerprint = dataframe_fingerprint(bound.arguments['df'], columns)
+            key = (columns, fingerprint, method.__name__, self._cache_settings(), params)
+            hash(key)
+        except (TypeError, KeyError):
+            return method(self, *args, **kwargs)
+
+        result = self._results.get(key, _MISSING)
+        if result is _MISSING:
+            result = method(self, *args, **kwargs)
+            self._results.put(key, result)
+        return copy.deepcopy(result)
+
+    return wrapper
+
+
+def _linregress_from_moments(n, mean_x, mean_y, sxx, syy, sxy) -> Dict[str, np.ndarray]:
+    """
+    중심화된 2차 모멘트(편차 제곱합/곱의 합)로부터 단순 선형회귀 결과를 배열 단위로 계산
+
+    scipy.stats.linregress와 같은 정의의 slope, intercept, r, p-value(양측, df = n - 2),
+    std_err(기울기 표준오차)를 반환합니다.
+    """
+    from scipy.stats import t as t_dist
+
+    n = np.asarray(n, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slope = sxy / sxx
+        intercept = mean_y - slope * mean_x
+        r = np.clip(sxy / np.sqrt(sxx * syy), -1.0, 1.0)
+        dof = n - 2
+        t_stat = r * np.sqrt(dof / ((1.0 - r) * (1.0 + r)))
+        p_value = 2 * t_dist.sf(np.abs(t_stat), dof)
+        std_err = np.sqrt((1 - r ** 2) * syy / sxx / dof)
+    return {
+        'slope': slope,
+        'intercept': intercept,
+        'r': r,
+        'r_squared': r ** 2,
+        'p_value': p_value,
+        'std_err': std_err
+    }
+
 
 class ExperimentValidator:
     """실험 데이터의 품질을 검증하는 클래스"""
+
+    ROBUST_METHODS = ('mad', 'iqr', 'hampel')
+    # 방법별 기본 임계값: 수정 Z-점수(Iglewicz-Hoaglin), Tukey fence 배수, Hampel 배수
+    ROBUST_THRESHOLDS = {'mad': 3.5, 'iqr': 1.5, 'hampel': 3.0}
+    SCALABLE_ROW_THRESHOLD = 50_000  # 이 행 수를 넘으면 부분 표본 학습 사용
     
-    def __init__(self):
+    def __init__(self, cache_size: int = 32):
         self.contamination = 0.1
+        # 검증 결과 캐시 (읽는 컬럼, 데이터 지문, 메서드, 인스턴스 설정, 인자) -> 결과
+        self._results = BoundedCache(max_entries=cache_size)
+        # 대용량 이상치 탐지용 학습 모델 캐시 (데이터 지문, 컬럼, contamination 기준)
+        self._outlier_models = BoundedCache(max_entries=8)  # key -> (model, mask)
         
+    def _cache_settings(self) -> tuple:
+        """결과 캐시 키에 넣을 인스턴스 설정 (바꾸면 이전 캐시 결과를 쓰지 않음)"""
+        return (self.contamination, self.SCALABLE_ROW_THRESHOLD, _freeze(self.ROBUST_THRESHOLDS))
+
+    def cache_stats(self) -> Dict:
+        """검증 결과 캐시의 항목 수와 hit/miss 카운터"""
+        return self._results.stats()
+
+    def invalidate_cache(self, df: Optional[pd.DataFrame] = None) -> int:
+        """
+        캐시 무효화 (df를 주면 그 데이터의 결과만, 없으면 이상치 모델 캐시까지 전체)
+
+        Returns:
+            제거한 결과 항목 수
+        """
+        if df is None:
+            self._outlier_models.invalidate()
+            return self._results.invalidate()
+        fingerprints = {}
+
+        def matches(key) -> bool:
+            columns, fingerprint = key[0], key[1]
+            if columns not in fingerprints:
+                try:
+                    fingerprints[columns] = dataframe_fingerprint(df, columns)
+                except KeyError:
+                    fingerprints[columns] = None
+            return fingerprints[columns] == fingerprint
+
+        return self._results.invalidate(matches)
+
+    def check_data_quality(self, profile: DataProfile,
+                           max_missing_pct: float = 20.0) -> Dict:
+        """
+        데이터 프로파일의 통계만으로 표 전체 품질 점검 (데이터를 다시 읽지 않음)
+
+        근사 프로파일도 결측 수/표준편차는 정확하므로 대용량 파일 전체 기준으로 판정됩니다.
+
+        Returns:
+            {
+                'is_valid': bool,
+                'warnings': [str],
+                'empty_columns': [...],          # 모든 값이 결측
+                'high_missing_columns': [...],   # 결측률 > max_missing_pct%
+                'constant_columns': [...]        # 값이 한 가지뿐 (수치: 표준편차 0)
+            }
+        """
+        empty, high_missing, constant = [], [], []
+        for column in profile.columns:
+            if profile.n_rows and column.null_count == profile.n_rows:
+                empty.append(column.name)
+                continue
+            if column.null_pct > max_missing_pct:
+                high_missing.append((column.name, column.null_pct))
+            if column.numeric:
+                if column.std == 0:
+                    constant.append(column.name)
+            elif column.unique_count == 1:
+                constant.append(column.name)
+
+        warnings_list = []
+        if profile.n_rows == 0:
+            warnings_list.append("데이터에 행이 없습니다.")
+        if empty:
+            warnings_list.append(f"모든 값이 결측인 열: {', '.join(map(str, empty))}")
+        if high_missing:
+            warnings_list.append(
+                f"결측률 {max_missing_pct:.0f}% 초과 열: "
+                + ', '.join(f"{name}({pct:.1f}%)" for name, pct in high_missing)
+            )
+        if constant:
+            warnings_list.append(f"값이 한 가지뿐인 열 (분석 변수로 부적합): {', '.join(map(str, constant))}")
+
+        return {
+            'is_valid': len(warnings_list) == 0,
+            'warnings': warnings_list,
+            'empty_columns': empty,
+            'high_missing_columns': [name for name, _ in high_missing],
+            'constant_columns': constant
+        }
+
+    @_memoized
     def validate_standard_curve(self, df: pd.DataFrame, 
                                 x_col: str, y_col: str) -> Dict:
         """
@@ -50,6 +243,178 @@ class ExperimentValidator:
             'warnings': warnings
         }
     
+    @_memoized
+    def validate_standard_curves(self, df: pd.DataFrame,
+                                 group_col: Union[str, List[str]],
+                                 x_col: str, y_col: str,
+                                 r2_threshold: float = 0.95,
+                                 p_threshold: float = 0.05) -> pd.DataFrame:
+        """
+        여러 Standard Curve(플레이트/분석물별)를 한 번에 선형성 검증
+
+        그룹별 합계(n, 평균, 편차 곱의 합)를 groupby로 계산한 뒤 최소제곱 해를
+        배열 연산으로 구하므로 곡선 수와 관계없이 데이터를 두 번만 훑습니다.
+        결과는 곡선마다 scipy.stats.linregress와 같은 값입니다 (x 또는 y 결측 행은 제외).
+
+        Returns:
+            그룹 컬럼 + ['n', 'slope', 'intercept', 'r_squared', 'p_value', 'std_err',
+            'is_valid', 'warnings'] DataFrame (곡선당 1행)
+        """
+        keys = group_col if isinstance(group_col, list) else [group_col]
+        data = df[keys + [x_col, y_col]].dropna(subset=[x_col, y_col])
+        grouped = data.groupby(keys, sort=False, observed=True)
+
+        means = grouped[[x_col, y_col]].transform('mean')
+        dx = data[x_col].to_numpy(dtype=float) - means[x_col].to_numpy()
+        dy = data[y_col].to_numpy(dtype=float) - means[y_col].to_numpy()
+        moments = pd.DataFrame(
+            {'sxx': dx * dx, 'syy': dy * dy, 'sxy': dx * dy},
+            index=data.index
+        ).groupby([data[k] for k in keys], sort=False, observed=True).sum()
+        agg = grouped[[x_col, y_col]].agg(['count', 'mean']).reindex(moments.index)
+
+        return self._curves_from_moments(
+            moments.index,
+            n=agg[(x_col, 'count')].to_numpy(),
+            mean_x=agg[(x_col, 'mean')].to_numpy(),
+            mean_y=agg[(y_col, 'mean')].to_numpy(),
+            sxx=moments['sxx'].to_numpy(),
+            syy=moments['syy'].to_numpy(),
+            sxy=moments['sxy'].to_numpy(),
+            r2_threshold=r2_threshold,
+            p_threshold=p_threshold
+        )
+
+    def _curves_from_moments(self, index: pd.Index, n, mean_x, mean_y, sxx, syy, sxy,
+                             r2_threshold: float, p_threshold: float) -> pd.DataFrame:
+        """곡선별 충분통계량(n, 평균, 편차 제곱합/곱의 합)으로 validate_standard_curves 결과 생성"""
+        fit = _linregress_from_moments(n, mean_x, mean_y, sxx, syy, sxy)
+
+        result = index.to_frame(index=False)
+        result['n'] = n
+        for name in ('slope', 'intercept', 'r_squared', 'p_value', 'std_err'):
+            result[name] = fit[name]
+        curve_warnings = [
+            self._curve_warnings(r2, p, n, r2_threshold, p_threshold)
+            for r2, p, n in zip(result['r_squared'], result['p_value'], result['n'])
+        ]
+        result['is_valid'] = [len(w) == 0 for w in curve_warnings]
+        result['warnings'] = curve_warnings
+        return result
+
+    @staticmethod
+    def _curve_warnings(r_squared: float, p_value: float, n: int,
+                        r2_threshold: float, p_threshold: float) -> List[str]:
+        """validate_standard_curve와 같은 기준의 경고 메시지"""
+        warnings = []
+        if n < 3:
+            warnings.append(f"⚠️ 측정점 {n}개 (최소 3개 필요). 회귀를 평가할 수 없습니다.")
+            return warnings
+        if not r_squared >= r2_threshold:
+            warnings.append(
+                f"⚠️ R² = {r_squared:.3f} (권장: ≥ {r2_threshold}). "
+                "희석 배수를 확인하세요."
+            )
+        if not p_value <= p_threshold:
+            warnings.append(
+                f"⚠️ p-value = {p_value:.3f} (유의하지 않음). "
+                "측정 오류 가능성 있음."
+            )
+        return warnings
+
+    @_memoized
+    def fit_calibration(self, df: pd.DataFrame, x_col: str, y_col: str,
+                        model: str = 'linear',
+                        group_col: Optional[str] = None) -> Dict:
+        """
+        Standard Curve 보정 곡선 적합 (선형 / 4PL / 5PL, 그룹별 가능)
+
+        Args:
+            x_col: 표준 농도 컬럼
+            y_col: 측정 반응 컬럼 (흡광도, 형광 등)
+            model: 'linear', '4pl', '5pl'
+            group_col: 플레이트/분석물별로 곡선을 따로 적합할 때의 그룹 컬럼
+
+        Returns:
+            {
+                'curves': {그룹값(그룹 없으면 None): CalibrationCurve},
+                'failed': {그룹값: 오류 메시지}
+            }
+        """
+        curves, failed = {}, {}
+        if group_col is None:
+            parts = [(None, df)]
+        else:
+            parts = df.groupby(group_col, sort=False, observed=True)
+        for key, part in parts:
+            try:
+                curves[key] = fit_calibration_curve(part[x_col], part[y_col], model=model)
+            except (ValueError, RuntimeError) as e:
+                failed[key] = str(e)
+        return {'curves': curves, 'failed': failed}
+
+    def predict_concentrations(self, calibration: Dict, df: pd.DataFrame, y_col: str,
+                               group_col: Optional[str] = None,
+                               n_replicates: int = 1,
+                               confidence: float = 0.95) -> pd.DataFrame:
+        """
+        미지 시료 반응값을 농도로 역추정 (곡선별 배열 연산, 입력 수정 없음)
+
+        Args:
+            calibration: fit_calibration 결과
+            y_col: 미지 시료 반응 컬럼
+            group_col: fit_calibration에 사용한 그룹 컬럼 (시료를 해당 곡선에 매칭)
+            n_replicates: 각 반응값이 몇 번 반복 측정의 평균인지 (신뢰구간 폭에 반영)
+            confidence: 신뢰수준
+
+        Returns:
+            df.index 기준 DataFrame ['concentration', 'ci_lower', 'ci_upper',
+            'range_flag', 'out_of_range'] - range_flag는 'ok' / 'below_range' /
+            'above_range' / 'no_solution' / 'no_curve'
+        """
+        n = len(df)
+        result = pd.DataFrame({
+            'concentration': np.full(n, np.nan),
+            'ci_lower': np.full(n, np.nan),
+            'ci_upper': np.full(n, np.nan),
+            'range_flag': np.full(n, 'no_curve', dtype=object)
+        }, index=df.index)
+
+        y = df[y_col].to_numpy(dtype=float)
+        if group_col is None:
+            positions = {None: np.arange(n)}
+        else:
+            positions = df.groupby(group_col, sort=False, observed=True).indices
+
+        for key, rows in positions.items():
+            curve = calibration['curves'].get(key)
+            if curve is None:
+                continue
+            predicted = curve.inverse_predict(y[rows], n_replicates=n_replicates,
+                                              confidence=confidence)
+            for name, values in predicted.items():
+                result.iloc[rows, result.columns.get_loc(name)] = values
+
+        result['out_of_range'] = result['range_flag'] != 'ok'
+        return result
+
+    @_memoized
+    def analyze_qpcr(self, df: pd.DataFrame, sample_col: str, gene_col: str, ct_col: str,
+                     reference_genes: List[str], control_sample: str,
+                     plate_col: Optional[str] = None,
+                     efficiencies: Optional[Dict[str, float]] = None,
+                     **kwargs) -> Dict:
+        """
+        qPCR ΔΔCt 상대 정량 (agents.qpcr.delta_delta_ct 위임)
+
+        Returns:
+            {'replicates': DataFrame, 'results': DataFrame, 'warnings': list}
+        """
+        return delta_delta_ct(
+            df, sample_col, gene_col, ct_col, reference_genes, control_sample,
+            plate_col=plate_col, efficiencies=efficiencies, **kwargs
+        )
+
     def detect_outliers(self, df: pd.DataFrame, 
                        numeric_cols: List[str]) -> pd.DataFrame:
         """Isolation Forest로 이상치 탐지"""
@@ -63,26 +428,286 @@ class ExperimentValidator:
         df['is_outlier'] = predictions == -1
         
         return df
+
+    def detect_outliers_scalable(self, df: pd.DataFrame,
+                                 numeric_cols: List[str],
+                                 max_samples: int = 100_000,
+                                 chunk_size: int = 200_000,
+                                 random_state: int = 42) -> pd.Series:
+        """
+        대용량 데이터용 Isolation Forest 이상치 탐지 (입력 DataFrame은 수정하지 않음)
+
+        최대 max_samples개의 무작위 부분 표본으로 학습하고, 전체 행은 chunk_size 단위로
+        n_jobs=-1 병렬 채점합니다. 학습된 모델과 결과 마스크는 (데이터 지문, 컬럼,
+        contamination) 기준으로 캐시되어 같은 데이터에 대한 재호출은 즉시 반환됩니다.
+        결측치가 있는 행은 채점하지 않고 False로 표시됩니다.
+
+        Returns:
+            df.index와 같은 인덱스의 bool Series (이상치이면 True)
+        """
+        key = (dataframe_fingerprint(df, numeric_cols), tuple(numeric_cols),
+               self.contamination, max_samples, random_state)
+        cached = self._outlier_models.get(key)
+        if cached is not None:
+            return pd.Series(cached[1].copy(), index=df.index, name='is_outlier')
+
+        X = df[numeric_cols].to_numpy(dtype=float)
+        valid_rows = np.flatnonzero(~np.isnan(X).any(axis=1))
+        if len(valid_rows) == 0:
+            return pd.Series(False, index=df.index, name='is_outlier')
+
+        sample_rows = valid_rows
+        if len(sample_rows) > max_samples:
+            rng = np.random.default_rng(random_state)
+            sample_rows = np.sort(rng.choice(sample_rows, max_samples, replace=False))
+        model = IsolationForest(
+            contamination=self.contamination,
+            random_state=random_state,
+            n_jobs=-1
+        )
+        model.fit(X[sample_rows])
+
+        mask = np.zeros(len(df), dtype=bool)
+        for start in range(0, len(valid_rows), chunk_size):
+            rows = valid_rows[start:start + chunk_size]
+            mask[rows] = model.predict(X[rows]) == -1
+
+        self._outlier_models.put(key, (model, mask))
+        return pd.Series(mask.copy(), index=df.index, name='is_outlier')
     
+    @_memoized
+    def detect_outliers_robust(self, df: pd.DataFrame,
+                               value_cols: Union[str, List[str]],
+                               group_col: Optional[Union[str, List[str]]] = None,
+                               method: str = 'mad',
+                               threshold: Optional[float] = None,
+                               window: int = 7) -> pd.DataFrame:
+        """
+        반복 측정 그룹별 단변량 강건 통계 이상치 탐지 (벡터화, 입력 수정 없음)
+
+        Args:
+            value_cols: 검사할 측정값 컬럼 (하나 또는 여러 개)
+            group_col: 반복 측정 그룹 컬럼 (None이면 전체를 한 그룹으로 취급)
+            method: 'mad'   - 중앙값/MAD 기반 수정 Z-점수 |0.6745 (x - med) / MAD| > threshold
+                    'iqr'   - Tukey fence: x < Q1 - k·IQR 또는 x > Q3 + k·IQR
+                    'hampel'- 그룹 내 행 순서 기준 이동 창(window)의 중앙값에서
+                              threshold × 1.4826·MAD 이상 벗어난 값
+            threshold: 방법별 임계값 (None이면 ROBUST_THRESHOLDS 기본값)
+            window: Hampel 필터 창 크기 (홀수 권장)
+
+        Returns:
+            df.index × value_cols 형태의 bool DataFrame (이상치이면 True, 결측치는 False)
+        """
+        if method not in self.ROBUST_METHODS:
+            raise ValueError(f"지원하지 않는 방법: {method} (가능: {', '.join(self.ROBUST_METHODS)})")
+        if isinstance(value_cols, str):
+            value_cols = [value_cols]
+        if threshold is None:
+            threshold = self.ROBUST_THRESHOLDS[method]
+
+        values = df[value_cols].astype(float)
+        keys = self._group_keys(df, group_col)
+
+        if method == 'hampel':
+            flags = {
+                col: self._hampel_flags(values[col].to_numpy(), keys, window, threshold)
+                for col in value_cols
+            }
+            return pd.DataFrame(flags, index=df.index)
+
+        grouped = values.groupby(keys, sort=False)
+        if method == 'mad':
+            median = grouped.transform('median')
+            abs_dev = (values - median).abs()
+            abs_dev_grouped = abs_dev.groupby(keys, sort=False)
+            # MAD가 0이면 (절반 이상이 같은 값) 평균 절대편차로 대체
+            scale = abs_dev_grouped.transform('median') / 0.6745
+            mean_ad = abs_dev_grouped.transform('mean') * 1.253314
+            scale = scale.where(scale > 0, mean_ad)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                score = abs_dev / scale
+            flags = (score > threshold) & (scale > 0)
+        else:
+            q1 = grouped.transform('quantile', 0.25)
+            q3 = grouped.transform('quantile', 0.75)
+            iqr = q3 - q1
+            flags = (values < q1 - threshold * iqr) | (values > q3 + threshold * iqr)
+
+        return flags.fillna(False).astype(bool)
+
+    @_memoized
+    def detect_outliers_auto(self, df: pd.DataFrame,
+                             value_cols: Union[str, List[str]],
+                             group_col: Optional[Union[str, List[str]]] = None) -> Dict:
+        """
+        데이터 크기와 차원에 따라 이상치 탐지 방법을 자동 선택
+
+        - 여러 측정 컬럼을 그룹 없이 함께 검사: 다변량 Isolation Forest
+          (SCALABLE_ROW_THRESHOLD 초과 시 부분 표본 학습)
+        - 단변량 또는 반복 측정 그룹별 검사: 그룹 크기 중앙값이 5 이상이면 MAD, 아니면 IQR
+
+        Returns:
+            {
+                'method': str,              # 'mad' / 'iqr' / 'isolation_forest'
+                'mask': pd.Series,          # 행 단위 이상치 여부
+                'column_mask': DataFrame    # 컬럼별 이상치 여부 (Isolation Forest는 None)
+            }
+        """
+        if isinstance(value_cols, str):
+            value_cols = [value_cols]
+
+        if len(value_cols) > 1 and group_col is None:
+            max_samples = self.SCALABLE_ROW_THRESHOLD if len(df) > self.SCALABLE_ROW_THRESHOLD \
+                else len(df)
+            mask = self.detect_outliers_scalable(df, value_cols, max_samples=max(1, max_samples))
+            return {'method': 'isolation_forest', 'mask': mask, 'column_mask': None}
+
+        if group_col is None:
+            typical_size = len(df)
+        else:
+            typical_size = df.groupby(group_col, sort=False, observed=True).size().median()
+        method = 'mad' if typical_size >= 5 else 'iqr'
+
+        column_mask = self.detect_outliers_robust(df, value_cols, group_col, method=method)
+        return {
+            'method': method,
+            'mask': column_mask.any(axis=1).rename('is_outlier'),
+            'column_mask': column_mask
+        }
+
+    @staticmethod
+    def _group_keys(df: pd.DataFrame, group_col) -> pd.Series:
+        """groupby용 그룹 키 (그룹 컬럼이 없으면 단일 그룹, 여러 컬럼이면 조합별 그룹 번호)"""
+        if group_col is None:
+            return pd.Series(0, index=df.index)
+        if isinstance(group_col, str):
+            return df[group_col]
+        return df.groupby(group_col, sort=False, observed=True).ngroup()
+
+    @staticmethod
+    def _hampel_flags(values: np.ndarray, keys: pd.Series,
+                      window: int, threshold: float) -> np.ndarray:
+        """
+        그룹 경계를 넘지 않는 Hampel 필터 (슬라이딩 창 행렬 + nanmedian으로 한 번에 계산)
+
+        그룹 사이에 창 절반 길이의 NaN 패딩을 넣어 창이 다른 그룹 값을 보지 않게 합니다.
+        """
+        if len(values) == 0:
+            return np.zeros(0, dtype=bool)
+        half = max(1, window // 2)
+        codes, _ = pd.factorize(keys, sort=False)
+        order = np.argsort(codes, kind='stable')
+        sorted_codes = codes[order]
+
+        # 정렬된 위치 i는 패딩 배열에서 i + half * (그룹 순번 + 1) 위치로 이동
+        group_rank = np.cumsum(np.r_[0, np.diff(sorted_codes) != 0])
+        padded_pos = np.arange(len(order)) + half * (group_rank + 1)
+        padded = np.full(len(order) + half * (group_rank[-1] + 2), np.nan)
+        padded[padded_pos] = values[order]
+
+        windows = np.lib.stride_tricks.sliding_window_view(padded, 2 * half + 1)[padded_pos - half]
+        with np.errstate(invalid='ignore'), warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)  # 전부 NaN인 창
+            median = np.nanmedian(windows, axis=1)
+            scale = 1.4826 * np.nanmedian(np.abs(windows - median[:, None]), axis=1)
+            sorted_flags = np.abs(values[order] - median) > threshold * scale
+
+        flags = np.zeros(len(values), dtype=bool)
+        flags[order] = sorted_flags & (scale > 0)
+        return flags
+
+    def incremental(self, group_col: Union[str, List[str], None] = None,
+                    value_cols: Union[str, List[str], None] = None,
+                    curve_group_col: Union[str, List[str], None] = None,
+                    x_col: Optional[str] = None, y_col: Optional[str] = None,
+                    outlier_cols: Union[str, List[str], None] = None,
+                    **kwargs):
+        """
+        추가되는 데이터용 증분 모드 (IncrementalValidator 생성)
+
+        예:
+            inc = validator.incremental(group_col='sample', value_cols='signal')
+            inc.update(morning_run)
+            inc.update(afternoon_run)      # 새 행만 처리
+            inc.replicate_stats()          # 전체 재계산과 같은 결과
+        """
+        from .incremental_stats import IncrementalValidator
+
+        return IncrementalValidator(
+            self, group_col=group_col, value_cols=value_cols,
+            curve_group_col=curve_group_col, x_col=x_col, y_col=y_col,
+            outlier_cols=outlier_cols, **kwargs
+        )
+
     def check_replicate_consistency(self, df: pd.DataFrame,
                                    group_col: str,
                                    value_col: str,
                                    cv_threshold: float = 0.15) -> Dict:
         """반복 측정값의 일관성 검증"""
+        stats = self.compute_replicate_stats(df, group_col, [value_col], cv_threshold)
+
         results = {}
-        
-        for group in df[group_col].unique():
-            group_data = df[df[group_col] == group][value_col]
-            
-            mean = group_data.mean()
-            std = group_data.std()
-            cv = (std / mean) * 100 if mean != 0 else np.inf
-            
+        for group, mean, std, cv, consistent in zip(
+            stats[group_col], stats['mean'], stats['std'],
+            stats['cv_percent'], stats['is_consistent']
+        ):
             results[group] = {
                 'mean': mean,
                 'std': std,
                 'cv_percent': cv,
-                'is_consistent': cv <= cv_threshold * 100
+                'is_consistent': consistent
             }
-        
+
         return results
+
+    @_memoized
+    def compute_replicate_stats(self, df: pd.DataFrame,
+                                group_col: Union[str, List[str]],
+                                value_cols: Union[str, List[str]],
+                                cv_threshold: float = 0.15) -> pd.DataFrame:
+        """
+        모든 그룹 × 측정 컬럼의 평균/표준편차/CV를 groupby 한 번으로 계산
+
+        Args:
+            group_col: 반복 측정 그룹 컬럼 (여러 개면 리스트, 예: ['plate', 'sample'])
+            value_cols: 측정값 컬럼 (하나 또는 여러 개)
+            cv_threshold: 일관성 판정 CV 기준 (0.15 = 15%)
+
+        Returns:
+            그룹 컬럼 + ['variable', 'n', 'mean', 'std', 'cv_percent', 'is_consistent']
+            형태의 tidy DataFrame (그룹 × 변수당 1행, 그룹은 처음 등장한 순서)
+        """
+        if isinstance(value_cols, str):
+            value_cols = [value_cols]
+
+        grouped = df.groupby(group_col, sort=False, observed=True)[value_cols]
+        agg = grouped.agg(['count', 'mean', 'std'])
+
+        return self._replicate_stats_frame(
+            agg.index, value_cols,
+            n=agg.xs('count', axis=1, level=1).to_numpy(),
+            mean=agg.xs('mean', axis=1, level=1).to_numpy(dtype=float),
+            std=agg.xs('std', axis=1, level=1).to_numpy(dtype=float),
+            cv_threshold=cv_threshold
+        )
+
+    @staticmethod
+    def _replicate_stats_frame(index: pd.Index, value_cols: List[str], n: np.ndarray,
+                               mean: np.ndarray, std: np.ndarray,
+                               cv_threshold: float) -> pd.DataFrame:
+        """그룹 × 변수 행렬(n, mean, std)을 compute_replicate_stats의 tidy 형태로 변환"""
+        n_vars = len(value_cols)
+        result = index.repeat(n_vars).to_frame(index=False)
+        result['variable'] = np.tile(np.asarray(value_cols, dtype=object), len(index))
+        result['n'] = n.ravel()
+        mean = mean.ravel()
+        std = std.ravel()
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cv = np.where(mean != 0, std / mean * 100, np.inf)
+
+        result['mean'] = mean
+        result['std'] = std
+        result['cv_percent'] = cv
+        result['is_consistent'] = cv <= cv_threshold * 100
+        return result
@@ -1,85 +1,568 @@
 # agents/vision_analyzer.py
+import copy
+import hashlib
+import io
+import json
+import re
+import threading
+import time
+from dataclasses import replace
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Union
 import google.generativeai as genai
-from PIL import Image
+import numpy as np
+from PIL import Image, ImageOps
 import os
 from dotenv import load_dotenv
 
+from utils.cache import BoundedCache
+from .gel_detector import GelBandDetector
+from .model_router import ModelRouter
+from .plate_detector import PlateWellDetector, flagged_tiles_montage, plate_summary_markdown
+from .schemas import (
+    VISION_RESPONSE_SCHEMAS, BandCall, LaneCall, SchemaValidationError, VisionResult, WellCall,
+    supports_response_schema
+)
+from .vision_store import VisionResultStore
+
 load_dotenv()
 
+# 16비트/부동소수점 그레이스케일 모드 (현미경 TIFF 등) - 8비트로 변환 필요
+HIGH_BIT_MODES = ('I;16', 'I;16B', 'I;16L', 'I;16N', 'I', 'F')
+
+
+class _RateLimiter:
+    """
+    분당 요청 수 제한 + 429 응답 시 전체 일시 정지 (스레드 공유)
+
+    acquire()는 다음 호출 가능 시각까지 대기합니다. pause(seconds)는 모든 작업자의
+    다음 호출을 지정 시간 뒤로 미룹니다.
+    """
+
+    def __init__(self, requests_per_minute: Optional[float] = None):
+        self.interval = 60.0 / requests_per_minute if requests_per_minute else 0.0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+    def pause(self, seconds: float):
+        with self._lock:
+            self._next_slot = max(self._next_slot, time.monotonic() + seconds)
+
+
+def _retry_delay_seconds(error: Exception, default: float) -> float:
+    """오류 메시지의 'retry in 19.9s' / 'seconds: 19' 형식 재시도 대기 시간"""
+    match = re.search(r"retry in ([\d.]+)s|retry_delay.*?seconds[:\s]+(\d+)", str(error),
+                      re.IGNORECASE)
+    if match:
+        return float(match.group(1) or match.group(2))
+    return default
+
+
 class GeminiVisionAnalyzer:
     """Gemini Vision으로 실험 이미지 분석"""
-    
-    def __init__(self):
+
+    PROMPTS = {
+        'gel': """
+이 젤 전기영동(Gel Electrophoresis) 이미지를 분석하세요.
+
+다음 내용을 포함하세요:
+1. 각 레인(lane)별 밴드 위치(레인 위쪽 0 ~ 아래쪽 1 상대 위치), 추정 크기(bp), 상대 강도(0~1)
+2. ladder/marker 레인 여부
+3. 양성/음성 대조군 확인 (controls)
+4. 실험 품질 평가 (quality: Good/Fair/Poor)
+5. 개선 제안사항 (recommendations)
+
+JSON 형식으로만 답하세요:
+{"lanes": [{"lane": 1, "is_ladder": true,
+            "bands": [{"position": 0.2, "size_bp": 1000, "intensity": 0.8}], "note": ""}],
+ "quality": "Good", "controls": "...", "recommendations": ["..."]}
+""",
+        'cell_plate': """
+이 세포 배양 플레이트 이미지를 분석하세요.
+
+다음을 확인하세요:
+1. 웰(well) 개수 및 레이아웃 (layout: 6/12/24/48/96/384)
+2. 세포 밀도 (confluency, 0~100%) - 각 웰별
+3. 오염 징후 (contamination) 유무 - 각 웰별 및 전체
+4. 세포 형태 이상 여부 (note)
+5. 권장 계대 배양 시기 (recommendations)
+
+JSON 형식으로만 답하세요:
+{"layout": 96, "wells": [{"well": "A1", "confluency": 80, "contaminated": false, "note": ""}],
+ "contamination": false, "recommendations": ["..."]}
+""",
+        'cell_plate_wells': """
+다음 이미지는 세포 배양 플레이트에서 자동 분석이 이상을 표시한 웰들을 왼쪽부터 순서대로
+이어 붙인 것입니다: {wells}
+
+각 웰에 대해 다음을 확인하세요:
+1. 세균/곰팡이/효모 오염 징후 (탁도, 색 변화, 사상체)
+2. 세포 밀도 (confluency, 0~100%)
+3. 세포 형태 이상 여부 (note)
+
+JSON 형식으로만 답하세요:
+{{"wells": [{{"well": "A1", "confluency": 80, "contaminated": false, "note": ""}}],
+ "contamination": false, "recommendations": ["..."]}}
+"""
+    }
+
+    def __init__(self, max_side: int = 2048, jpeg_quality: int = 85,
+                 cache_size: int = 128, requests_per_minute: Optional[float] = None,
+                 max_retries: int = 3, local_confidence: float = 0.7,
+                 store: Optional[VisionResultStore] = None):
+        """
+        Args:
+            max_side: 전송 전 긴 변의 최대 픽셀 수 (원본이 더 크면 비율 유지 축소)
+            jpeg_quality: 재인코딩 JPEG 품질
+            cache_size: 이미지 내용 해시 기준 분석 결과 캐시 항목 수
+            requests_per_minute: 분당 최대 Gemini 호출 수 (None이면 제한 없음)
+            max_retries: 할당량/지연 오류 시 재시도 횟수
+            local_confidence: 로컬 젤 분석 신뢰도가 이 값 이상이면 원격 호출 생략
+            store: 결과 저장소 (주면 모든 결과를 저장하고, 저장된 이미지는 다시 호출하지 않음)
+        """
         api_key = os.getenv("GOOGLE_API_KEY")
         if not api_key:
             raise ValueError("GOOGLE_API_KEY 환경변수가 설정되지 않았습니다.")
-            
+
         genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel('gemini-1.5-flash')
-    
-    def analyze_gel_electrophoresis(self, image_path: str) -> dict:
-        """젤 전기영동 이미지 분석"""
-        
-        image = Image.open(image_path)
-        
-        prompt = """
-이 젤 전기영동(Gel Electrophoresis) 이미지를 분석하세요.
+        self.model_name = 'gemini-1.5-flash'
+        self.model = genai.GenerativeModel(self.model_name)
+        self.max_side = max_side
+        self.jpeg_quality = jpeg_quality
+        self._results = BoundedCache(max_entries=cache_size)
+        self._limiter = _RateLimiter(requests_per_minute)
+        self.max_retries = max(0, max_retries)
+        # 같은 이미지를 동시에 분석하지 않도록 캐시 키별 잠금
+        self._key_locks: Dict[tuple, threading.Lock] = {}
+        self._key_locks_guard = threading.Lock()
+        # 젤 이미지 로컬 사전 분석 (확실한 이미지는 Gemini 호출 없이 처리)
+        self.gel_detector = GelBandDetector()
+        self.local_confidence = local_confidence
+        self.routing_stats = {'local': 0, 'remote': 0}
+        # 플레이트 이미지 웰 분할 (이상 웰만 Gemini 2차 분석)
+        self.plate_detector = PlateWellDetector()
+        self.store = store
 
-다음 내용을 포함하세요:
-1. 관찰되는 밴드(band) 수
-2. 각 레인(lane)별 밴드 위치와 선명도
-3. 양성/음성 대조군 확인
-4. 실험 품질 평가 (Good/Fair/Poor)
-5. 개선 제안사항
+    @staticmethod
+    def content_hash(image_path: str, block_size: int = 1 << 20) -> str:
+        """이미지 파일 내용의 SHA-256 (파일명/경로와 무관, 디코딩 없이 계산)"""
+        digest = hashlib.sha256()
+        with open(image_path, 'rb') as f:
+            for block in iter(lambda: f.read(block_size), b''):
+                digest.update(block)
+        return digest.hexdigest()
 
-형식:
-**밴드 분석:**
-- Lane 1: ...
-- Lane 2: ...
+    @staticmethod
+    def generation_config(kind: str) -> dict:
+        """JSON 응답 모드 (SDK가 지원하면 서버 측 스키마 강제)"""
+        config = {"response_mime_type": "application/json"}
+        if supports_response_schema():
+            config["response_schema"] = VISION_RESPONSE_SCHEMAS[kind]
+        return config
 
-**품질 평가:** Good/Fair/Poor
+    def preprocess_image(self, image_path: str) -> dict:
+        """
+        전송용 이미지 준비: EXIF 회전 보정 → 16비트 정규화 → 축소 → 대비 보정 → JPEG 재인코딩
 
-**제안사항:**
-- ...
-"""
-        
-        response = self.model.generate_content([prompt, image])
-        
+        JPEG은 draft 모드로 필요한 해상도까지만 디코딩하고, 16비트 TIFF는 0.5~99.5 백분위
+        구간을 8비트로 선형 변환합니다. 8비트 이미지는 같은 백분위 기준 autocontrast를 적용합니다.
+
+        Returns:
+            {'mime_type': 'image/jpeg', 'data': bytes, 'original_size', 'sent_size',
+             'original_bytes', 'sent_bytes'}
+        """
+        with Image.open(image_path) as source:
+            original_size = source.size
+            if source.format == 'JPEG':
+                source.draft('RGB', (self.max_side, self.max_side))
+            image = ImageOps.exif_transpose(source)
+            image.load()
+
+        if image.mode in HIGH_BIT_MODES:
+            pixels = np.asarray(image, dtype=np.float32)
+            low, high = np.percentile(pixels, (0.5, 99.5))
+            scale = 255.0 / (high - low) if high > low else 1.0
+            image = Image.fromarray(np.clip((pixels - low) * scale, 0, 255).astype(np.uint8), 'L')
+        elif image.mode not in ('L', 'RGB'):
+            image = image.convert('RGB')
+
+        if max(image.size) > self.max_side:
+            image.thumbnail((self.max_side, self.max_side), Image.LANCZOS)
+        image = ImageOps.autocontrast(image, cutoff=0.5)
+
+        buffer = io.BytesIO()
+        image.save(buffer, format='JPEG', quality=self.jpeg_quality, optimize=True)
+        data = buffer.getvalue()
         return {
-            'raw_analysis': response.text,
-            'image_path': image_path
+            'mime_type': 'image/jpeg',
+            'data': data,
+            'original_size': original_size,
+            'sent_size': image.size,
+            'original_bytes': os.path.getsize(image_path),
+            'sent_bytes': len(data)
         }
-    
-    def analyze_cell_plate(self, image_path: str) -> dict:
-        """세포 배양 플레이트 이미지 분석"""
-        
-        image = Image.open(image_path)
-        
-        prompt = """
-이 세포 배양 플레이트 이미지를 분석하세요.
 
-다음을 확인하세요:
-1. 웰(well) 개수 및 레이아웃
-2. 세포 밀도 (confluency) - 각 웰별
-3. 오염 징후 (contamination) 유무
-4. 세포 형태 이상 여부
-5. 권장 계대 배양 시기
+    @contextmanager
+    def _key_lock(self, key: tuple):
+        """같은 캐시 키의 분석이 동시에 두 번 실행되지 않도록 키별 잠금"""
+        with self._key_locks_guard:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        try:
+            with key_lock:
+                yield
+        finally:
+            with self._key_locks_guard:
+                self._key_locks.pop(key, None)
 
-형식:
-**레이아웃:** 96-well plate / 24-well plate 등
+    def _analyze(self, image_path: str, kind: str, experiment: str = '',
+                 image_hash: Optional[str] = None) -> VisionResult:
+        """
+        전처리 + Gemini 호출 공통 경로
 
-**세포 밀도:**
-- Well A1: 80% confluent
-- Well A2: ...
+        같은 내용의 이미지는 메모리 캐시 → 저장소(store) 순서로 찾아 재사용합니다.
+        """
+        image_hash = image_hash or self.content_hash(image_path)
+        key = (image_hash, kind, self.model_name, self.max_side, self.jpeg_quality)
+        with self._key_lock(key):
+            cached = self._results.get(key)
+            if cached is None and self.store is not None:
+                stored = self.store.get(image_hash, kind)
+                # 로컬(+2차) 결과는 이미지 전체 원격 분석 결과로 재사용하지 않음
+                if (stored is not None and stored.model == self.model_name
+                        and stored.source == 'remote'):
+                    self._results.put(key, stored)
+                    cached = stored
+            if cached is not None:
+                return replace(copy.deepcopy(cached), image_path=image_path, cached=True)
 
-**오염 여부:** 확인됨/없음
+            prepared = self.preprocess_image(image_path)
+            response = self._generate([
+                self.PROMPTS[kind],
+                {'mime_type': prepared['mime_type'], 'data': prepared['data']}
+            ], generation_config=self.generation_config(kind))
 
-**권장사항:** ...
-"""
-        
-        response = self.model.generate_content([prompt, image])
-        
-        return {
-            'raw_analysis': response.text,
-            'image_path': image_path
-        }
+            result = VisionResult.from_response(
+                response.text,
+                kind,
+                image_hash=image_hash,
+                image_path=image_path,
+                source='remote',
+                model=self.model_name,
+                experiment=experiment,
+                details={
+                    'preprocessing': {
+                        k: v for k, v in prepared.items() if k not in ('mime_type', 'data')
+                    }
+                }
+            )
+            self._results.put(key, result)
+            return copy.deepcopy(result)
+
+    def _generate(self, contents: list, generation_config: Optional[dict] = None):
+        """
+        속도 제한을 지키며 Gemini 호출 (할당량/지연 오류는 지수 백오프로 재시도)
+
+        할당량(429) 오류면 응답에 적힌 대기 시간만큼 모든 작업자의 호출을 멈춥니다.
+        """
+        for attempt in range(self.max_retries + 1):
+            self._limiter.acquire()
+            try:
+                return self.model.generate_content(contents, generation_config=generation_config)
+            except Exception as e:
+                if attempt == self.max_retries or not ModelRouter.is_retryable(e):
+                    raise
+                backoff = 2.0 ** attempt
+                if ModelRouter.is_quota_error(e):
+                    self._limiter.pause(_retry_delay_seconds(e, default=backoff * 5))
+                else:
+                    time.sleep(backoff)
+
+    def _analysis_params(self, **params) -> Dict:
+        """저장소 결과 재사용 판정용 분석 설정 + 모델명 (JSON 저장/복원 후에도 같은 값)"""
+        return json.loads(json.dumps({**params, 'model': self.model_name}))
+
+    def _stored(self, image_hash: str, image_path: str, kind: str,
+                params: Dict) -> Optional[VisionResult]:
+        """
+        저장소에 같은 이미지 + 같은 분석 설정(params)의 결과가 있으면 cached=True로 반환
+
+        ladder_sizes, layout, local_first, 모델 등이 다르면 None을 돌려 다시 분석하게 합니다.
+        """
+        if self.store is None:
+            return None
+        stored = self.store.get(image_hash, kind)
+        if stored is None or stored.details.get('params') != params:
+            return None
+        return replace(stored, image_path=image_path, cached=True)
+
+    def _save(self, result: VisionResult, params: Optional[Dict] = None) -> VisionResult:
+        """
+        새로 분석한 결과를 저장소에 기록 (캐시/저장소에서 가져온 결과는 그대로)
+
+        params를 주면 details['params']에 함께 저장해 _stored()가 설정 일치 여부를 비교합니다.
+        """
+        if params is not None:
+            result.details['params'] = params
+        if self.store is not None and not result.cached:
+            self.store.save(result)
+        return result
+
+    def analyze_batch(self, images: List[Union[str, Dict]], kind: str = 'gel',
+                      max_concurrency: int = 4, experiment: str = '') -> Iterator[Dict]:
+        """
+        여러 이미지를 동시에 분석하고 완료되는 순서대로 반환
+
+        전처리(디코딩/축소)와 API 호출을 max_concurrency개 스레드에서 실행하며, 호출 속도는
+        requests_per_minute와 429 응답의 대기 시간을 모든 스레드가 공유해 지킵니다.
+        한 이미지의 실패는 다른 이미지에 영향을 주지 않습니다.
+
+        Args:
+            images: 이미지 경로 목록, 또는 {'image_path': str, 'kind': 'gel'|'cell_plate',
+                    'ladder_sizes': [...], 'layout': 96, 'experiment': str} 목록
+                    (로컬 사전 분석 후 필요할 때만 원격 호출)
+            kind: 경로만 준 항목의 분석 종류
+            max_concurrency: 동시에 처리할 최대 이미지 수
+            experiment: 항목에 실험 이름이 없을 때 붙일 이름 (저장소 검색/요약용)
+
+        Yields:
+            {
+                'image_path': str,
+                'kind': str,
+                'result': VisionResult,   # 분석 결과 (실패 시 None)
+                'error': str,             # 실패 시 오류 메시지
+                'elapsed': float          # 소요 시간 (초)
+            }
+        """
+        jobs = [
+            item if isinstance(item, dict) else {'image_path': item, 'kind': kind}
+            for item in images
+        ]
+
+        def _run(job: Dict) -> Dict:
+            start = time.perf_counter()
+            job_kind = job.get('kind', kind)
+            job_experiment = job.get('experiment', experiment)
+            outcome = {'image_path': job['image_path'], 'kind': job_kind, 'result': None,
+                       'error': ''}
+            try:
+                if job_kind == 'gel':
+                    outcome['result'] = self.analyze_gel_electrophoresis(
+                        job['image_path'], ladder_sizes=job.get('ladder_sizes'),
+                        experiment=job_experiment
+                    )
+                elif job_kind == 'cell_plate':
+                    outcome['result'] = self.analyze_cell_plate(
+                        job['image_path'], layout=job.get('layout'), experiment=job_experiment
+                    )
+                else:
+                    outcome['result'] = self._save(
+                        self._analyze(job['image_path'], job_kind, job_experiment)
+                    )
+            except Exception as e:
+                outcome['error'] = str(e)
+            outcome['elapsed'] = time.perf_counter() - start
+            return outcome
+
+        with ThreadPoolExecutor(max_workers=max(1, max_concurrency)) as pool:
+            futures = [pool.submit(_run, job) for job in jobs]
+            for future in as_completed(futures):
+                yield future.result()
+
+    def analyze_gel_electrophoresis(self, image_path: str,
+                                    ladder_sizes: Optional[List[float]] = None,
+                                    local_first: bool = True,
+                                    experiment: str = '') -> VisionResult:
+        """
+        젤 전기영동 이미지 분석
+
+        먼저 로컬 검출기(GelBandDetector)로 레인/밴드/품질을 계산하고, 신뢰도가
+        local_confidence 이상이면 그 결과를 바로 반환합니다 (source='local').
+        레인 검출 실패, 낮은 SNR, 심한 번짐, ladder 불일치 등 애매한 이미지만
+        Gemini로 보냅니다 (source='remote', 로컬 결과는 details['local_analysis']에 첨부).
+
+        Args:
+            ladder_sizes: ladder 밴드 크기(bp, 큰 것부터) - 주면 밴드 크기 추정
+            local_first: False면 항상 원격 분석
+            experiment: 실험 이름 (저장소 검색/요약용)
+        """
+        image_hash = self.content_hash(image_path)
+        params = self._analysis_params(
+            ladder_sizes=[float(size) for size in ladder_sizes] if ladder_sizes else None,
+            local_first=local_first, local_confidence=self.local_confidence
+        )
+        stored = self._stored(image_hash, image_path, 'gel', params)
+        if stored is not None:
+            return stored
+        local = None
+        if local_first:
+            local = self.gel_detector.analyze_path(image_path, ladder_sizes)
+            if local.is_confident(self.local_confidence):
+                self._count_route('local')
+                return self._save(VisionResult(
+                    kind='gel',
+                    image_hash=image_hash,
+                    image_path=image_path,
+                    source='local',
+                    quality=local.quality,
+                    lanes=[
+                        LaneCall(
+                            lane=lane + 1,
+                            is_ladder=lane == local.ladder_lane,
+                            bands=[
+                                BandCall(b['position'], b['size_bp'], b['intensity'])
+                                for b in local.bands if b['lane'] == lane
+                            ]
+                        )
+                        for lane in range(local.lanes)
+                    ],
+                    recommendations=list(local.issues),
+                    raw_analysis=local.to_markdown(),
+                    details={'local_analysis': local.to_dict()},
+                    experiment=experiment
+                ), params)
+
+        result = self._analyze(image_path, 'gel', experiment, image_hash)
+        if not result.cached:
+            self._count_route('remote')
+        if local is not None:
+            result.details['local_analysis'] = local.to_dict()
+        return self._save(result, params)
+
+    def _count_route(self, route: str):
+        with self._key_locks_guard:
+            self.routing_stats[route] += 1
+
+    def analyze_cell_plate(self, image_path: str, layout: Optional[int] = None,
+                           local_first: bool = True, second_pass: bool = True,
+                           max_second_pass: int = 12, experiment: str = '') -> VisionResult:
+        """
+        세포 배양 플레이트 이미지 분석
+
+        로컬 검출기(PlateWellDetector)가 웰 격자를 찾아 웰별 confluency/황변/탁도를 병렬
+        계산하고, 오염 의심 또는 과밀로 표시된 웰만 타일로 이어 붙여 Gemini에 2차 분석을
+        요청합니다. 이미지 전체를 보내지 않으므로 전송량과 호출 수가 줄어듭니다.
+        2차 분석의 웰별 판정은 해당 웰의 contaminated/note/confluency를 덮어씁니다.
+        결과는 (이미지 해시, layout, 2차 분석 설정, 모델) 기준으로 메모리에 캐시됩니다.
+
+        Args:
+            layout: 웰 수 (6/12/24/48/96/384, None이면 자동 추정)
+            local_first: False면 이미지 전체를 원격 분석 (이전 방식)
+            second_pass: 표시된 웰의 원격 2차 분석 여부
+            max_second_pass: 2차 분석에 보낼 최대 웰 수
+            experiment: 실험 이름 (저장소 검색/요약용)
+
+        Returns:
+            VisionResult (wells_frame()으로 웰당 1행 지표 표, source는
+            'local' | 'local+remote' | 'remote')
+        """
+        image_hash = self.content_hash(image_path)
+        params = self._analysis_params(layout=layout, local_first=local_first,
+                                       second_pass=second_pass, max_second_pass=max_second_pass)
+        stored = self._stored(image_hash, image_path, 'cell_plate', params)
+        if stored is not None:
+            return stored
+        if not local_first:
+            result = self._analyze(image_path, 'cell_plate', experiment, image_hash)
+            if not result.cached:
+                self._count_route('remote')
+            return self._save(result, params)
+
+        key = (image_hash, 'cell_plate', layout, second_pass, max_second_pass, self.model_name)
+        with self._key_lock(key):
+            cached = self._results.get(key)
+            if cached is not None:
+                return replace(copy.deepcopy(cached), image_path=image_path, cached=True)
+            result = self._analyze_plate_locally(image_path, image_hash, layout, second_pass,
+                                                 max_second_pass, experiment)
+            # 2차 분석이 실패한 결과는 캐시/저장하지 않아 다음 호출에서 다시 시도
+            if 'second_pass_error' not in result.details:
+                self._results.put(key, result)
+                self._save(result, params)
+            return copy.deepcopy(result)
+
+    def _analyze_plate_locally(self, image_path: str, image_hash: str, layout: Optional[int],
+                               second_pass: bool, max_second_pass: int,
+                               experiment: str) -> VisionResult:
+        """
+        로컬 웰 분할 + 표시된 웰만 원격 2차 분석 (analyze_cell_plate의 local_first 경로)
+
+        2차 분석 호출이 실패하면(할당량 초과, 서버 오류 등) 완료된 로컬 결과를
+        source='local'로 반환하고 오류는 details['second_pass_error']에 남깁니다.
+        """
+        local = self.plate_detector.analyze_path(image_path, layout)
+        wells = local['wells']
+        metric_cols = ['center_y', 'center_x', 'mean_intensity', 'texture', 'hue_shift', 'haze',
+                       'contamination_score']
+        result = VisionResult(
+            kind='cell_plate',
+            image_hash=image_hash,
+            image_path=image_path,
+            source='local',
+            layout=local['layout'],
+            wells=[
+                WellCall(
+                    well=row['well'],
+                    confluency=float(row['confluency']),
+                    contaminated='오염' in row['flag_reason'],
+                    note=row['flag_reason'],
+                    metrics={col: float(row[col]) for col in metric_cols}
+                )
+                for row in wells.to_dict('records')
+            ],
+            contamination=bool(wells['flag_reason'].str.contains('오염').any()),
+            raw_analysis=plate_summary_markdown(local),
+            details={'bbox': list(local['bbox'])},
+            experiment=experiment
+        )
+
+        if second_pass and wells['flagged'].any():
+            montage, names = flagged_tiles_montage(local['tiles'], wells, max_second_pass)
+            buffer = io.BytesIO()
+            montage.save(buffer, format='JPEG', quality=self.jpeg_quality)
+            try:
+                response = self._generate([
+                    self.PROMPTS['cell_plate_wells'].format(wells=', '.join(names)),
+                    {'mime_type': 'image/jpeg', 'data': buffer.getvalue()}
+                ], generation_config=self.generation_config('cell_plate'))
+            except Exception as e:
+                result.details['second_pass_error'] = (
+                    f"표시된 웰 {len(names)}개 2차 분석 실패 (로컬 결과만 반환): {e}"
+                )
+                self._count_route('local')
+                return result
+            try:
+                remote = VisionResult.from_response(response.text, 'cell_plate')
+            except SchemaValidationError:
+                remote = VisionResult(kind='cell_plate', raw_analysis=response.text)
+            by_name = {w.well: w for w in result.wells}
+            for call in remote.wells:
+                well = by_name.get(call.well)
+                if well is None or call.well not in names:
+                    continue
+                well.contaminated = call.contaminated
+                well.note = call.note or well.note
+                if call.confluency is not None:
+                    well.confluency = call.confluency
+            result.contamination = any(w.contaminated for w in result.wells)
+            result.recommendations = remote.recommendations
+            result.model = self.model_name
+            result.details['second_pass'] = response.text
+            result.raw_analysis += "\n\n**표시된 웰 2차 분석:**\n" + remote.raw_analysis
+            result.source = 'local+remote'
+            self._count_route('remote')
+        else:
+            self._count_route('local')
+        return result
+
+    def cache_stats(self) -> dict:
+        """분석 결과 캐시 hit/miss 카운터"""
+        return self._results.stats()
@@ -0,0 +1,167 @@
+"""이미지 분석 결과(VisionResult) JSON 저장소 + 이미지 해시/실험/날짜 인덱스"""
+
+import bisect
+import json
+import os
+import threading
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import pandas as pd
+
+from .schemas import VisionResult
+
+DateLike = Union[str, date, datetime]
+
+INDEX_FILE = 'index.jsonl'
+
+
+def _iso(value: Optional[DateLike], end_of_day: bool = False) -> Optional[str]:
+    """날짜/시각을 created_at과 비교 가능한 ISO 문자열로 ('2024-05-01'은 하루 전체)"""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.isoformat(timespec='seconds')
+    if isinstance(value, date):
+        value = value.isoformat()
+    if len(value) == 10 and end_of_day:
+        return value + 'T23:59:59'
+    return value
+
+
+class VisionResultStore:
+    """
+    분석 결과를 결과당 JSON 파일로 저장하고, 요약 필드를 담은 index.jsonl로 검색
+
+    디렉터리 구조:
+        root/index.jsonl                    # 결과당 1줄 (추가 전용)
+        root/<hash 앞 2자리>/<hash>-<kind>.json
+
+    인덱스는 시작할 때 한 번 읽어 이미지 해시/실험 이름별 dict와 created_at 정렬 목록으로
+    메모리에 유지하므로, 검색과 배치 요약은 결과 파일을 열지 않고 처리됩니다.
+    같은 (해시, 종류)를 다시 저장하면 최신 결과가 이전 결과를 대체합니다.
+    """
+
+    def __init__(self, root: Union[str, Path] = 'vision_results'):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._index_path = self.root / INDEX_FILE
+        self._lock = threading.Lock()
+        self._entries: Dict[tuple, Dict] = {}          # (image_hash, kind) → 인덱스 항목
+        self._by_hash: Dict[str, set] = {}
+        self._by_experiment: Dict[str, set] = {}
+        self._by_date: List[tuple] = []                # 정렬된 (created_at, image_hash, kind)
+        if self._index_path.exists():
+            with open(self._index_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        self._add_entry(json.loads(line))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _add_entry(self, entry: Dict):
+        key = (entry['image_hash'], entry['kind'])
+        previous = self._entries.get(key)
+        if previous is not None:
+            self._by_experiment.get(previous['experiment'], set()).discard(key)
+            item = (previous['created_at'],) + key
+            position = bisect.bisect_left(self._by_date, item)
+            if position < len(self._by_date) and self._by_date[position] == item:
+                del self._by_date[position]
+        self._entries[key] = entry
+        self._by_hash.setdefault(entry['image_hash'], set()).add(key)
+        self._by_experiment.setdefault(entry['experiment'], set()).add(key)
+        bisect.insort(self._by_date, (entry['created_at'],) + key)
+
+    def _result_path(self, image_hash: str, kind: str) -> Path:
+        return self.root / image_hash[:2] / f"{image_hash}-{kind}.json"
+
+    def save(self, result: VisionResult) -> Path:
+        """결과 JSON 저장 + 인덱스에 요약 추가 (파일은 임시 파일 후 교체로 원자적 기록)"""
+        if not result.image_hash:
+            raise ValueError("image_hash가 없는 결과는 저장할 수 없습니다.")
+        path = self._result_path(result.image_hash, result.kind)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f'.{threading.get_ident()}.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(result.to_json())
+        os.replace(tmp_path, path)
+
+        entry = {
+            'image_hash': result.image_hash,
+            'image_path': result.image_path,
+            'experiment': result.experiment,
+            'created_at': result.created_at,
+            'model': result.model,
+            **result.summary()
+        }
+        with self._lock:
+            with open(self._index_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            self._add_entry(entry)
+        return path
+
+    def load(self, image_hash: str, kind: str) -> Optional[VisionResult]:
+        """저장된 결과 복원 (없으면 None)"""
+        if (image_hash, kind) not in self._entries:
+            return None
+        path = self._result_path(image_hash, kind)
+        if not path.exists():
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return VisionResult.from_dict(json.load(f))
+
+    def get(self, image_hash: str, kind: Optional[str] = None) -> Optional[VisionResult]:
+        """이미지 해시로 최근 결과 조회 (kind가 없으면 가장 최근 종류)"""
+        with self._lock:
+            keys = sorted(self._by_hash.get(image_hash, ()),
+                          key=lambda k: self._entries[k]['created_at'])
+        keys = [k for k in keys if kind is None or k[1] == kind]
+        return self.load(*keys[-1]) if keys else None
+
+    def find(self, experiment: Optional[str] = None, kind: Optional[str] = None,
+             since: Optional[DateLike] = None, until: Optional[DateLike] = None) -> List[Dict]:
+        """
+        조건에 맞는 인덱스 항목 (created_at 오름차순)
+
+        Args:
+            experiment: 실험 이름
+            kind: 'gel' | 'cell_plate'
+            since, until: 날짜('2024-05-01')/datetime, 양 끝 포함 (날짜만 주면 하루 전체)
+        """
+        low, high = _iso(since), _iso(until, end_of_day=True)
+        with self._lock:
+            start = bisect.bisect_left(self._by_date, (low,)) if low else 0
+            stop = (bisect.bisect_right(self._by_date, (high + '\uffff',)) if high
+                    else len(self._by_date))
+            candidates = self._by_date[start:stop]
+            allowed = self._by_experiment.get(experiment, set()) if experiment is not None else None
+            return [
+                dict(self._entries[(h, k)]) for _, h, k in candidates
+                if (kind is None or k == kind) and (allowed is None or (h, k) in allowed)
+            ]
+
+    def experiments(self) -> List[str]:
+        with self._lock:
+            return sorted(name for name, keys in self._by_experiment.items() if keys)
+
+    def summarize(self, experiment: Optional[str] = None, kind: Optional[str] = None,
+                  since: Optional[DateLike] = None,
+                  until: Optional[DateLike] = None) -> pd.DataFrame:
+        """배치 실험 요약 표 (결과당 1행, 결과 파일을 열지 않고 인덱스만 사용)"""
+        entries = self.find(experiment, kind, since, until)
+        columns = ['created_at', 'experiment', 'kind', 'image_path', 'image_hash', 'source',
+                   'model', 'quality', 'n_lanes', 'n_bands', 'layout', 'n_wells',
+                   'mean_confluency', 'contaminated_wells', 'contamination']
+        return pd.DataFrame(entries, columns=columns)
+
+    def compact(self):
+        """대체된 항목을 뺀 인덱스로 다시 쓰기 (추가 전용 파일이 커졌을 때)"""
+        with self._lock:
+            tmp_path = self._index_path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                for _, h, k in self._by_date:
+                    f.write(json.dumps(self._entries[(h, k)], ensure_ascii=False) + '\n')
+            os.replace(tmp_path, self._index_path)
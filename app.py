@@ -5,9 +5,12 @@ from agents.code_generator import BioCodeGenerator
 from agents.validator import ExperimentValidator
 from utils.quarto_renderer import QuartoRenderer
 from utils.simple_html_renderer import SimpleHTMLRenderer
-from utils.data_profiler import get_data_profile
+from utils.data_profiler import WIDE_COLUMN_THRESHOLD, build_data_profile
+from utils.plate_parser import parse_plate_export
+from utils.streaming_profiler import PARQUET_AVAILABLE, is_parquet, profile_file
 from utils.example_data import ExampleDatasets, AnalysisTemplates
 from utils.code_executor import CodeExecutor
+import shutil
 import tempfile
 from pathlib import Path
 from datetime import datetime
@@ -137,6 +140,10 @@ if 'code_history' not in st.session_state:
 
 if 'uploaded_data' not in st.session_state:
     st.session_state.uploaded_data = None
+    # 일반 표 업로드: 디스크 경로(코드 실행/리포트용), 스트리밍 프로파일, 전체 행 수
+    st.session_state.data_path = None
+    st.session_state.data_profile = None
+    st.session_state.data_rows = 0
 
 # 헤더 - 대학생 친화적
 st.markdown("""
@@ -182,25 +189,54 @@ with st.sidebar:
     st.markdown("### 🤖 AI 모델 설정")
     model_choice = st.selectbox(
         "Gemini 모델",
-        ["gemini-2.5-flash (추천)", "gemini-2.0-flash"],
-        help="💡 2.5 Flash 권장: 더 안정적이고 할당량이 많습니다",
+        ["자동 라우팅 (추천)", "gemini-2.5-flash", "gemini-2.0-flash"],
+        help="💡 자동 라우팅: 간단한 요청은 빠른 모델, 복잡한 요청은 2.5 Flash로 보내고 "
+             "할당량 초과 시 다른 모델로 자동 전환합니다",
         key="model_selector"
     )
     
     # Extract model name from selection
-    selected_model = "gemini-2.5-flash" if "2.5" in model_choice else "gemini-2.0-flash"
+    selected_model = "auto" if "자동" in model_choice else model_choice
     
     # Reinitialize generator if model changed
     if 'current_model' not in st.session_state:
-        st.session_state.current_model = selected_model
+        st.session_state.current_model = "auto"
     
     if st.session_state.get('current_model') != selected_model:
         try:
-            st.session_state.generator = BioCodeGenerator(model_name=selected_model)
+            if selected_model == "auto":
+                st.session_state.generator = BioCodeGenerator(model_name="gemini-2.5-flash")
+            else:
+                st.session_state.generator = BioCodeGenerator(
+                    model_name=selected_model,
+                    auto_route=False
+                )
             st.session_state.current_model = selected_model
-            st.success(f"✅ 모델이 {selected_model}로 변경되었습니다")
+            st.success(f"✅ 모델이 {model_choice}로 변경되었습니다")
         except Exception as e:
             st.error(f"모델 변경 실패: {str(e)}")
+
+    if st.session_state.get('generator') is not None:
+        with st.expander("📡 모델별 호출 통계", expanded=False):
+            for name, stats in st.session_state.generator.router.stats().items():
+                if not stats['calls']:
+                    st.caption(f"**{name}**: 호출 없음")
+                    continue
+                latency = f"{stats['avg_latency']:.1f}초" if stats['avg_latency'] else "-"
+                st.caption(
+                    f"**{name}**: {stats['calls']}회, 성공률 {stats['success_rate']:.0%}, "
+                    f"평균 {latency}" + (" ⏸️ 대기 중" if stats['cooling_down'] else "")
+                )
+            cache_stats = st.session_state.generator.context_cache.stats()
+            st.caption(
+                f"🗂️ 프롬프트 캐시({cache_stats['mode']}): 재사용 {cache_stats['hits']}회, "
+                f"절약 약 {cache_stats['approx_tokens_saved']:,} 토큰"
+            )
+            validation_stats = st.session_state.validator.cache_stats()
+            st.caption(
+                f"🔬 검증 결과 캐시: {validation_stats['entries']}/{validation_stats['max_entries']}개, "
+                f"hit {validation_stats['hits']}회 / miss {validation_stats['misses']}회"
+            )
     
     language = st.selectbox("분석 언어", ["Python", "R"])
     
@@ -210,6 +246,10 @@ with st.sidebar:
     if st.button("🗑️ 전체 초기화"):
         st.session_state.code_history = []
         st.session_state.uploaded_data = None
+        st.session_state.data_path = None
+        st.session_state.data_profile = None
+        st.session_state.file_profile_id = None
+        st.session_state.validator.invalidate_cache()
         st.rerun()
 
 # 메인 영역 - 탭에 더 명확한 설명 추가
@@ -229,10 +269,26 @@ with tab1:
     col1, col2 = st.columns([2, 1])
 
     with col1:
+        file_format = st.radio(
+            "파일 형식",
+            ["일반 표 (CSV)", "플레이트 리더 출력 (96/384-well 매트릭스)"],
+            horizontal=True,
+            help="플레이트 리더 출력은 (plate, well, row, col, read, value) 형태로 자동 변환됩니다"
+        )
+        is_plate_export = file_format.startswith("플레이트")
+        if is_plate_export:
+            upload_types = ['csv', 'txt', 'tsv']
+            upload_help = "기기에서 내보낸 매트릭스 블록 파일 (.csv, .txt, .tsv - 여러 플레이트/측정 포함 가능)"
+        elif PARQUET_AVAILABLE:
+            upload_types = ['csv', 'parquet']
+            upload_help = "쉼표로 구분된 데이터 파일 (.csv) 또는 Parquet 파일을 업로드하세요"
+        else:  # pyarrow가 없으면 Parquet 업로드를 제공하지 않음
+            upload_types = ['csv']
+            upload_help = "쉼표로 구분된 데이터 파일 (.csv)을 업로드하세요"
         uploaded_file = st.file_uploader(
-            "📁 CSV 파일 선택",
-            type=['csv'],
-            help="쉼표로 구분된 데이터 파일 (.csv)을 업로드하세요"
+            "📁 데이터 파일 선택",
+            type=upload_types,
+            help=upload_help
         )
 
     with col2:
@@ -260,22 +316,77 @@ with tab1:
     
     if uploaded_file:
         try:
-            df = pd.read_csv(uploaded_file)
+            upload_id = getattr(uploaded_file, 'file_id', None) or uploaded_file.name
+            if is_plate_export:
+                df = parse_plate_export(uploaded_file)
+                if df.empty:
+                    raise ValueError("플레이트 매트릭스 블록(열 번호 헤더 + A, B, ... 행)을 찾지 못했습니다.")
+                st.caption(
+                    f"🧫 플레이트 {df['plate'].nunique()}개, 측정(read) {df['read'].nunique()}종을 "
+                    "tidy 형태로 변환했습니다."
+                )
+                st.session_state.data_path = None
+                st.session_state.data_profile = build_data_profile(df)
+                st.session_state.data_rows = len(df)
+            else:
+                # 업로드 파일을 디스크에 복사한 뒤 청크 단위로 읽어 프로파일 생성 (rerun마다 반복하지 않음)
+                # 큰 파일은 전체 DataFrame을 만들지 않고, 미리보기/검증에는 무작위 표본 행을 사용
+                if st.session_state.get('file_profile_id') != upload_id:
+                    upload_name = f"upload_{Path(uploaded_file.name).name}"
+                    source_path = Path(st.session_state.temp_dir) / upload_name
+                    uploaded_file.seek(0)
+                    with open(source_path, 'wb') as f:
+                        shutil.copyfileobj(uploaded_file, f)
+                    csv_path = (Path(st.session_state.temp_dir) / 'upload_data.csv'
+                                if is_parquet(source_path) else None)
+                    st.session_state.file_profile = profile_file(source_path, write_csv=csv_path)
+                    st.session_state.file_profile_id = upload_id
+                profile = st.session_state.file_profile
+                df = profile.sample
+                st.session_state.data_path = profile.csv_path or profile.path
+                st.session_state.data_profile = profile.profile
+                st.session_state.data_rows = profile.n_rows
+                if not profile.is_complete:
+                    st.caption(
+                        f"📦 대용량 파일: 전체 {profile.n_rows:,}행은 청크 단위로 요약해 AI에 전달하고, "
+                        f"미리보기와 품질 검증은 무작위 표본 {len(df):,}행으로 수행합니다."
+                    )
             st.session_state.uploaded_data = df
+
+            # 다른 파일이 올라오면 이전 데이터의 검증 결과 캐시를 비움 (같은 파일의 rerun은 캐시 재사용)
+            if st.session_state.get('upload_id') not in (None, upload_id):
+                st.session_state.validator.invalidate_cache()
+            st.session_state.upload_id = upload_id
             
-            st.success(f"✅ 데이터 로드 완료 ({len(df)}행 × {len(df.columns)}열)")
+            st.success(f"✅ 데이터 로드 완료 ({st.session_state.data_rows}행 × {len(df.columns)}열)")
             
             with st.expander("📊 데이터 미리보기", expanded=True):
                 st.dataframe(df.head(10), use_container_width=True)
             
             col1, col2, col3 = st.columns(3)
             with col1:
-                st.metric("총 행 수", len(df))
+                st.metric("총 행 수", st.session_state.data_rows)
             with col2:
                 st.metric("총 열 수", len(df.columns))
             with col3:
-                numeric_count = len(df.select_dtypes(include=['number']).columns)
-                st.metric("숫자형 열", numeric_count)
+                st.metric("숫자형 열", len(st.session_state.data_profile.numeric_columns))
+
+            # 업로드 때 만든 프로파일을 그대로 표시/점검 (rerun마다 통계를 다시 계산하지 않음)
+            with st.expander("📋 컬럼 프로파일", expanded=False):
+                data_profile = st.session_state.data_profile
+                if data_profile.n_cols > WIDE_COLUMN_THRESHOLD:
+                    st.caption(f"열이 {data_profile.n_cols:,}개라 AI에는 이름 패턴/타입이 같은 열을 "
+                               "묶은 요약을 전달합니다.")
+                    st.dataframe(data_profile.column_groups(), use_container_width=True,
+                                 hide_index=True)
+                st.dataframe(data_profile.to_frame(), use_container_width=True, hide_index=True)
+                quality = st.session_state.validator.check_data_quality(data_profile)
+                for warning in quality['warnings']:
+                    st.warning(warning)
+                strong = data_profile.strong_correlations()
+                if strong:
+                    st.markdown("**강한 상관관계 (|r| ≥ 0.7)**")
+                    st.markdown("\n".join(f"- {a} ↔ {b}: r = {r:.3f}" for a, b, r in strong[:10]))
             
             st.subheader("🔍 데이터 품질 검증")
             
@@ -293,22 +404,44 @@ with tab1:
                         key="y_var"
                     )
                 
+                curve_group_options = ["없음 - 단일 곡선"] + [
+                    c for c in df.columns if c not in (x_col, y_col)
+                ]
+                curve_group = st.selectbox(
+                    "곡선 구분 컬럼 (플레이트/분석물별 여러 곡선)",
+                    curve_group_options,
+                    help="선택하면 그룹마다 Standard Curve를 한 번에 검증합니다"
+                )
+
                 if st.button("🔬 Standard Curve 검증", type="primary"):
                     with st.spinner("검증 중..."):
-                        validation = st.session_state.validator.validate_standard_curve(
-                            df, x_col, y_col
-                        )
-                        
-                        if validation['is_valid']:
-                            st.success(f"""
-                            ✅ **데이터 품질 양호**
-                            - R² = {validation['r_squared']:.4f}
-                            - p-value = {validation['p_value']:.4e}
-                            """)
+                        if curve_group != "없음 - 단일 곡선":
+                            curves = st.session_state.validator.validate_standard_curves(
+                                df, curve_group, x_col, y_col
+                            )
+                            n_valid = int(curves['is_valid'].sum())
+                            if n_valid == len(curves):
+                                st.success(f"✅ {len(curves)}개 곡선 모두 품질 양호")
+                            else:
+                                st.warning(f"⚠️ {len(curves) - n_valid}/{len(curves)}개 곡선 주의 필요")
+                            curves_view = curves.copy()
+                            curves_view['warnings'] = curves_view['warnings'].str.join(' / ')
+                            st.dataframe(curves_view, use_container_width=True)
                         else:
-                            st.warning("⚠️ 데이터 품질 주의 필요")
-                            for warning in validation['warnings']:
-                                st.warning(warning)
+                            validation = st.session_state.validator.validate_standard_curve(
+                                df, x_col, y_col
+                            )
+
+                            if validation['is_valid']:
+                                st.success(f"""
+                                ✅ **데이터 품질 양호**
+                                - R² = {validation['r_squared']:.4f}
+                                - p-value = {validation['p_value']:.4e}
+                                """)
+                            else:
+                                st.warning("⚠️ 데이터 품질 주의 필요")
+                                for warning in validation['warnings']:
+                                    st.warning(warning)
             else:
                 st.info("숫자형 열이 2개 이상 필요합니다.")
                 
@@ -325,7 +458,7 @@ with tab2:
     else:
         df = st.session_state.uploaded_data
 
-        st.success(f"✅ 데이터 로드 완료! {len(df)}행 × {len(df.columns)}열")
+        st.success(f"✅ 데이터 로드 완료! {st.session_state.data_rows}행 × {len(df.columns)}열")
 
         # Show existing analyses first
         if st.session_state.code_history:
@@ -347,7 +480,10 @@ with tab2:
             )
             target_variable = None if target_var == "없음 - 일반 탐색" else target_var
 
-        data_info = get_data_profile(df)
+        # 업로드 때 만든 DataProfile 재사용 (큰 파일은 전체 기준 근사 프로파일)
+        data_info = st.session_state.data_profile
+        if data_info is None:
+            data_info = build_data_profile(df)
 
         # 템플릿 선택 추가
         st.markdown("#### 🎨 분석 템플릿 (선택사항)")
@@ -424,7 +560,7 @@ with tab2:
                         st.success("✅ 코드 생성 완료!")
 
                         st.subheader("📝 생성된 코드")
-                        st.code(result['code'], language=language.lower())
+                        st.code(result.code, language=language.lower())
 
                         # 코드 실행 및 결과 캡처 (Python만 지원)
                         execution_result = None
@@ -432,8 +568,9 @@ with tab2:
                             with st.spinner("🔄 코드 실행 중..."):
                                 try:
                                     # 데이터 파일 경로 준비
-                                    data_path = None
-                                    if st.session_state.uploaded_data is not None:
+                                    data_path = st.session_state.data_path
+                                    if (data_path is None
+                                            and st.session_state.uploaded_data is not None):
                                         # Save to temp file
                                         import tempfile
                                         temp_data = tempfile.NamedTemporaryFile(
@@ -449,7 +586,7 @@ with tab2:
 
                                     # 코드 실행
                                     execution_result = st.session_state.executor.execute_python_code(
-                                        code=result['code'],
+                                        code=result.code,
                                         data_path=data_path
                                     )
 
@@ -477,19 +614,19 @@ with tab2:
                                     st.warning(f"⚠️ 코드 실행 중 오류: {str(exec_error)}")
                                     st.info("💡 리포트 생성 시 Quarto가 다시 실행을 시도합니다.")
 
-                        if result['interpretation']:
+                        if result.interpretation:
                             st.subheader("💡 결과 해석")
-                            st.info(result['interpretation'])
+                            st.info(result.interpretation)
 
-                        if result['warnings']:
+                        if result.warnings:
                             st.subheader("⚠️ 주의사항")
-                            st.warning(result['warnings'])
+                            st.warning(result.warnings)
 
                         st.session_state.code_history.append({
                             'language': language.lower(),
-                            'code': result['code'],
+                            'code': result.code,
                             'caption': user_request[:50] + "...",
-                            'interpretation': result['interpretation'],
+                            'interpretation': result.interpretation,
                             'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
                             'execution_result': execution_result  # 실행 결과 저장
                         })
@@ -508,8 +645,8 @@ with tab2:
                             with st.expander("💡 해결 방법", expanded=True):
                                 st.markdown("""
                                 **즉시 해결:**
-                                1. 사이드바에서 모델을 **'gemini-2.0-flash'**로 변경 후 다시 시도
-                                2. 몇 분 후 다시 시도 (Free tier는 하루 20회 제한)
+                                1. 자동 라우팅이 대체 모델까지 모두 시도했습니다. 몇 분 후 다시 시도하세요
+                                2. Free tier는 하루 20회 제한이 있습니다
                                 
                                 **장기 해결:**
                                 - [할당량 확인](https://ai.dev/usage?tab=rate-limit)
@@ -519,6 +656,73 @@ with tab2:
                         else:
                             st.error(f"코드 생성 실패: {error_msg}")
 
+        # 여러 템플릿을 동시에 생성
+        st.divider()
+        st.markdown("#### 📦 여러 템플릿 한 번에 실행")
+        batch_templates = st.multiselect(
+            "함께 실행할 분석 템플릿",
+            list(templates.keys()),
+            default=['descriptive', 'correlation', 'distribution'],
+            format_func=lambda k: templates[k]['name'],
+            help="선택한 템플릿을 동시에 요청하고, 완료되는 순서대로 분석 목록에 추가합니다"
+        )
+
+        if st.button("⚡ 선택한 템플릿 모두 실행", use_container_width=True,
+                     disabled=not batch_templates):
+            batch_requests = [
+                {
+                    'caption': templates[k]['name'],
+                    'prompt': templates[k]['prompt'],
+                    'complexity': 'simple'
+                }
+                for k in batch_templates
+            ]
+            progress = st.progress(0.0, text="🧠 Gemini가 여러 분석 코드를 동시에 생성하는 중...")
+
+            # 실행용 데이터 파일은 한 번만 저장
+            batch_data_path = None
+            if language.lower() == 'python':
+                batch_data_path = st.session_state.data_path
+                if batch_data_path is None:
+                    batch_data_path = str(Path(st.session_state.temp_dir) / 'batch_data.csv')
+                    df.to_csv(batch_data_path, index=False, encoding='utf-8')
+
+            for done, outcome in enumerate(st.session_state.generator.generate_batch(
+                batch_requests,
+                language=language.lower(),
+                data_info=data_info,
+                target_variable=target_variable,
+                max_workers=3
+            ), 1):
+                caption = outcome['request']['caption']
+                progress.progress(done / len(batch_requests),
+                                  text=f"{done}/{len(batch_requests)} 완료: {caption}")
+                if outcome['error']:
+                    st.error(f"❌ {caption}: {outcome['error']}")
+                    continue
+
+                result = outcome['result']
+                execution_result = None
+                if batch_data_path:
+                    execution_result = st.session_state.executor.execute_python_code(
+                        code=result.code,
+                        data_path=batch_data_path
+                    )
+
+                st.session_state.code_history.append({
+                    'language': language.lower(),
+                    'code': result.code,
+                    'caption': caption,
+                    'interpretation': result.interpretation,
+                    'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                    'execution_result': execution_result
+                })
+                executed_ok = execution_result is None or execution_result['success']
+                status = "✅" if executed_ok else "⚠️ 실행 오류"
+                st.success(f"{status} {caption} ({outcome['elapsed']:.1f}초, {result.model})")
+
+            st.success(f"✅ 리포트 생성 탭으로 이동하세요! (총 {len(st.session_state.code_history)}개 분석)")
+
 # TAB 3: 리포트 생성
 with tab3:
     st.header("📄 리포트 생성")
@@ -549,8 +753,8 @@ with tab3:
             with st.spinner("📝 Quarto 문서 렌더링 중..."):
                 try:
                     # Prepare data file path if data is uploaded
-                    data_file_path = None
-                    if st.session_state.uploaded_data is not None:
+                    data_file_path = st.session_state.data_path
+                    if data_file_path is None and st.session_state.uploaded_data is not None:
                         # Save uploaded data to temp file
                         import tempfile
                         temp_data = tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False, encoding='utf-8')
@@ -566,7 +770,8 @@ with tab3:
                         code_chunks=st.session_state.code_history,
                         theme=theme,
                         code_fold=not include_code,
-                        data_file_path=data_file_path
+                        data_file_path=data_file_path,
+                        data_profile=st.session_state.data_profile
                     )
 
                     st.success(f"✅ QMD 파일 생성 완료: `{qmd_path.name}`")
@@ -0,0 +1,396 @@
+"""여러 데이터셋에 대해 분석 리포트를 일괄 생성하는 헤드리스 CLI
+
+사용 예:
+    python batch_cli.py data/ --templates descriptive correlation \\
+        --request "그룹별 평균을 비교해주세요" --output-dir reports --llm-concurrency 2
+
+각 데이터 파일마다 profile → generate → execute → render 단계를 수행하고,
+리포트와 단계별 소요 시간이 담긴 run_summary.json을 출력 디렉토리에 저장합니다.
+"""
+
+import argparse
+import json
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from agents.code_generator import BioCodeGenerator
+from utils.code_executor import CodeExecutor
+from utils.data_profiler import DataProfile, build_data_profile
+from utils.example_data import AnalysisTemplates
+from utils.plate_parser import looks_like_plate_export, parse_plate_export
+from utils.quarto_renderer import QuartoRenderer
+from utils.simple_html_renderer import SimpleHTMLRenderer
+from utils.streaming_profiler import is_parquet, profile_file
+
+SUPPORTED_SUFFIXES = ('.csv', '.tsv', '.txt', '.xlsx', '.xls', '.parquet')
+
+
+def load_dataset(path: Path) -> pd.DataFrame:
+    """확장자에 맞춰 데이터 파일을 DataFrame으로 로드 (플레이트 리더 매트릭스 출력은 tidy 변환)"""
+    suffix = path.suffix.lower()
+    if suffix in ('.xlsx', '.xls'):
+        return pd.read_excel(path)
+    if is_parquet(path):
+        return pd.read_parquet(path)
+    if looks_like_plate_export(path):
+        return parse_plate_export(path)
+    if suffix in ('.tsv', '.txt'):
+        return pd.read_csv(path, sep='\t')
+    return pd.read_csv(path)
+
+
+def dataset_names(paths: List[Path]) -> List[str]:
+    """
+    데이터셋별 고유 이름 (출력 디렉터리/프로파일 키로 사용)
+
+    파일명(stem)이 겹치지 않으면 그대로 쓰고, run1.csv / run1.xlsx처럼 겹치면 확장자를 붙이며
+    (run1_csv, run1_xlsx), 그래도 겹치면(다른 폴더의 같은 파일명) _2, _3 ... 번호를 붙입니다.
+    """
+    stem_counts = Counter(path.stem for path in paths)
+    names: List[str] = []
+    used = set()
+    for path in paths:
+        name = path.stem
+        if stem_counts[name] > 1 and path.suffix:
+            name = f"{name}_{path.suffix.lstrip('.').lower()}"
+        candidate, counter = name, 2
+        while candidate in used:
+            candidate = f"{name}_{counter}"
+            counter += 1
+        used.add(candidate)
+        names.append(candidate)
+    return names
+
+
+def resolve_requests(template_keys: List[str], requests: List[str]) -> List[Dict]:
+    """템플릿 키와 자유 요청을 [{'caption', 'prompt'}] 목록으로 변환"""
+    templates = AnalysisTemplates.get_templates()
+    resolved = []
+    for key in template_keys:
+        if key not in templates:
+            raise ValueError(
+                f"알 수 없는 템플릿 키: {key} (사용 가능: {', '.join(templates)})"
+            )
+        resolved.append({
+            'caption': templates[key]['name'],
+            'prompt': templates[key]['prompt'],
+            'complexity': 'simple'
+        })
+    for request in requests:
+        resolved.append({'caption': request[:50] + "...", 'prompt': request})
+    return resolved
+
+
+class BatchReportRunner:
+    """데이터셋 × 분석 요청 조합을 병렬로 처리하는 배치 실행기"""
+
+    def __init__(
+        self,
+        generator: BioCodeGenerator,
+        output_dir: Path,
+        language: str = "python",
+        workers: int = 4,
+        llm_concurrency: int = 2,
+        title: str = "배치 분석 리포트",
+        author: str = "Batch CLI"
+    ):
+        self.generator = generator
+        self.output_dir = Path(output_dir)
+        self.language = language
+        self.workers = max(1, workers)
+        self.title = title
+        self.author = author
+
+        # LLM 호출 수 제한 (API 할당량 보호)
+        self._llm_slots = threading.Semaphore(max(1, llm_concurrency))
+        # CodeExecutor는 sys.stdout과 matplotlib 전역 상태를 바꾸므로 실행은 직렬화
+        self._exec_lock = threading.Lock()
+
+    def run(self, data_files: List[Path], analysis_requests: List[Dict]) -> Dict:
+        """전체 배치를 실행하고 실행 요약(dict)을 반환"""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        started = time.perf_counter()
+        started_at = datetime.now().isoformat(timespec='seconds')
+
+        datasets = [
+            {
+                'dataset': str(path),
+                'name': name,
+                'status': 'pending',
+                'timings': {},
+                'analyses': [],
+                'reports': [],
+                'error': ''
+            }
+            for path, name in zip(data_files, dataset_names(data_files))
+        ]
+        profiles: Dict[str, DataProfile] = {}
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            # 1단계: 데이터 로드 및 프로파일링
+            for entry, profile in zip(datasets, pool.map(self._profile, datasets, data_files)):
+                if profile is not None:
+                    profiles[entry['name']] = profile
+
+            # 2단계: 코드 생성 + 실행 (데이터셋 × 요청)
+            jobs = [
+                (entry, request)
+                for entry in datasets if entry['name'] in profiles
+                for request in analysis_requests
+            ]
+            outcomes = list(pool.map(
+                lambda job: self._analyze(job[0], job[1], profiles),
+                jobs
+            ))
+            for (entry, _), outcome in zip(jobs, outcomes):
+                entry['analyses'].append(outcome)
+
+            # 3단계: 데이터셋별 리포트 렌더링
+            list(pool.map(lambda e: self._render(e, profiles[e['name']]),
+                          [e for e in datasets if e['name'] in profiles]))
+
+        summary = {
+            'started_at': started_at,
+            'finished_at': datetime.now().isoformat(timespec='seconds'),
+            'total_seconds': round(time.perf_counter() - started, 3),
+            'language': self.language,
+            'requests': [r['caption'] for r in analysis_requests],
+            'stage_totals': self._stage_totals(datasets),
+            'model_stats': self.generator.router.stats(),
+            'context_cache': self.generator.context_cache.stats(),
+            'datasets': datasets
+        }
+
+        summary_path = self.output_dir / 'run_summary.json'
+        with open(summary_path, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2, default=str)
+
+        return summary
+
+    def _profile(self, entry: Dict, path: Path):
+        """
+        데이터 로드 + 프로파일 생성 (코드 실행/리포트용 data.csv도 함께 저장)
+
+        CSV/TSV/Parquet 표는 청크 단위로 읽으며 프로파일과 data.csv를 같은 순회에서 만들어
+        파일 전체를 메모리에 올리지 않습니다 (엑셀/플레이트 리더 출력은 기존처럼 로드).
+        """
+        t0 = time.perf_counter()
+        try:
+            report_dir = self.output_dir / entry['name']
+            report_dir.mkdir(parents=True, exist_ok=True)
+            data_csv = report_dir / 'data.csv'
+            suffix = path.suffix.lower()
+            if suffix == '.csv' and not looks_like_plate_export(path):
+                # 쉼표 구분 CSV는 변환 없이 바이트 복사 (to_csv 재기록보다 훨씬 빠름)
+                profile = profile_file(path).profile
+                shutil.copyfile(path, data_csv)
+            elif is_parquet(path) or (suffix in ('.tsv', '.txt')
+                                      and not looks_like_plate_export(path)):
+                profile = profile_file(path, write_csv=data_csv).profile
+            else:
+                df = load_dataset(path)
+                profile = build_data_profile(df)
+                df.to_csv(data_csv, index=False, encoding='utf-8')
+        except Exception as e:
+            entry['status'] = 'failed'
+            entry['error'] = f"데이터 로드/프로파일 실패: {str(e)}"
+            return None
+        finally:
+            entry['timings']['profile'] = round(time.perf_counter() - t0, 3)
+        return profile
+
+    def _analyze(self, entry: Dict, request: Dict, profiles: Dict[str, DataProfile]) -> Dict:
+        """단일 요청에 대한 코드 생성 및 실행"""
+        outcome = {
+            'caption': request['caption'],
+            'status': 'failed',
+            'timings': {},
+            'error': ''
+        }
+
+        t0 = time.perf_counter()
+        try:
+            with self._llm_slots:
+                result = self.generator.generate_analysis_code(
+                    user_input=request['prompt'],
+                    language=self.language,
+                    data_info=profiles[entry['name']],
+                    complexity=request.get('complexity')
+                )
+        except Exception as e:
+            outcome['error'] = f"코드 생성 실패: {str(e)}"
+            return outcome
+        finally:
+            outcome['timings']['generate'] = round(time.perf_counter() - t0, 3)
+
+        execution_result = None
+        if self.language == 'python':
+            t0 = time.perf_counter()
+            data_path = self.output_dir / entry['name'] / 'data.csv'
+            with self._exec_lock:
+                executor = CodeExecutor(temp_dir=tempfile.mkdtemp(prefix='dataviz_batch_'))
+                execution_result = executor.execute_python_code(
+                    code=result.code,
+                    data_path=str(data_path)
+                )
+            outcome['timings']['execute'] = round(time.perf_counter() - t0, 3)
+            if not execution_result['success']:
+                outcome['error'] = execution_result['error']
+
+        outcome['status'] = 'ok' if not outcome['error'] else 'execution_failed'
+        outcome['chunk'] = {
+            'language': self.language,
+            'code': result.code,
+            'caption': request['caption'],
+            'interpretation': result.interpretation,
+            'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'execution_result': execution_result
+        }
+        return outcome
+
+    def _render(self, entry: Dict, profile: DataProfile):
+        """생성된 분석을 모아 데이터셋별 리포트 렌더링 (프로파일 단계의 DataProfile로 데이터 개요 작성)"""
+        chunks = [a.pop('chunk') for a in entry['analyses'] if 'chunk' in a]
+        if not chunks:
+            entry['status'] = 'failed'
+            entry['error'] = entry['error'] or "생성된 분석이 없습니다."
+            return
+
+        t0 = time.perf_counter()
+        report_dir = self.output_dir / entry['name']
+        report_dir.mkdir(parents=True, exist_ok=True)
+        experiment_date = datetime.now().strftime("%Y-%m-%d")
+        title = f"{self.title} - {entry['name']}"
+
+        try:
+            renderer = QuartoRenderer()
+            qmd_path = renderer.create_qmd_document(
+                title=title,
+                author=self.author,
+                experiment_date=experiment_date,
+                code_chunks=chunks,
+                data_file_path=str(report_dir / 'data.csv'),
+                data_profile=profile
+            )
+            entry['reports'].append(str(shutil.copy2(qmd_path, report_dir / 'report.qmd')))
+            try:
+                html_path = renderer.render_to_html(qmd_path)
+                entry['reports'].append(str(shutil.copy2(html_path, report_dir / 'report.html')))
+            except RuntimeError as render_error:
+                # Quarto가 없거나 실패하면 Python 전용 HTML 리포트로 대체
+                html = SimpleHTMLRenderer.create_html_report(
+                    title=title,
+                    author=self.author,
+                    experiment_date=experiment_date,
+                    code_chunks=chunks,
+                    data_profile=profile
+                )
+                simple_path = report_dir / 'report_simple.html'
+                simple_path.write_text(html, encoding='utf-8')
+                entry['reports'].append(str(simple_path))
+                entry['error'] = f"Quarto 렌더링 실패, 간이 HTML로 대체: {str(render_error)[:300]}"
+            entry['status'] = 'ok'
+        except Exception as e:
+            entry['status'] = 'failed'
+            entry['error'] = f"리포트 생성 실패: {str(e)}"
+        finally:
+            entry['timings']['render'] = round(time.perf_counter() - t0, 3)
+
+    @staticmethod
+    def _stage_totals(datasets: List[Dict]) -> Dict[str, float]:
+        """단계별 누적 소요 시간(초)"""
+        totals = {'profile': 0.0, 'generate': 0.0, 'execute': 0.0, 'render': 0.0}
+        for entry in datasets:
+            for stage in ('profile', 'render'):
+                totals[stage] += entry['timings'].get(stage, 0.0)
+            for analysis in entry['analyses']:
+                for stage in ('generate', 'execute'):
+                    totals[stage] += analysis['timings'].get(stage, 0.0)
+        return {stage: round(seconds, 3) for stage, seconds in totals.items()}
+
+
+def find_data_files(data_dir: Path, pattern: Optional[str] = None) -> List[Path]:
+    """디렉토리에서 지원하는 데이터 파일 목록을 찾기"""
+    if pattern:
+        candidates = data_dir.glob(pattern)
+    else:
+        candidates = data_dir.iterdir()
+    return sorted(
+        p for p in candidates
+        if p.is_file() and p.suffix.lower() in SUPPORTED_SUFFIXES
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="여러 데이터 파일에 동일한 분석을 일괄 적용하여 리포트를 생성합니다."
+    )
+    parser.add_argument("data_dir", type=Path, help="데이터 파일이 있는 디렉토리")
+    parser.add_argument("--templates", nargs="*", default=[],
+                        help="분석 템플릿 키 (예: descriptive correlation)")
+    parser.add_argument("--request", action="append", default=[],
+                        help="자유 형식 분석 요청 (여러 번 지정 가능)")
+    parser.add_argument("--pattern", default=None, help="파일 glob 패턴 (예: '*.csv')")
+    parser.add_argument("--output-dir", type=Path, default=Path("reports"),
+                        help="리포트 및 run_summary.json 출력 디렉토리")
+    parser.add_argument("--language", choices=["python", "r"], default="python")
+    parser.add_argument("--model", default="gemini-2.5-flash", help="Gemini 모델명")
+    parser.add_argument("--workers", type=int, default=4, help="병렬 작업 스레드 수")
+    parser.add_argument("--llm-concurrency", type=int, default=2,
+                        help="동시에 실행할 최대 LLM 호출 수")
+    parser.add_argument("--title", default="배치 분석 리포트", help="리포트 제목")
+    parser.add_argument("--author", default="Batch CLI", help="리포트 작성자")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    if not args.data_dir.is_dir():
+        print(f"데이터 디렉토리를 찾을 수 없습니다: {args.data_dir}", file=sys.stderr)
+        return 2
+
+    try:
+        analysis_requests = resolve_requests(args.templates, args.request)
+    except ValueError as e:
+        print(str(e), file=sys.stderr)
+        return 2
+    if not analysis_requests:
+        print("--templates 또는 --request 중 하나 이상을 지정하세요.", file=sys.stderr)
+        return 2
+
+    data_files = find_data_files(args.data_dir, args.pattern)
+    if not data_files:
+        print(f"처리할 데이터 파일이 없습니다: {args.data_dir}", file=sys.stderr)
+        return 2
+
+    runner = BatchReportRunner(
+        generator=BioCodeGenerator(model_name=args.model),
+        output_dir=args.output_dir,
+        language=args.language,
+        workers=args.workers,
+        llm_concurrency=args.llm_concurrency,
+        title=args.title,
+        author=args.author
+    )
+    summary = runner.run(data_files, analysis_requests)
+
+    failed = [d for d in summary['datasets'] if d['status'] != 'ok']
+    print(f"✅ {len(data_files) - len(failed)}/{len(data_files)}개 데이터셋 처리 완료 "
+          f"({summary['total_seconds']}초)")
+    print(f"📄 요약: {args.output_dir / 'run_summary.json'}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+"""데이터 프로파일 생성 속도 비교 (열별 반복 계산 vs 블록 단위 단일 패스 vs 열 샤드 병렬)
+
+실행:
+    python benchmarks/bench_data_profiler.py --rows 1000000 --cols 200
+    python benchmarks/bench_data_profiler.py --rows 5000 --cols 20000 --skip-legacy   # 넓은 표
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.data_profiler import DataProfile, get_data_profile  # noqa: E402
+
+
+def legacy_data_profile(df: pd.DataFrame) -> str:
+    """이전 구현 (열마다 isnull/mean/std/min/max/nunique/value_counts를 따로 계산)"""
+    summary = []
+    summary.append("### [데이터 기본 정보]")
+    summary.append(f"- 크기: {df.shape[0]} 행 x {df.shape[1]} 열")
+    summary.append(f"- 컬럼 목록: {', '.join(df.columns.tolist())}")
+
+    summary.append("\n### [컬럼별 상세 정보]")
+    for col in df.columns:
+        dtype = df[col].dtype
+        null_count = df[col].isnull().sum()
+        null_pct = (null_count / len(df)) * 100
+
+        col_info = f"- **{col}**: 타입={dtype}, 결측치={null_count}({null_pct:.1f}%)"
+
+        if pd.api.types.is_numeric_dtype(df[col]):
+            mean = df[col].mean()
+            std = df[col].std()
+            min_val = df[col].min()
+            max_val = df[col].max()
+            col_info += f", 통계=[평균:{mean:.2f}, 표준편차:{std:.2f}, 범위:{min_val}~{max_val}]"
+        else:
+            unique_count = df[col].nunique()
+            top_values = df[col].value_counts().head(3).index.tolist()
+            col_info += f", 고유값 수={unique_count}, 상위 항목={top_values}"
+
+        summary.append(col_info)
+
+    summary.append("\n### [데이터 샘플 (상위 5행)]")
+    summary.append(df.head(5).to_markdown())
+
+    return "\n".join(summary)
+
+
+def make_wide_data(rows: int, cols: int, seed: int = 0) -> pd.DataFrame:
+    """실험 데이터 형태의 넓은 표: 실수 60% (일부 결측), 정수 20%, 문자열 범주 20%"""
+    rng = np.random.default_rng(seed)
+    n_float = int(cols * 0.6)
+    n_int = int(cols * 0.2)
+    n_text = cols - n_float - n_int
+    data = {}
+    for i in range(n_float):
+        values = rng.normal(i, 1 + i % 7, rows)
+        if i % 4 == 0:
+            values[rng.random(rows) < 0.05] = np.nan
+        data[f"signal_{i}"] = values
+    for i in range(n_int):
+        data[f"count_{i}"] = rng.integers(0, 1000, rows)
+    labels = np.array([f"group_{k}" for k in range(50)], dtype=object)
+    for i in range(n_text):
+        data[f"label_{i}"] = labels[rng.integers(0, 5 + i % 45, rows)]
+    return pd.DataFrame(data)
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--cols", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=None,
+                        help="열 샤드 병렬 스레드 수 (기본: CPU 코어 수)")
+    parser.add_argument("--skip-legacy", action="store_true",
+                        help="열이 수천 개라 이전 구현이 너무 오래 걸릴 때")
+    args = parser.parse_args()
+
+    df = make_wide_data(args.rows, args.cols)
+    print(f"데이터: {args.rows:,}행 x {args.cols}열 ({df.memory_usage(deep=False).sum() / 1e9:.2f} GB)")
+    print(f"{'method':<28}{'seconds':>10}")
+
+    if not args.skip_legacy:
+        legacy_seconds, legacy = timed(lambda: legacy_data_profile(df))
+        print(f"{'legacy (per column)':<28}{legacy_seconds:>10.3f}")
+
+        seconds, profile = timed(lambda: get_data_profile(df, max_columns=None))
+        print(f"{'get_data_profile':<28}{seconds:>10.3f}")
+        print(f"속도 향상: {legacy_seconds / seconds:.1f}x, 출력 동일: {profile == legacy}")
+
+    serial_seconds, serial = timed(lambda: DataProfile.from_frame(df, workers=1))
+    print(f"{'DataProfile (1 thread)':<28}{serial_seconds:>10.3f}")
+    parallel_seconds, parallel = timed(lambda: DataProfile.from_frame(df, workers=args.workers))
+    print(f"{'DataProfile (column shards)':<28}{parallel_seconds:>10.3f}")
+    same = serial.to_markdown(max_columns=None) == parallel.to_markdown(max_columns=None)
+    print(f"병렬 속도 향상: {serial_seconds / parallel_seconds:.1f}x, 결과 동일: {same}")
+    print(f"프롬프트 크기: 열별 {len(serial.to_markdown(max_columns=None)):,}자 → "
+          f"기본(넓은 표 요약) {len(serial.to_markdown()):,}자")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""이상치 탐지 방법별 속도 비교 (MAD / IQR / Hampel vs Isolation Forest)
+
+실행:
+    python benchmarks/bench_outlier_detectors.py --rows 1000000 --groups 10000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agents.validator import ExperimentValidator  # noqa: E402
+
+
+def make_replicate_data(rows: int, groups: int, seed: int = 0) -> pd.DataFrame:
+    """그룹별 반복 측정값 + 1% 인위적 이상치"""
+    rng = np.random.default_rng(seed)
+    group = rng.integers(0, groups, rows)
+    center = rng.uniform(1, 100, groups)[group]
+    value = rng.normal(center, center * 0.05)
+    spikes = rng.random(rows) < 0.01
+    value[spikes] *= rng.choice([0.3, 3.0], spikes.sum())
+    return pd.DataFrame({'sample': group, 'signal': value})
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--groups", type=int, default=10_000)
+    parser.add_argument("--legacy-rows", type=int, default=200_000,
+                        help="기존 detect_outliers(전체 학습)에 사용할 행 수")
+    args = parser.parse_args()
+
+    df = make_replicate_data(args.rows, args.groups)
+    validator = ExperimentValidator()
+
+    print(f"데이터: {args.rows:,}행, {args.groups:,}개 그룹")
+    print(f"{'method':<28}{'seconds':>10}{'flagged':>12}")
+
+    for method in ExperimentValidator.ROBUST_METHODS:
+        seconds, flags = timed(
+            lambda: validator.detect_outliers_robust(df, 'signal', 'sample', method=method)
+        )
+        print(f"{method:<28}{seconds:>10.3f}{int(flags['signal'].sum()):>12,}")
+
+    seconds, mask = timed(lambda: validator.detect_outliers_scalable(df, ['signal']))
+    print(f"{'isolation_forest (scalable)':<28}{seconds:>10.3f}{int(mask.sum()):>12,}")
+
+    legacy = df.head(args.legacy_rows).copy()
+    seconds, result = timed(lambda: validator.detect_outliers(legacy, ['signal']))
+    label = f"isolation_forest ({len(legacy) // 1000}k)"
+    print(f"{label:<28}{seconds:>10.3f}{int(result['is_outlier'].sum()):>12,}")
+
+
+if __name__ == "__main__":
+    main()
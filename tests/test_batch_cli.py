@@ -0,0 +1,15 @@
+from pathlib import Path
+
+from batch_cli import dataset_names
+
+
+def test_dataset_names_keep_unique_stems():
+    assert dataset_names([Path('a/run1.csv'), Path('a/run2.xlsx')]) == ['run1', 'run2']
+
+
+def test_dataset_names_disambiguate_colliding_stems():
+    paths = [Path('a/run1.csv'), Path('a/run1.xlsx'), Path('b/run1.csv'), Path('a/run1_csv.txt')]
+    names = dataset_names(paths)
+
+    assert names == ['run1_csv', 'run1_xlsx', 'run1_csv_2', 'run1_csv_3']
+    assert len(set(names)) == len(paths)
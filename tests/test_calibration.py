@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+from scipy import stats
+
+from agents.calibration import (
+    fit_calibration_curve, five_pl, four_pl, inverse_five_pl, inverse_four_pl
+)
+
+CONCENTRATIONS = np.logspace(-2, 3, 9)
+
+
+@pytest.mark.parametrize('hill', [1.3, -0.8])
+def test_inverse_four_pl_round_trip(hill):
+    params = (0.05, 2.5, 12.0, hill)
+    x = inverse_four_pl(four_pl(CONCENTRATIONS, *params), *params)
+
+    np.testing.assert_allclose(x, CONCENTRATIONS, rtol=1e-9)
+
+
+def test_inverse_five_pl_round_trip_and_four_pl_limit():
+    params = (0.05, 2.5, 12.0, 1.3, 0.6)
+    x = inverse_five_pl(five_pl(CONCENTRATIONS, *params), *params)
+
+    np.testing.assert_allclose(x, CONCENTRATIONS, rtol=1e-9)
+    # asym=1이면 4PL과 같은 곡선
+    np.testing.assert_allclose(five_pl(CONCENTRATIONS, *params[:4], 1.0),
+                               four_pl(CONCENTRATIONS, *params[:4]))
+
+
+def test_inverse_outside_asymptotes_is_nan():
+    assert np.isnan(inverse_four_pl([2.6, 0.0], 0.05, 2.5, 12.0, 1.3)).all()
+
+
+@pytest.mark.parametrize('model, params', [
+    ('4pl', (0.05, 2.5, 12.0, 1.3)),
+    ('5pl', (0.05, 2.5, 12.0, 1.3, 0.6)),
+])
+def test_fit_recovers_noiseless_curve(model, params):
+    func = four_pl if model == '4pl' else five_pl
+    curve = fit_calibration_curve(CONCENTRATIONS, func(CONCENTRATIONS, *params), model=model)
+
+    np.testing.assert_allclose(curve.params, params, rtol=1e-4)
+    assert curve.r_squared == pytest.approx(1.0)
+
+    unknown = np.array([0.5, 12.0, 200.0])
+    result = curve.inverse_predict(func(unknown, *params))
+    np.testing.assert_allclose(result['concentration'], unknown, rtol=1e-4)
+    assert list(result['range_flag']) == ['ok', 'ok', 'ok']
+
+
+def test_linear_inverse_interval_matches_closed_form():
+    x = np.array([0.0, 1.0, 2.0, 4.0, 8.0])
+    y = np.array([0.11, 0.52, 0.88, 1.71, 3.32])
+    curve = fit_calibration_curve(x, y)
+
+    slope, intercept = np.polyfit(x, y, 1)
+    np.testing.assert_allclose(curve.params, [slope, intercept])
+
+    y0, m = 1.2, 3
+    s = np.sqrt(np.sum((y - (intercept + slope * x)) ** 2) / (len(x) - 2))
+    sxx = np.sum((x - x.mean()) ** 2)
+    se = s / abs(slope) * np.sqrt(1 / m + 1 / len(x) + (y0 - y.mean()) ** 2 / (slope ** 2 * sxx))
+    half_width = stats.t.ppf(0.975, len(x) - 2) * se
+
+    result = curve.inverse_predict([y0], n_replicates=m)
+    x0 = (y0 - intercept) / slope
+    assert result['concentration'][0] == pytest.approx(x0)
+    assert result['ci_upper'][0] - x0 == pytest.approx(half_width)
+    assert result['range_flag'][0] == 'ok'
@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils import data_profiler
+from utils.data_profiler import DataProfile, profile_columns
+
+
+@pytest.fixture
+def mixed_frame():
+    rng = np.random.default_rng(4)
+    n = 500
+    df = pd.DataFrame({
+        'f32': rng.normal(5.0, 2.0, n).astype(np.float32),
+        'i64': rng.integers(-50, 50, n),
+        'u8': rng.integers(0, 255, n).astype(np.uint8),
+        'flag': rng.random(n) > 0.3,
+        'nullable': pd.array(np.where(rng.random(n) > 0.2, rng.integers(0, 9, n), None),
+                             dtype='Int64'),
+        'text': rng.choice(['alpha', 'beta', 'gamma', 'delta'], n, p=[0.5, 0.3, 0.15, 0.05]),
+        'category': pd.Categorical(rng.choice(['lo', 'mid', 'hi'], n, p=[0.6, 0.3, 0.1]),
+                                   categories=['lo', 'mid', 'hi', 'unused']),
+        'when': pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 30, n), unit='D'),
+    })
+    for col in range(8):
+        df[f'x{col}'] = rng.normal(col, 1.0, n)
+    df.loc[rng.choice(n, 40, replace=False), ['f32', 'x3']] = np.nan
+    df['text'] = df['text'].astype(object)
+    df.loc[rng.choice(n, 25, replace=False), ['text', 'when']] = None
+    df['empty'] = np.nan
+    return df
+
+
+def _legacy_profile(series: pd.Series) -> dict:
+    """이전 구현: 열마다 isnull/mean/std/min/max/nunique/value_counts를 따로 계산"""
+    profile = {'null_count': series.isnull().sum()}
+    if pd.api.types.is_numeric_dtype(series):
+        profile.update(mean=series.mean(), std=series.std(), min=series.min(), max=series.max())
+    else:
+        profile.update(unique_count=series.nunique(),
+                       top_values=series.value_counts().head(3).index.tolist())
+    return profile
+
+
+def _assert_matches_legacy(df, profiles):
+    assert [p['name'] for p in profiles] == list(df.columns)
+    for profile in profiles:
+        series = df[profile['name']]
+        expected = _legacy_profile(series)
+        assert profile['numeric'] == pd.api.types.is_numeric_dtype(series), profile['name']
+        assert profile['null_count'] == expected.pop('null_count'), profile['name']
+        assert profile['null_pct'] == pytest.approx(series.isnull().mean() * 100)
+        for key, value in expected.items():
+            if key == 'top_values':
+                assert profile[key] == value, profile['name']
+            elif pd.isna(value):
+                assert pd.isna(profile[key]), (profile['name'], key)
+            else:
+                assert profile[key] == pytest.approx(value, rel=1e-6), (profile['name'], key)
+
+
+@pytest.mark.parametrize('workers', [1, 4])
+def test_profile_columns_matches_per_column_pandas(mixed_frame, workers, monkeypatch):
+    # 수치 블록이 여러 조각으로 나뉘는 경로도 확인
+    monkeypatch.setattr(data_profiler, 'BLOCK_BYTES', 3 * len(mixed_frame) * 8)
+
+    _assert_matches_legacy(mixed_frame, profile_columns(mixed_frame, workers=workers))
+
+
+def test_from_frame_matches_per_column_pandas(mixed_frame):
+    profile = DataProfile.from_frame(mixed_frame)
+
+    _assert_matches_legacy(mixed_frame, [vars(column) for column in profile.columns])
+    assert profile.n_rows == len(mixed_frame)
+    pd.testing.assert_frame_equal(profile.preview, mixed_frame.head(5))
@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from agents.calibration import four_pl
+from agents.dose_response import DoseResponseAnalyzer
+
+
+@pytest.fixture
+def screen():
+    doses = np.logspace(-3, 2, 8)
+    frames = [
+        pd.DataFrame({'compound': name, 'dose': doses,
+                      'response': four_pl(doses, 0.0, 100.0, ec50, -1.0)})
+        for name, ec50 in [('A', 0.1), ('B', 1.0), ('C', 10.0)]
+    ]
+    frames.insert(1, pd.DataFrame({'compound': 'sparse', 'dose': doses[:3],
+                                   'response': [90.0, 50.0, 10.0]}))
+    return pd.concat(frames)  # 화합물마다 인덱스 0..n이 반복됨
+
+
+def test_initial_guesses_with_duplicate_index(screen):
+    guesses = DoseResponseAnalyzer().initial_guesses(screen, 'compound', 'dose', 'response')
+
+    assert list(guesses.index) == ['A', 'sparse', 'B', 'C']
+    assert guesses.loc['B', 'ec50'] == pytest.approx(1.0, rel=1.0)
+
+
+def test_fit_keeps_input_compound_order(screen):
+    result = DoseResponseAnalyzer().fit(screen, 'compound', 'dose', 'response', parallel=False)
+
+    assert list(result['compound']) == ['A', 'sparse', 'B', 'C']
+    assert list(result['status']) == ['ok', 'skipped', 'ok', 'ok']
+    assert result.loc[result['compound'] == 'B', 'ec50'].item() == pytest.approx(1.0, rel=1e-3)
+
+
+def test_min_points_below_four_pl_parameters_is_rejected():
+    with pytest.raises(ValueError):
+        DoseResponseAnalyzer(min_points=3)
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from agents.incremental_stats import _chan_merge
+from agents.validator import ExperimentValidator
+
+
+@pytest.fixture
+def runs():
+    rng = np.random.default_rng(3)
+    frames = []
+    for run in range(4):
+        n = 150 + 50 * run
+        x = rng.uniform(0, 10, n)
+        frames.append(pd.DataFrame({
+            'plate': rng.choice(['P1', 'P2'], n),
+            'sample': rng.choice(['A', 'B', 'C', f'new{run}'], n),
+            'x': x,
+            'y': 3.0 * x + 1.0 + rng.normal(0, 0.5, n),
+            'signal': rng.normal(100.0, 5.0, n),
+        }))
+    return frames
+
+
+def test_chan_merge_matches_numpy_variance():
+    rng = np.random.default_rng(0)
+    a, b = rng.normal(5.0, 2.0, 37), rng.normal(-1.0, 0.5, 64)
+    n, mean, m2 = _chan_merge(len(a), a.mean(), ((a - a.mean()) ** 2).sum(),
+                              len(b), b.mean(), ((b - b.mean()) ** 2).sum())
+    both = np.concatenate([a, b])
+
+    assert n == len(both)
+    assert mean == pytest.approx(both.mean())
+    assert m2 / (n - 1) == pytest.approx(np.var(both, ddof=1))
+
+
+def test_incremental_moments_match_full_recompute(runs):
+    validator = ExperimentValidator()
+    incremental = validator.incremental(group_col=['plate', 'sample'], value_cols=['signal', 'y'],
+                                        curve_group_col='plate', x_col='x', y_col='y')
+    for run in runs:
+        incremental.update(run)
+    full = pd.concat(runs, ignore_index=True)
+
+    pd.testing.assert_frame_equal(
+        incremental.replicate_stats(),
+        validator.compute_replicate_stats(full, ['plate', 'sample'], ['signal', 'y']),
+        check_dtype=False
+    )
+    pd.testing.assert_frame_equal(
+        incremental.standard_curves(),
+        validator.validate_standard_curves(full, 'plate', 'x', 'y'),
+        check_dtype=False
+    )
+
+
+def test_outlier_mask_after_refit_matches_scalable_detector(runs):
+    validator = ExperimentValidator()
+    incremental = validator.incremental(outlier_cols=['x', 'signal'], min_fit_rows=100,
+                                        max_samples=300)
+    for run in runs:
+        incremental.update(run)
+    full = pd.concat(runs, ignore_index=True)
+    expected = validator.detect_outliers_scalable(full, ['x', 'signal'], max_samples=300)
+
+    # 누적 150 → 350 → 600 → 900행: 350행과 900행(= 전체)에서 자동 재학습
+    assert incremental._fitted_rows == len(full)
+    np.testing.assert_array_equal(incremental.outlier_mask().to_numpy(), expected.to_numpy())
@@ -0,0 +1,61 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.plate_parser import looks_like_plate_export, parse_plate_export, row_label
+
+
+def _block(values, delimiter='\t'):
+    """열 번호 헤더 + 행 이름(A, B, ...)으로 시작하는 매트릭스 블록 (NaN은 OVRFLW로 기록)"""
+    lines = [delimiter.join([''] + [str(c + 1) for c in range(values.shape[1])])]
+    for r, row in enumerate(values):
+        cells = ['OVRFLW' if np.isnan(v) else str(v) for v in row]
+        lines.append(delimiter.join([row_label(r)] + cells))
+    return lines
+
+
+@pytest.fixture
+def export():
+    rng = np.random.default_rng(3)
+    blocks = [
+        ('Plate 1', 'Read 1: 450nm', '\t', rng.uniform(0, 2, (3, 4)).round(3)),
+        ('Plate 1', 'Read 2: 600nm', '\t', rng.uniform(0, 2, (3, 4)).round(3)),
+        ('Plate 2', 'Read 1: 450nm', ',', rng.uniform(0, 2, (2, 5)).round(3)),
+    ]
+    blocks[0][3][1, 3] = np.nan
+    lines = ['Software Version 3.1', '']
+    for plate, read, delimiter, values in blocks:
+        lines += [plate, read, '']
+        lines += _block(values, delimiter)
+        lines.append('')
+    return '\n'.join(lines), blocks
+
+
+def test_parse_matches_brute_force(export):
+    text, blocks = export
+    expected = pd.DataFrame(
+        [(plate, f"{row_label(r)}{c + 1}", row_label(r), c + 1, read, values[r, c])
+         for plate, read, _, values in blocks
+         for r in range(values.shape[0]) for c in range(values.shape[1])],
+        columns=['plate', 'well', 'row', 'col', 'read', 'value']
+    )
+
+    tidy = parse_plate_export(text.encode())
+
+    pd.testing.assert_frame_equal(tidy.astype({'col': int}), expected.astype({'col': int}),
+                                  check_dtype=False)
+
+
+def test_parse_restores_caller_stream_position(export):
+    stream = io.BytesIO(export[0].encode())
+
+    assert looks_like_plate_export(stream)
+    assert stream.tell() == 0
+    assert len(parse_plate_export(stream)) == 12 + 12 + 10
+
+
+def test_plain_table_is_not_a_plate_export():
+    assert not looks_like_plate_export(b'sample,value\nA,1\nB,2\n')
+    assert parse_plate_export(b'sample,value\nA,1\nB,2\n').empty
@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from agents.qpcr import STANDALONE_IMPORT, delta_delta_ct, is_qpcr_request
+
+
+@pytest.fixture
+def plate():
+    rng = np.random.default_rng(2)
+    rows = []
+    for sample, shift in [('Control', 0.0), ('Treated', -2.0), ('Knockdown', 1.5)]:
+        for gene, base in [('GAPDH', 18.0), ('ACTB', 17.0), ('IL6', 25.0), ('TNF', 27.0)]:
+            target_shift = shift if gene in ('IL6', 'TNF') else 0.0
+            for ct in base + target_shift + rng.normal(0.0, 0.1, 3):
+                rows.append((sample, gene, ct))
+    return pd.DataFrame(rows, columns=['Sample', 'Target', 'Ct'])
+
+
+def test_standalone_fallback_matches_engine(plate):
+    namespace = {}
+    exec(STANDALONE_IMPORT.replace('from agents.qpcr import delta_delta_ct', 'raise ImportError'),
+         namespace)
+    args = (plate, 'Sample', 'Target', 'Ct', ['GAPDH', 'ACTB'], 'Control')
+
+    fallback = namespace['delta_delta_ct'](*args)['results']
+    engine = delta_delta_ct(*args)['results']
+
+    for column in ['delta_ct', 'delta_delta_ct', 'fold_change', 'fold_change_low',
+                   'fold_change_high']:
+        np.testing.assert_allclose(fallback[column], engine[column])
+
+
+def test_is_qpcr_request():
+    assert is_qpcr_request('ΔΔCt로 fold change 계산')
+    assert is_qpcr_request('그룹 비교', columns=['Sample', 'Cq'])
+    assert not is_qpcr_request('상관관계 히트맵', columns=['height', 'weight'])
+
+
+@pytest.fixture
+def textbook():
+    # 대조군 ΔCt = 30 - 20 = 10, 처리군 ΔCt = 28 - 20.5 = 7.5 → ΔΔCt = -2.5
+    return pd.DataFrame({
+        'Sample': ['Control', 'Control', 'Treated', 'Treated', 'Treated', 'Treated'],
+        'Target': ['GAPDH', 'IL6', 'GAPDH', 'IL6', 'IL6', 'IL6'],
+        'Ct': [20.0, 30.0, 20.5, 27.9, 28.1, 'Undetermined'],
+    })
+
+
+def test_delta_delta_ct_textbook_example(textbook):
+    output = delta_delta_ct(textbook, 'Sample', 'Target', 'Ct', ['GAPDH'], 'Control')
+    treated = output['results'].set_index('Sample').loc['Treated']
+
+    assert treated['n'] == 2
+    assert treated['delta_ct'] == pytest.approx(7.5)
+    assert treated['delta_delta_ct'] == pytest.approx(-2.5)
+    assert treated['fold_change'] == pytest.approx(2 ** 2.5)
+    # 기술 반복 SE = SD/√n = 0.1 (다른 값은 단일 측정이라 SE 0)
+    assert treated['fold_change_low'] == pytest.approx(2 ** 2.4)
+    assert output['results'].set_index('Sample').loc['Control', 'fold_change'] == 1.0
+    assert any('미검출' in warning for warning in output['warnings'])
+
+
+def test_delta_delta_ct_pfaffl_efficiencies(textbook):
+    output = delta_delta_ct(textbook, 'Sample', 'Target', 'Ct', ['GAPDH'], 'Control',
+                            efficiencies={'IL6': 90, 'GAPDH': 2.05})
+    treated = output['results'].set_index('Sample').loc['Treated']
+
+    # Pfaffl: E_target^(Ct_ctrl - Ct_trt) / E_ref^(Ct_ctrl - Ct_trt)
+    expected = 1.9 ** (30.0 - 28.0) / 2.05 ** (20.0 - 20.5)
+    assert treated['fold_change'] == pytest.approx(expected)
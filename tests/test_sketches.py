@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.sketches import HyperLogLog, MisraGries, RowReservoir
+
+
+@pytest.mark.parametrize('n_distinct', [10, 1_000, 200_000])
+def test_hyperloglog_relative_error(n_distinct):
+    hll = HyperLogLog(precision=12)
+    values = np.arange(n_distinct)
+    for chunk in np.array_split(np.concatenate([values, values[::3]]), 7):
+        hll.add(chunk)  # 중복은 추정에 영향 없음
+
+    assert abs(hll.count() - n_distinct) <= 4 * hll.relative_error * n_distinct
+
+
+def test_hyperloglog_merge_equals_union():
+    left, right, union = HyperLogLog(10), HyperLogLog(10), HyperLogLog(10)
+    words = np.array([f'id-{i}' for i in range(5_000)], dtype=object)
+    left.add(words[:3_000])
+    right.add(words[2_000:])
+    union.add(words)
+
+    np.testing.assert_array_equal(left.merge(right).registers, union.registers)
+
+
+def _zipf_stream(n=50_000, seed=5):
+    rng = np.random.default_rng(seed)
+    return np.array([f'v{k}' for k in rng.zipf(1.3, n) % 5_000], dtype=object)
+
+
+def _assert_misra_gries_bounds(sketch, stream):
+    truth = pd.Series(stream).value_counts()
+    estimate = sketch.counts.reindex(truth.index, fill_value=0)
+
+    assert sketch.total == len(stream)
+    assert sketch.error <= len(stream) / (sketch.capacity + 1)
+    assert len(sketch.counts) <= sketch.capacity
+    assert (estimate <= truth).all()
+    assert (truth - estimate <= sketch.error).all()
+    # 전체의 1/(capacity+1)보다 자주 나오는 값은 반드시 남음
+    assert set(truth[truth > len(stream) / (sketch.capacity + 1)].index) <= set(sketch.counts.index)
+
+
+def test_misra_gries_error_bounds():
+    stream = _zipf_stream()
+    sketch = MisraGries(capacity=32)
+    for chunk in np.array_split(stream, 9):
+        sketch.update(chunk)
+
+    _assert_misra_gries_bounds(sketch, stream)
+    assert sketch.top(1)[0][0] == pd.Series(stream).value_counts().index[0]
+
+
+def test_misra_gries_merge_error_bounds():
+    stream = _zipf_stream()
+    parts = []
+    for chunk in np.array_split(stream, 4):
+        part = MisraGries(capacity=32)
+        part.update(chunk)
+        parts.append(part)
+    merged = parts[0]
+    for part in parts[1:]:
+        merged.merge(part)
+
+    _assert_misra_gries_bounds(merged, stream)
+
+
+def test_reservoir_quantiles_within_rank_error():
+    n, size = 200_000, 2_000
+    rng = np.random.default_rng(6)
+    values = rng.permutation(n).astype(float)
+    reservoir = RowReservoir(size=size, seed=7)
+    for chunk in np.array_split(values, 13):
+        reservoir.add(pd.DataFrame({'x': chunk}, index=np.arange(len(chunk))))
+
+    sample = reservoir.sample
+    assert len(sample) == size and sample.index.is_unique
+    # 인덱스는 원래 행 번호
+    np.testing.assert_array_equal(sample['x'].to_numpy(), values[sample.index])
+
+    qs = (0.1, 0.25, 0.5, 0.75, 0.9)
+    ranks = reservoir.quantiles('x', qs) / (n - 1)  # 값 = 0..n-1의 순열이므로 값/(n-1) = 순위
+    assert np.abs(ranks - np.asarray(qs)).max() <= reservoir.rank_error(0.99)
+
+
+def test_reservoir_is_exact_below_size():
+    values = np.arange(500, dtype=float)
+    reservoir = RowReservoir(size=1_000)
+    reservoir.add(pd.DataFrame({'x': values[:200]}))
+    reservoir.add(pd.DataFrame({'x': values[200:]}))
+
+    assert reservoir.rank_error() == 0.0
+    np.testing.assert_allclose(reservoir.quantiles('x'), np.quantile(values, [0.25, 0.5, 0.75]))
@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from agents.validator import ExperimentValidator
+
+
+@pytest.fixture
+def replicates():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'plate': np.repeat(['P1', 'P2'], 12),
+        'sample': np.tile(np.repeat(['A', 'B', 'C'], 4), 2),
+        'value': rng.normal(10.0, 0.1, 24),
+    })
+    df.loc[5, 'value'] = 50.0
+    return df
+
+
+@pytest.mark.parametrize('method', ['mad', 'iqr', 'hampel'])
+def test_detect_outliers_robust_multi_column_groups(replicates, method):
+    validator = ExperimentValidator()
+    flags = validator.detect_outliers_robust(replicates, 'value', ['plate', 'sample'],
+                                             method=method, window=3)
+
+    combined = replicates.assign(key=replicates['plate'] + '/' + replicates['sample'])
+    expected = ExperimentValidator().detect_outliers_robust(combined, 'value', 'key',
+                                                            method=method, window=3)
+
+    pd.testing.assert_frame_equal(flags, expected)
+    assert flags.loc[5, 'value']
+
+
+def test_compute_replicate_stats_multi_column_groups(replicates):
+    stats = ExperimentValidator().compute_replicate_stats(replicates, ['plate', 'sample'], 'value')
+
+    assert list(stats[['plate', 'sample']].itertuples(index=False, name=None)) == [
+        ('P1', 'A'), ('P1', 'B'), ('P1', 'C'), ('P2', 'A'), ('P2', 'B'), ('P2', 'C')
+    ]
+    assert (stats['n'] == 4).all()
+    assert not stats.loc[1, 'is_consistent']
+
+
+def test_memoized_results_follow_contamination():
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame(rng.normal(size=(400, 2)), columns=['x', 'y'])
+    validator = ExperimentValidator()
+
+    default = validator.detect_outliers_auto(df, ['x', 'y'])['mask'].sum()
+    validator.contamination = 0.02
+    lower = validator.detect_outliers_auto(df, ['x', 'y'])['mask'].sum()
+
+    assert default == 40
+    assert lower == 8
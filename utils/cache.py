@@ -0,0 +1,89 @@
+"""데이터 지문(fingerprint) 계산과 크기 제한이 있는 LRU 캐시"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Iterable, Optional
+
+import pandas as pd
+
+
+def dataframe_fingerprint(df: pd.DataFrame, columns: Optional[Iterable[str]] = None) -> str:
+    """
+    DataFrame 내용 기반 지문 (같은 데이터면 같은 값, 값이 하나라도 바뀌면 다른 값)
+
+    컬럼명, dtype, 인덱스, 모든 셀 값을 행 단위 해시(pandas 벡터 연산)로 요약합니다.
+    """
+    data = df if columns is None else df[list(columns)]
+    digest = hashlib.sha1()
+    digest.update(repr(tuple(data.columns)).encode('utf-8'))
+    digest.update(repr(tuple(str(dtype) for dtype in data.dtypes)).encode('utf-8'))
+    row_hashes = pd.util.hash_pandas_object(data, index=True).to_numpy()
+    digest.update(row_hashes.tobytes())
+    return digest.hexdigest()[:20]
+
+
+class BoundedCache:
+    """항목 수가 제한된 스레드 안전 LRU 캐시 (hit/miss 카운터 포함)"""
+
+    def __init__(self, max_entries: int = 64):
+        self.max_entries = max(1, max_entries)
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key: Hashable, value: Any):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """캐시에 있으면 반환, 없으면 compute()로 계산 후 저장"""
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is sentinel:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def invalidate(self, predicate: Optional[Callable[[Hashable], bool]] = None) -> int:
+        """predicate(key)가 True인 항목 제거 (None이면 전체), 제거한 개수 반환"""
+        with self._lock:
+            keys = [k for k in self._data if predicate is None or predicate(k)]
+            for key in keys:
+                del self._data[key]
+            return len(keys)
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'entries': len(self._data),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': (self.hits / total) if total else None
+            }
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._data
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
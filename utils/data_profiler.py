@@ -1,41 +1,838 @@
+import json
+import os
+import re
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
 import pandas as pd
 import numpy as np
-from typing import Dict, Any
+from typing import Dict, Any, Callable, Iterable, List, Optional, Tuple
+
+from utils.cache import BoundedCache, dataframe_fingerprint
+from utils.sketches import HyperLogLog, MisraGries, RowReservoir
+
+# 수치 통계 블록 하나의 최대 크기 (편차 계산용 임시 배열이 이 크기를 넘지 않도록 열 단위로 나눔)
+BLOCK_BYTES = 64 * 1024 * 1024
+
+# 이 행 수를 넘으면 get_data_profile이 자동으로 근사(스케치) 모드 사용
+APPROX_ROW_THRESHOLD = 1_000_000
+APPROX_CHUNK_ROWS = 500_000
+QUANTILES = (0.25, 0.5, 0.75)
+
+# 상관 행렬은 앞쪽 수치 열 CORR_MAX_COLUMNS개, 행이 많으면 CORR_MAX_ROWS행 무작위 표본으로 계산
+CORR_MAX_COLUMNS = 50
+CORR_MAX_ROWS = 20_000
+
+# 열이 이 수 이상이면 열 샤드를 스레드 풀에서 병렬 처리 (적으면 스레드 오버헤드가 더 큼)
+PARALLEL_MIN_COLUMNS = 64
+
+# 열이 이 수보다 많으면 to_markdown이 이름 패턴/타입이 같은 열을 묶어 요약 (프롬프트 크기 제한)
+WIDE_COLUMN_THRESHOLD = 200
+WIDE_MIN_GROUP_SIZE = 3       # 이보다 작은 묶음은 개별/타입별 '기타'로 표시
+WIDE_MAX_GROUPS = 30
+WIDE_DETAIL_COLUMNS = 20      # 묶이지 않은 열이 이 수 이하면 한 줄씩 표시
+WIDE_PREVIEW_COLUMNS = 12
+
+# 데이터 지문 → DataProfile (Streamlit rerun/여러 컴포넌트가 같은 데이터를 다시 프로파일링하지 않도록)
+_PROFILE_CACHE = BoundedCache(max_entries=8)
+
 
-def get_data_profile(df: pd.DataFrame) -> str:
+def _is_block_numeric(dtype) -> bool:
+    """NumPy 2차원 블록으로 한 번에 계산할 수 있는 수치 타입 (확장 타입 Int64/Float64 등 제외)"""
+    return isinstance(dtype, np.dtype) and dtype.kind in 'biuf'
+
+
+def _series_stats(series: pd.Series) -> tuple:
+    """확장 타입/빈 데이터용 열 단위 통계 (pandas 메서드 그대로)"""
+    return series.isnull().sum(), series.mean(), series.std(), series.min(), series.max()
+
+
+def _block_stats(values: np.ndarray) -> List[tuple]:
     """
-    Pandas DataFrame의 상세 정보를 텍스트 요약으로 변환합니다.
+    같은 dtype 열들을 (열 수, 행 수) 배열로 받아 (결측 수, 평균, 표준편차, 최소, 최대)를 한 번에 계산
+
+    pandas와 같은 방식(결측 제외 합/개수, 평균 편차 제곱합 / (n - 1))이라 결과가 같고,
+    최소/최대는 원래 dtype 스칼라(np.int64, np.bool_ 등)로 반환합니다.
     """
-    if df is None:
-        return "데이터가 없습니다."
+    n_rows = values.shape[1]
+    with warnings.catch_warnings(), np.errstate(invalid='ignore', divide='ignore'):
+        warnings.simplefilter('ignore', RuntimeWarning)
+        if values.dtype.kind == 'f':
+            missing = np.isnan(values)
+            null_count = missing.sum(axis=1)
+            has_missing = null_count.any()
+            filled = np.where(missing, 0, values) if has_missing else values
+            count = n_rows - null_count
+            mean = filled.sum(axis=1, dtype=np.float64) / count
+            deviation = filled - mean[:, None]
+            if has_missing:
+                deviation[missing] = 0
+            minimum, maximum = np.fmin.reduce(values, axis=1), np.fmax.reduce(values, axis=1)
+        else:
+            null_count = np.zeros(len(values), dtype=np.int64)
+            count = np.full(len(values), n_rows)
+            deviation = values.astype(np.float64)
+            mean = deviation.sum(axis=1) / count
+            deviation -= mean[:, None]
+            minimum, maximum = values.min(axis=1), values.max(axis=1)
+        deviation **= 2
+        std = np.sqrt(np.where(count > 1, deviation.sum(axis=1) / (count - 1), np.nan))
+    return list(zip(null_count, mean, std, minimum, maximum))
+
 
-    summary = []
-    summary.append(f"### [데이터 기본 정보]")
-    summary.append(f"- 크기: {df.shape[0]} 행 x {df.shape[1]} 열")
-    summary.append(f"- 컬럼 목록: {', '.join(df.columns.tolist())}")
-    
-    summary.append(f"\n### [컬럼별 상세 정보]")
-    for col in df.columns:
-        dtype = df[col].dtype
-        null_count = df[col].isnull().sum()
-        null_pct = (null_count / len(df)) * 100
-        
-        col_info = f"- **{col}**: 타입={dtype}, 결측치={null_count}({null_pct:.1f}%)"
-        
-        if pd.api.types.is_numeric_dtype(df[col]):
-            mean = df[col].mean()
-            std = df[col].std()
-            min_val = df[col].min()
-            max_val = df[col].max()
-            col_info += f", 통계=[평균:{mean:.2f}, 표준편차:{std:.2f}, 범위:{min_val}~{max_val}]"
+def _text_counts(series: pd.Series) -> tuple:
+    """
+    문자열/object 열의 (결측 수, 고유값 수, 상위 3개 값)을 해시 한 번으로 계산
+
+    factorize의 고유값은 처음 등장한 순서이고, 개수 내림차순 안정 정렬을 하므로
+    value_counts().head(3)과 같은 순서(동률이면 먼저 나온 값 우선)가 됩니다.
+    """
+    codes, uniques = pd.factorize(series.to_numpy(dtype=object))
+    counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    top = np.argsort(-counts, kind='stable')[:3]
+    return len(series) - counts.sum(), len(uniques), [uniques[i] for i in top]
+
+
+def _numeric_stats(df: pd.DataFrame, columns: List[int]) -> Dict[int, tuple]:
+    """수치 열 통계: dtype이 같은 열끼리 묶어 블록 단위로 계산 (열 위치 → 통계)"""
+    stats = {}
+    by_dtype: Dict[Any, List[int]] = {}
+    dtypes = df.dtypes.to_numpy()
+    for position in columns:
+        dtype = dtypes[position]
+        if len(df) and _is_block_numeric(dtype):
+            by_dtype.setdefault(dtype, []).append(position)
         else:
-            unique_count = df[col].nunique()
-            top_values = df[col].value_counts().head(3).index.tolist()
-            col_info += f", 고유값 수={unique_count}, 상위 항목={top_values}"
-            
-        summary.append(col_info)
+            stats[position] = _series_stats(df.iloc[:, position])
+
+    for dtype, positions in by_dtype.items():
+        width = max(1, BLOCK_BYTES // (len(df) * 8))
+        for start in range(0, len(positions), width):
+            chunk = positions[start:start + width]
+            # pandas 블록은 (열, 행) 순서로 저장되므로 전치하면 대개 복사 없이 행 방향 연속 배열
+            values = np.ascontiguousarray(df.iloc[:, chunk].to_numpy(dtype=dtype).T)
+            stats.update(zip(chunk, _block_stats(values)))
+    return stats
+
 
-    summary.append(f"\n### [데이터 샘플 (상위 5행)]")
-    summary.append(df.head(5).to_markdown())
+def _resolve_workers(workers: Optional[int], n_columns: int) -> int:
+    """작업 스레드 수 (None이면 열이 PARALLEL_MIN_COLUMNS개 이상일 때만 CPU 코어 수)"""
+    if workers is None:
+        workers = (os.cpu_count() or 1) if n_columns >= PARALLEL_MIN_COLUMNS else 1
+    return max(1, min(workers, n_columns))
 
-    return "\n".join(summary)
+
+def _map_column_shards(func: Callable[[pd.DataFrame, List[int]], Dict[int, Any]],
+                       df: pd.DataFrame, positions: List[int],
+                       workers: Optional[int] = None) -> Dict[int, Any]:
+    """
+    열 위치를 연속 구간(샤드)으로 나눠 func(df, shard)를 스레드 풀에서 실행하고 결과 dict를 병합
+
+    열 통계는 NumPy 축소 연산(GIL 해제)이 대부분이라 스레드로 병렬화되고, 프로세스 풀과 달리
+    DataFrame을 직렬화해 복사하지 않습니다. 샤드를 작업자 수보다 잘게(×4) 나눠 dtype마다 다른
+    열 비용을 고르게 분산합니다.
+    """
+    workers = _resolve_workers(workers, len(positions))
+    if workers <= 1:
+        return func(df, positions)
+    shards = [shard.tolist() for shard in np.array_split(np.asarray(positions), workers * 4)
+              if len(shard)]
+    merged = {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for part in pool.map(lambda shard: func(df, shard), shards):
+            merged.update(part)
+    return merged
+
+
+def _profile_shard(df: pd.DataFrame, positions: List[int]) -> Dict[int, Dict[str, Any]]:
+    """열 위치 목록의 프로파일 (열 위치 → profile_columns 항목)"""
+    dtypes = df.dtypes.to_numpy()
+    numeric = [i for i in positions if pd.api.types.is_numeric_dtype(dtypes[i])]
+    stats = _numeric_stats(df, numeric)
+
+    profiles = {}
+    for position in positions:
+        profile = {'name': df.columns[position], 'dtype': dtypes[position],
+                   'numeric': position in stats}
+        if profile['numeric']:
+            (null_count, profile['mean'], profile['std'],
+             profile['min'], profile['max']) = stats[position]
+        elif (pd.api.types.is_object_dtype(profile['dtype'])
+              or pd.api.types.is_string_dtype(profile['dtype'])):
+            (null_count, profile['unique_count'],
+             profile['top_values']) = _text_counts(df.iloc[:, position])
+        else:
+            # 범주형/날짜 등은 value_counts 한 번으로 결측 수/고유값 수/상위 항목을 함께 구함
+            # (범주형은 관측되지 않은 범주도 0으로 포함되므로 고유값 수에서 제외)
+            counts = df.iloc[:, position].value_counts()
+            null_count = len(df) - counts.sum()
+            profile['unique_count'] = int((counts > 0).sum())
+            profile['top_values'] = counts.head(3).index.tolist()
+        profile['null_count'] = np.int64(null_count)
+        profile['null_pct'] = (profile['null_count'] / len(df)) * 100
+        profiles[position] = profile
+    return profiles
+
+
+def profile_columns(df: pd.DataFrame, workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    컬럼별 프로파일 (수치 열은 dtype별 블록 통계, 문자열 열은 factorize 1회, 그 외 value_counts 1회)
+
+    결측 수도 같은 패스에서 구합니다 (수치: NaN 수, 그 외: 전체 행 수 - 값 개수 합).
+    열이 많으면 열 샤드를 스레드 풀에서 나눠 계산합니다 (결과는 순차 계산과 같음).
+
+    Args:
+        workers: 작업 스레드 수 (None이면 열 수에 따라 자동, 1이면 순차)
+
+    Returns:
+        [{'name', 'dtype', 'null_count', 'null_pct', 'numeric',
+          'mean', 'std', 'min', 'max'} 또는 {..., 'unique_count', 'top_values'}, ...]
+    """
+    positions = list(range(df.shape[1]))
+    profiles = _map_column_shards(_profile_shard, df, positions, workers)
+    return [profiles[position] for position in positions]
+
+
+def _to_builtin(value: Any) -> Any:
+    """JSON 직렬화용 변환 (NumPy 스칼라 → Python 값, 결측 → None, 날짜 → ISO 문자열)"""
+    if isinstance(value, (list, tuple)):
+        return [_to_builtin(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _to_builtin(v) for k, v in value.items()}
+    if isinstance(value, (pd.Timestamp, pd.Timedelta)):
+        return None if pd.isna(value) else value.isoformat()
+    if isinstance(value, np.generic):
+        value = value.item()
+    if value is None or (not isinstance(value, str) and pd.api.types.is_scalar(value)
+                         and pd.isna(value)):
+        return None
+    if isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+
+def _correlations(data: pd.DataFrame) -> Tuple[pd.DataFrame, int]:
+    """수치 열 Pearson 상관 행렬과 계산에 쓴 행 수 (열/행 수 상한 적용)"""
+    data = data.iloc[:, :CORR_MAX_COLUMNS]
+    if data.shape[1] < 2 or len(data) < 3:
+        return pd.DataFrame(), 0
+    if len(data) > CORR_MAX_ROWS:
+        data = data.sample(CORR_MAX_ROWS, random_state=0)
+    values = data.apply(pd.to_numeric, errors='coerce').astype(float)
+    return values.corr(), len(values)
+
+
+@dataclass
+class ColumnProfile:
+    """컬럼 하나의 프로파일 (통계 값은 원래 dtype 스칼라 그대로 보관)"""
+
+    name: Any
+    dtype: Any
+    numeric: bool
+    null_count: int
+    null_pct: float
+    mean: Any = None
+    std: Any = None
+    min: Any = None
+    max: Any = None
+    unique_count: Optional[int] = None
+    top_values: List[Any] = field(default_factory=list)
+    # 근사(스케치) 프로파일 전용
+    approximate: bool = False
+    quantiles: Dict[float, float] = field(default_factory=dict)
+    rank_error: float = 0.0
+    unique_error: float = 0.0
+    top_error: int = 0
+    # 청크마다 수치/문자열 추론이 달랐던 열 (앞선 수치 청크를 놓쳤으면 고유값 수는 하한)
+    mixed_types: bool = False
+    unique_lower_bound: bool = False
+
+    def to_markdown(self) -> str:
+        """LLM 프롬프트용 한 줄 요약"""
+        line = f"- **{self.name}**: 타입={self.dtype}, 결측치={self.null_count}({self.null_pct:.1f}%)"
+        if self.numeric:
+            line += (f", 통계=[평균:{self.mean:.2f}, 표준편차:{self.std:.2f}, "
+                     f"범위:{self.min}~{self.max}]")
+            if self.approximate:
+                q1, median, q3 = (self.quantiles[q] for q in QUANTILES)
+                line += f", 분위수≈[Q1:{q1:.2f}, 중앙값:{median:.2f}, Q3:{q3:.2f}]"
+        elif not self.approximate:
+            line += f", 고유값 수={self.unique_count}, 상위 항목={self.top_values}"
+        else:
+            if self.mixed_types:
+                line += ", 타입 혼재(일부 청크는 수치로 추론)"
+            relation = '≥' if self.unique_lower_bound else '≈' if self.unique_error else '='
+            line += f", 고유값 수{relation}{self.unique_count}"
+            if not self.top_values:
+                line += f", 상위 항목=없음 (모든 값의 빈도 ≤ {self.top_error}행)"
+            else:
+                line += f", 상위 항목={self.top_values}"
+                if self.top_error:
+                    line += f" (빈도 과소추정 최대 {self.top_error}행)"
+        return line
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {
+            'name': _to_builtin(self.name),
+            'dtype': str(self.dtype),
+            'numeric': self.numeric,
+            'null_count': int(self.null_count),
+            'null_pct': _to_builtin(self.null_pct),
+            'approximate': self.approximate
+        }
+        if self.numeric:
+            data.update({key: _to_builtin(getattr(self, key))
+                         for key in ('mean', 'std', 'min', 'max')})
+            if self.approximate:
+                data['quantiles'] = {str(q): _to_builtin(v) for q, v in self.quantiles.items()}
+                data['rank_error'] = self.rank_error
+        else:
+            data['unique_count'] = _to_builtin(self.unique_count)
+            data['top_values'] = _to_builtin(self.top_values)
+            if self.approximate:
+                data['unique_error'] = self.unique_error
+                data['top_error'] = int(self.top_error)
+                if self.mixed_types:
+                    data['mixed_types'] = True
+                    data['unique_lower_bound'] = self.unique_lower_bound
+        return data
+
+
+def _name_pattern(name: Any) -> str:
+    """컬럼 이름의 숫자 부분을 #으로 (signal_12 → signal_#, ENSG00000141510 → ENSG#)"""
+    return re.sub(r'\d+', '#', str(name))
+
+
+def _as_float(value: Any) -> float:
+    return np.nan if pd.isna(value) else float(value)
+
+
+def _value_range(values: Iterable[Any]) -> Tuple[float, float]:
+    """결측을 뺀 (최소, 최대), 값이 없으면 (nan, nan)"""
+    array = np.array([_as_float(v) for v in values], dtype=float)
+    array = array[~np.isnan(array)]
+    return (float(array.min()), float(array.max())) if array.size else (np.nan, np.nan)
+
+
+def _example_names(members: List[ColumnProfile]) -> str:
+    names = [str(column.name) for column in members]
+    return ', '.join(names) if len(names) <= 3 else f"{names[0]}, {names[1]}, …, {names[-1]}"
+
+
+def _group_summary(label: str, members: List[ColumnProfile]) -> Dict[str, Any]:
+    """비슷한 열 묶음 하나의 요약 (column_groups의 한 행)"""
+    null_pct = np.array([_as_float(column.null_pct) for column in members])
+    summary = {
+        'group': label,
+        'dtype': str(members[0].dtype),
+        'numeric': members[0].numeric,
+        'n_columns': len(members),
+        'examples': _example_names(members),
+        'null_columns': sum(int(column.null_count) > 0 for column in members),
+        'max_null_pct': float(np.nanmax(null_pct)) if not np.isnan(null_pct).all() else np.nan,
+        'mean_min': np.nan, 'mean_max': np.nan, 'std_min': np.nan, 'std_max': np.nan,
+        'min': np.nan, 'max': np.nan, 'constant_columns': 0,
+        'unique_min': np.nan, 'unique_max': np.nan, 'top_values': ''
+    }
+    if summary['numeric']:
+        summary['mean_min'], summary['mean_max'] = _value_range(column.mean for column in members)
+        summary['std_min'], summary['std_max'] = _value_range(column.std for column in members)
+        summary['min'] = _value_range(column.min for column in members)[0]
+        summary['max'] = _value_range(column.max for column in members)[1]
+        summary['constant_columns'] = sum(_as_float(column.std) == 0 for column in members)
+    else:
+        summary['unique_min'], summary['unique_max'] = _value_range(
+            column.unique_count for column in members)
+        # 열마다의 최빈값 중 자주 나오는 값 (범주 열 묶음의 대표 값)
+        modes = pd.Series([str(column.top_values[0]) for column in members if column.top_values],
+                          dtype=object)
+        summary['top_values'] = ', '.join(modes.value_counts().head(3).index) if len(modes) else ''
+        summary['constant_columns'] = sum(column.unique_count == 1 for column in members)
+    return summary
+
+
+def _group_line(group: Dict[str, Any]) -> str:
+    """묶음 요약 한 줄 (넓은 표 프롬프트용)"""
+    line = (f"- **{group['group']}** ({group['dtype']}, {group['n_columns']:,}열: "
+            f"{group['examples']}): ")
+    if group['numeric']:
+        line += (f"평균 {group['mean_min']:.4g}~{group['mean_max']:.4g}, "
+                 f"표준편차 {group['std_min']:.4g}~{group['std_max']:.4g}, "
+                 f"값 범위 {group['min']:.4g}~{group['max']:.4g}")
+    else:
+        line += f"고유값 수 {group['unique_min']:.0f}~{group['unique_max']:.0f}"
+        if group['top_values']:
+            line += f", 열별 최빈값 중 흔한 값 [{group['top_values']}]"
+    if group['null_columns']:
+        line += f", 결측 있는 열 {group['null_columns']:,}개(최대 {group['max_null_pct']:.1f}%)"
+    if group['constant_columns']:
+        line += f", 값이 하나뿐인 열 {group['constant_columns']:,}개"
+    return line
+
+
+@dataclass
+class DataProfile:
+    """
+    데이터셋 프로파일 (코드 생성 프롬프트, 품질 검증, 리포트, UI가 같은 객체를 공유)
+
+    build_data_profile(cache=True)는 데이터 지문 기준으로 캐시된 객체를 돌려줄 수 있으므로
+    읽기 전용으로 사용합니다.
+    """
+
+    n_rows: int
+    columns: List[ColumnProfile]
+    preview: pd.DataFrame                       # 상위 5행 (근사 프로파일은 무작위 표본 5행)
+    correlations: pd.DataFrame = field(default_factory=pd.DataFrame)   # 수치 열 Pearson 상관
+    correlation_rows: int = 0                   # 상관 계산에 쓴 행 수 (n_rows보다 작으면 표본)
+    approximate: bool = False
+    approximation_note: str = ''                # 근사 방법/오차 설명 (프롬프트에 그대로 포함)
+    fingerprint: Optional[str] = None
+
+    @property
+    def n_cols(self) -> int:
+        return len(self.columns)
+
+    @property
+    def column_names(self) -> List[Any]:
+        return [column.name for column in self.columns]
+
+    @property
+    def numeric_columns(self) -> List[Any]:
+        return [column.name for column in self.columns if column.numeric]
+
+    def column(self, name: Any) -> ColumnProfile:
+        for column in self.columns:
+            if column.name == name:
+                return column
+        raise KeyError(name)
+
+    def strong_correlations(self, threshold: float = 0.7) -> List[Tuple[Any, Any, float]]:
+        """|r| ≥ threshold인 수치 열 쌍 [(열1, 열2, r)] (|r| 내림차순)"""
+        if self.correlations.empty:
+            return []
+        matrix = self.correlations.to_numpy()
+        names = self.correlations.columns
+        rows, cols = np.triu_indices(len(names), k=1)
+        r = matrix[rows, cols]
+        keep = np.flatnonzero(np.abs(np.nan_to_num(r)) >= threshold)
+        keep = keep[np.argsort(-np.abs(r[keep]), kind='stable')]
+        return [(names[rows[i]], names[cols[i]], float(r[i])) for i in keep]
+
+    def group_columns(self, min_size: int = WIDE_MIN_GROUP_SIZE, max_groups: int = WIDE_MAX_GROUPS
+                      ) -> Tuple[List[Tuple[str, List[ColumnProfile]]], List[ColumnProfile]]:
+        """
+        이름 패턴(숫자 → #)과 dtype이 같은 열 묶음, 묶이지 않은 열
+
+        min_size개 이상인 묶음만 인정하고, 묶음이 max_groups개를 넘으면 큰 묶음부터 남깁니다.
+        묶음은 처음 등장한 순서입니다.
+        """
+        candidates: Dict[tuple, List[ColumnProfile]] = {}
+        for column in self.columns:
+            key = (_name_pattern(column.name), str(column.dtype))
+            candidates.setdefault(key, []).append(column)
+        groups = [(key, members) for key, members in candidates.items() if len(members) >= min_size]
+        if len(groups) > max_groups:
+            largest = sorted(groups, key=lambda item: -len(item[1]))[:max_groups]
+            kept = {key for key, _ in largest}
+            groups = [(key, members) for key, members in groups if key in kept]
+        grouped = {id(column) for _, members in groups for column in members}
+        leftovers = [column for column in self.columns if id(column) not in grouped]
+        return [(key[0], members) for key, members in groups], leftovers
+
+    def column_groups(self, min_size: int = WIDE_MIN_GROUP_SIZE,
+                      max_groups: int = WIDE_MAX_GROUPS) -> pd.DataFrame:
+        """
+        넓은 표용 열 묶음 요약 표 (묶음당 1행, 묶이지 않은 열은 dtype별 '기타' 행)
+
+        Returns:
+            group, dtype, numeric, n_columns, examples, null_columns, max_null_pct,
+            mean_min/max, std_min/max, min, max, constant_columns, unique_min/max, top_values
+        """
+        groups, leftovers = self.group_columns(min_size, max_groups)
+        by_dtype: Dict[str, List[ColumnProfile]] = {}
+        for column in leftovers:
+            by_dtype.setdefault(str(column.dtype), []).append(column)
+        rows = [_group_summary(label, members) for label, members in groups]
+        rows += [_group_summary('기타', members) for members in by_dtype.values()]
+        return pd.DataFrame(rows, columns=[
+            'group', 'dtype', 'numeric', 'n_columns', 'examples', 'null_columns', 'max_null_pct',
+            'mean_min', 'mean_max', 'std_min', 'std_max', 'min', 'max', 'constant_columns',
+            'unique_min', 'unique_max', 'top_values'
+        ])
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, fingerprint: Optional[str] = None,
+                   workers: Optional[int] = None) -> "DataProfile":
+        """메모리의 DataFrame 전체로 정확한 프로파일 생성 (workers: profile_columns 참고)"""
+        columns = [ColumnProfile(**profile) for profile in profile_columns(df, workers)]
+        numeric = [position for position, column in enumerate(columns) if column.numeric]
+        correlations, correlation_rows = _correlations(df.iloc[:, numeric])
+        return cls(
+            n_rows=len(df),
+            columns=columns,
+            preview=df.head(5).copy(),
+            correlations=correlations,
+            correlation_rows=correlation_rows,
+            fingerprint=fingerprint
+        )
+
+    @classmethod
+    def from_sketch(cls, profiler: "SketchProfiler", confidence: float = 0.95,
+                    fingerprint: Optional[str] = None) -> "DataProfile":
+        """SketchProfiler 결과로 근사 프로파일 생성 (상관은 저수지 표본 기준)"""
+        columns = [ColumnProfile(**profile) for profile in profiler.profiles(confidence)]
+        rank_error = profiler.reservoir.rank_error(confidence)
+        hll_error = HyperLogLog(profiler.hll_precision).relative_error
+        note = (
+            f"근사 프로파일: 고유값 수는 HyperLogLog(상대오차 약 ±{hll_error:.1%}), 상위 항목은 "
+            f"Misra-Gries, 분위수는 {min(profiler.reservoir.size, profiler.n_rows)}행 무작위 표본"
+            f"(순위 오차 ±{rank_error:.1%}, 신뢰수준 {confidence:.0%}) 기준입니다. "
+            f"결측치/평균/표준편차/범위는 정확한 값입니다."
+        )
+        sample = profiler.reservoir.sample
+        numeric = [position for position, column in enumerate(columns) if column.numeric]
+        correlations, correlation_rows = (_correlations(sample.iloc[:, numeric]) if len(sample)
+                                          else (pd.DataFrame(), 0))
+        return cls(
+            n_rows=profiler.n_rows,
+            columns=columns,
+            preview=profiler.preview(5).copy(),
+            correlations=correlations,
+            correlation_rows=correlation_rows,
+            approximate=True,
+            approximation_note=note,
+            fingerprint=fingerprint
+        )
+
+    def to_markdown(self, max_columns: Optional[int] = WIDE_COLUMN_THRESHOLD) -> str:
+        """
+        LLM 프롬프트용 텍스트 (get_data_profile의 출력)
+
+        열이 max_columns개를 넘으면 비슷한 열을 묶은 요약으로 바꿔 프롬프트 크기를 열 수와
+        무관하게 유지합니다 (None이면 항상 열마다 한 줄).
+        """
+        if max_columns is not None and self.n_cols > max_columns:
+            return self._wide_markdown()
+
+        summary = []
+        summary.append("### [데이터 기본 정보]")
+        summary.append(f"- 크기: {self.n_rows} 행 x {self.n_cols} 열")
+        summary.append(f"- 컬럼 목록: {', '.join(map(str, self.column_names))}")
+        if self.approximation_note:
+            summary.append(f"- {self.approximation_note}")
+
+        summary.append("\n### [컬럼별 상세 정보]")
+        summary.extend(column.to_markdown() for column in self.columns)
+
+        summary.append(f"\n### [데이터 샘플 ({'무작위 표본 5행' if self.approximate else '상위 5행'})]")
+        summary.append(self.preview.to_markdown())
+
+        return "\n".join(summary)
+
+    def _wide_markdown(self) -> str:
+        """넓은 표 요약: 컬럼 목록 일부, 타입별 열 수, 열 묶음 요약, 앞쪽 열만의 미리보기"""
+        names = list(map(str, self.column_names))
+        dtype_counts = pd.Series([str(column.dtype) for column in self.columns]).value_counts()
+        groups, leftovers = self.group_columns()
+
+        summary = []
+        summary.append("### [데이터 기본 정보]")
+        summary.append(f"- 크기: {self.n_rows} 행 x {self.n_cols} 열")
+        summary.append(f"- 컬럼 목록 (처음 {WIDE_DETAIL_COLUMNS}개): "
+                       f"{', '.join(names[:WIDE_DETAIL_COLUMNS])} "
+                       f"… 외 {len(names) - WIDE_DETAIL_COLUMNS:,}개")
+        type_counts = ', '.join(f'{dtype} {count:,}개' for dtype, count in dtype_counts.items())
+        summary.append(f"- 타입별 열 수: {type_counts}")
+        if self.approximation_note:
+            summary.append(f"- {self.approximation_note}")
+        summary.append("- 열이 많아 이름 패턴(숫자 → #)과 타입이 같은 열을 묶어 요약했습니다. "
+                       "특정 열의 세부 통계가 필요하면 코드에서 직접 계산하세요.")
+
+        summary.append("\n### [컬럼 그룹 요약]")
+        summary.extend(_group_line(_group_summary(label, members)) for label, members in groups)
+        if len(leftovers) <= WIDE_DETAIL_COLUMNS:
+            if leftovers:
+                summary.append("\n### [개별 컬럼 상세 정보]")
+                summary.extend(column.to_markdown() for column in leftovers)
+        else:
+            # 묶이지 않은 열이 많으면 dtype별 '기타'로 요약 (몇 개뿐인 dtype은 한 줄씩)
+            by_dtype: Dict[str, List[ColumnProfile]] = {}
+            for column in leftovers:
+                by_dtype.setdefault(str(column.dtype), []).append(column)
+            summary.extend(_group_line(_group_summary('기타', members))
+                           for members in by_dtype.values() if len(members) >= WIDE_MIN_GROUP_SIZE)
+            few = [column for members in by_dtype.values() if len(members) < WIDE_MIN_GROUP_SIZE
+                   for column in members]
+            if few:
+                summary.append("\n### [개별 컬럼 상세 정보]")
+                summary.extend(column.to_markdown() for column in few)
+
+        sample_label = '무작위 표본 5행' if self.approximate else '상위 5행'
+        summary.append(f"\n### [데이터 샘플 ({sample_label}, 처음 {WIDE_PREVIEW_COLUMNS}열)]")
+        summary.append(self.preview.iloc[:, :WIDE_PREVIEW_COLUMNS].to_markdown())
+
+        return "\n".join(summary)
+
+    def to_dict(self) -> Dict[str, Any]:
+        preview_columns = [str(c) for c in self.preview.columns]
+        return {
+            'n_rows': int(self.n_rows),
+            'n_cols': self.n_cols,
+            'approximate': self.approximate,
+            'approximation_note': self.approximation_note,
+            'fingerprint': self.fingerprint,
+            'columns': [column.to_dict() for column in self.columns],
+            'correlations': {
+                str(a): {str(b): _to_builtin(r) for b, r in row.items()}
+                for a, row in self.correlations.to_dict(orient='index').items()
+            } if self.correlations.columns.is_unique else {},
+            'correlation_rows': self.correlation_rows,
+            'preview': [
+                dict(zip(preview_columns, _to_builtin(list(row))))
+                for row in self.preview.itertuples(index=False)
+            ]
+        }
+
+    def to_json(self, **kwargs) -> str:
+        kwargs.setdefault('ensure_ascii', False)
+        return json.dumps(self.to_dict(), **kwargs)
+
+    def to_frame(self) -> pd.DataFrame:
+        """UI 표시용 컬럼 요약 표 (컬럼당 1행)"""
+        def number(column: ColumnProfile, value: Any) -> Optional[float]:
+            return float(value) if column.numeric and not pd.isna(value) else None
+
+        rows = []
+        for column in self.columns:
+            rows.append({
+                'name': str(column.name),
+                'dtype': str(column.dtype),
+                'null_count': int(column.null_count),
+                'null_pct': (round(float(column.null_pct), 2)
+                             if not pd.isna(column.null_pct) else None),
+                'mean': number(column, column.mean),
+                'std': number(column, column.std),
+                'min': number(column, column.min),
+                'max': number(column, column.max),
+                'unique_count': column.unique_count,
+                'top_values': ', '.join(map(str, column.top_values)) if not column.numeric else ''
+            })
+        frame = pd.DataFrame(rows, columns=['name', 'dtype', 'null_count', 'null_pct', 'mean',
+                                            'std', 'min', 'max', 'unique_count', 'top_values'])
+        frame['unique_count'] = frame['unique_count'].astype('Int64')
+        return frame
+
+
+def _chunk_value_counts(df: pd.DataFrame, positions: List[int]) -> Dict[int, tuple]:
+    """열 위치 → (고유값 배열(처음 등장 순), 개수 배열)"""
+    result = {}
+    for position in positions:
+        codes, uniques = pd.factorize(df.iloc[:, position].to_numpy(dtype=object))
+        result[position] = (uniques, np.bincount(codes[codes >= 0], minlength=len(uniques)))
+    return result
+
+
+class SketchProfiler:
+    """
+    청크 단위 근사 프로파일 (메모리 사용량은 행 수와 무관)
+
+    - 결측 수, 평균/표준편차(Chan 병합), 최소/최대: 정확
+    - 고유값 수: HyperLogLog (상위 항목 카운터가 넘치지 않은 열은 정확)
+    - 상위 항목: Misra-Gries (빈도는 최대 top_error만큼 과소 추정)
+    - 분위수/미리보기 행: 행 저수지 표본 (순위 오차는 DKW 상한)
+
+    update(chunk)로 청크를 차례로 넣고 profiles()로 profile_columns와 같은 형식의
+    목록을 얻습니다 (근사 필드가 추가됨). 청크별 열 집계는 profile_columns처럼 열 샤드 단위로
+    병렬 계산하고, 스케치 병합만 순차로 합니다.
+    """
+
+    def __init__(self, sample_size: int = 10_000, hll_precision: int = 12,
+                 top_capacity: int = 64, seed: Optional[int] = 0,
+                 workers: Optional[int] = None):
+        self.hll_precision = hll_precision
+        self.workers = workers
+        self.top_capacity = top_capacity
+        self.reservoir = RowReservoir(sample_size, seed)
+        self.n_rows = 0
+        self.columns: List[Any] = []
+        self.dtypes: Dict[Any, Any] = {}
+        self._numeric: Dict[Any, Dict[str, Any]] = {}
+        self._text: Dict[Any, Dict[str, Any]] = {}
+
+    def update(self, chunk: pd.DataFrame):
+        if not self.columns:
+            self.columns = chunk.columns.tolist()
+        dtypes = chunk.dtypes.to_numpy()
+        for col, dtype in zip(chunk.columns, dtypes):
+            if col not in self.dtypes:
+                self.dtypes[col] = dtype
+            elif self.dtypes[col] != dtype:
+                # 청크마다 추론된 타입이 다르면(예: 정수 → 실수) 더 넓은 타입으로 표시
+                widen = _is_block_numeric(self.dtypes[col]) and _is_block_numeric(dtype)
+                self.dtypes[col] = (np.result_type(self.dtypes[col], dtype) if widen
+                                    else np.dtype(object))
+
+        numeric = [i for i, dtype in enumerate(dtypes) if pd.api.types.is_numeric_dtype(dtype)]
+        text = sorted(set(range(len(dtypes))) - set(numeric))
+        numeric_stats = _map_column_shards(_numeric_stats, chunk, numeric, self.workers)
+        for position in numeric:
+            nulls, mean, std, minimum, maximum = numeric_stats[position]
+            col = chunk.columns[position]
+            count = len(chunk) - int(nulls)
+            m2 = float(std) ** 2 * (count - 1) if count > 1 else 0.0
+            self._merge_moments(col, int(nulls), count, float(mean) if count else 0.0, m2,
+                                minimum, maximum)
+
+        # 이미 문자열로 추론된 적이 있는 열은 수치 청크 값도 고유값/상위 항목 스케치에 합침
+        # (결측 수는 수치 상태에서 이미 셌으므로 더하지 않음)
+        mixed = [position for position in numeric if chunk.columns[position] in self._text]
+        value_counts = _map_column_shards(_chunk_value_counts, chunk, text + mixed, self.workers)
+        for position in text + mixed:
+            col = chunk.columns[position]
+            is_text = not pd.api.types.is_numeric_dtype(dtypes[position])
+            state = self._text.get(col)
+            if state is None:
+                state = self._text[col] = {
+                    'nulls': 0, 'hll': HyperLogLog(self.hll_precision),
+                    'top': MisraGries(self.top_capacity),
+                    # 이 열이 처음 문자열로 추론되기 전 수치 청크에서 놓친 값 수
+                    'missed': self._numeric.get(col, {}).get('count', 0)
+                }
+            uniques, counts = value_counts[position]
+            if is_text:
+                state['nulls'] += len(chunk) - int(counts.sum())
+            state['hll'].add(uniques)
+            state['top'].update_counts(uniques, counts)
+
+        self.reservoir.add(chunk)
+        self.n_rows += len(chunk)
+
+    def _merge_moments(self, col, nulls, count, mean, m2, minimum, maximum):
+        state = self._numeric.get(col)
+        if state is None:
+            self._numeric[col] = {'nulls': nulls, 'count': count, 'mean': mean, 'm2': m2,
+                                  'min': minimum if count else np.nan,
+                                  'max': maximum if count else np.nan}
+            return
+        state['nulls'] += nulls
+        if count == 0:
+            return
+        total = state['count'] + count
+        delta = mean - state['mean']
+        state['m2'] += m2 + delta * delta * state['count'] * count / total
+        state['mean'] += delta * count / total
+        state['count'] = total
+        state['min'] = minimum if pd.isna(state['min']) else min(state['min'], minimum)
+        state['max'] = maximum if pd.isna(state['max']) else max(state['max'], maximum)
+
+    def profiles(self, confidence: float = 0.95) -> List[Dict[str, Any]]:
+        rank_error = self.reservoir.rank_error(confidence)
+        profiles = []
+        for col in self.columns:
+            profile = {'name': col, 'dtype': self.dtypes[col], 'approximate': True}
+            if col in self._numeric and col not in self._text:
+                state = self._numeric[col]
+                count = state['count']
+                profile.update({
+                    'numeric': True,
+                    'null_count': np.int64(state['nulls']),
+                    'mean': state['mean'] if count else np.nan,
+                    'std': np.sqrt(state['m2'] / (count - 1)) if count > 1 else np.nan,
+                    'min': state['min'],
+                    'max': state['max'],
+                    'quantiles': dict(zip(QUANTILES, self.reservoir.quantiles(col, QUANTILES))),
+                    'rank_error': rank_error
+                })
+            else:
+                # 수치/문자열이 섞인 열: 첫 문자열 청크 이후의 수치 청크는 스케치에 합쳐졌고,
+                # 그 전에 놓친 수치 값(missed)은 상위 항목 오차에 더하고 고유값 수는 하한으로 표시
+                state = self._text[col]
+                missed = state['missed']
+                exact = state['top'].error == 0 and missed == 0
+                numeric_nulls = self._numeric.get(col, {}).get('nulls', 0)
+                profile.update({
+                    'numeric': False,
+                    'null_count': np.int64(state['nulls'] + numeric_nulls),
+                    'unique_count': len(state['top'].counts) if exact else state['hll'].count(),
+                    'unique_error': 0.0 if exact else state['hll'].relative_error,
+                    'top_values': [value for value, _ in state['top'].top(3)],
+                    'top_error': state['top'].error + missed,
+                    'mixed_types': col in self._numeric,
+                    'unique_lower_bound': missed > 0
+                })
+            profile['null_pct'] = ((profile['null_count'] / self.n_rows) * 100
+                                   if self.n_rows else np.nan)
+            profiles.append(profile)
+        return profiles
+
+    def preview(self, n: int = 5) -> pd.DataFrame:
+        """표본에서 파일 전체에 고르게 퍼진 n행 (원래 행 번호 순)"""
+        sample = self.reservoir.sample
+        if len(sample) <= n:
+            return sample
+        return sample.iloc[np.linspace(0, len(sample) - 1, n).round().astype(int)]
+
+
+def approximate_profile(chunks: Iterable[pd.DataFrame], **kwargs) -> SketchProfiler:
+    """청크 스트림을 SketchProfiler로 요약"""
+    profiler = SketchProfiler(**kwargs)
+    for chunk in chunks:
+        profiler.update(chunk)
+    return profiler
+
+
+def format_approximate_profile(profiler: SketchProfiler, confidence: float = 0.95) -> str:
+    """SketchProfiler 결과를 get_data_profile과 같은 구성의 텍스트로"""
+    return DataProfile.from_sketch(profiler, confidence).to_markdown()
+
+
+def build_data_profile(df: pd.DataFrame, approximate: Optional[bool] = None,
+                       row_threshold: int = APPROX_ROW_THRESHOLD,
+                       fingerprint: Optional[str] = None,
+                       cache: bool = False) -> DataProfile:
+    """
+    DataFrame의 DataProfile 생성
+
+    지문 계산은 전체 셀을 해시하므로(200k×220에서 약 0.6초) 기본적으로 캐시를 쓰지 않고
+    바로 계산합니다. 반환된 객체를 보관해 재사용하는 호출자(app, batch_cli)는 그대로 쓰고,
+    같은 데이터를 반복해서 프로파일링하는 경우에만 cache=True로 지문 기준 캐시를 사용하세요.
+    이미 계산한 지문을 fingerprint로 넘기면 추가 해시 없이 캐시를 사용합니다.
+
+    Args:
+        approximate: True면 스케치 기반 근사 프로파일, None이면 행 수가 row_threshold를
+                     넘을 때만 근사 모드 사용
+        fingerprint: utils.cache.dataframe_fingerprint(df) 값
+        cache: True면 지문(없으면 계산)을 키로 이전 객체 재사용
+    """
+    if approximate is None:
+        approximate = len(df) > row_threshold
+    if fingerprint is None and cache:
+        fingerprint = dataframe_fingerprint(df)
+
+    def compute() -> DataProfile:
+        if approximate:
+            chunks = (df.iloc[start:start + APPROX_CHUNK_ROWS]
+                      for start in range(0, len(df), APPROX_CHUNK_ROWS))
+            return DataProfile.from_sketch(approximate_profile(chunks), fingerprint=fingerprint)
+        return DataProfile.from_frame(df, fingerprint=fingerprint)
+
+    if fingerprint is None:
+        return compute()
+    return _PROFILE_CACHE.get_or_compute((fingerprint, approximate), compute)
+
+
+def get_data_profile(df: pd.DataFrame, approximate: Optional[bool] = None,
+                     row_threshold: int = APPROX_ROW_THRESHOLD,
+                     max_columns: Optional[int] = WIDE_COLUMN_THRESHOLD) -> str:
+    """
+    Pandas DataFrame의 상세 정보를 텍스트 요약으로 변환합니다.
+
+    Args:
+        approximate: True면 스케치 기반 근사 프로파일, None이면 행 수가 row_threshold를
+                     넘을 때만 근사 모드 사용
+        max_columns: 열이 이보다 많으면 비슷한 열을 묶어 요약 (None이면 열마다 한 줄)
+    """
+    if df is None:
+        return "데이터가 없습니다."
+    return build_data_profile(df, approximate, row_threshold).to_markdown(max_columns)
@@ -0,0 +1,249 @@
+"""플레이트 리더 출력(96/384-well 매트릭스 블록) 스트리밍 파서 → tidy DataFrame"""
+
+import io
+import re
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+DELIMITERS = ('\t', ',', ';')
+MAX_PLATE_ROWS = 32  # A..Z, AA..AF (1536-well까지)
+
+_PLATE_LABEL = re.compile(r'plate', re.IGNORECASE)
+_READ_LABEL = re.compile(r'read|wavelength|\d+\s*nm|ex\s*\d|em\s*\d', re.IGNORECASE)
+
+Source = Union[str, Path, bytes, IO]
+
+
+def row_label(index: int) -> str:
+    """0 → 'A', 25 → 'Z', 26 → 'AA' (1536-well 행 이름 규칙)"""
+    if index < 26:
+        return chr(ord('A') + index)
+    return 'A' + chr(ord('A') + index - 26)
+
+
+ROW_LABELS = [row_label(i) for i in range(MAX_PLATE_ROWS)]
+
+
+@dataclass
+class _Layout:
+    """같은 구분자/열 위치/열 수를 가진 블록들의 원문 줄 버퍼 (한 번의 read_csv로 파싱)"""
+
+    delimiter: str
+    offset: int       # 첫 번째 값 열의 위치 (행 이름은 offset - 1)
+    n_cols: int
+    lines: List[str] = field(default_factory=list)
+    max_fields: int = 0
+    block_ids: List[int] = field(default_factory=list)
+    block_rows: List[int] = field(default_factory=list)
+
+
+@contextmanager
+def _open_text(source: Source) -> Iterator[IO[str]]:
+    """경로/바이트/파일 객체를 텍스트 스트림으로 (호출자의 파일 객체는 닫지 않고 처음 위치로 되돌림)"""
+    if isinstance(source, (str, Path)):
+        with open(source, 'r', encoding='utf-8-sig', errors='replace', newline='') as f:
+            yield f
+        return
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+    if hasattr(source, 'seek'):
+        source.seek(0)
+    if isinstance(source, io.TextIOBase):
+        yield source
+    else:
+        wrapper = io.TextIOWrapper(source, encoding='utf-8-sig', errors='replace', newline='')
+        try:
+            yield wrapper
+        finally:
+            wrapper.detach()
+    if hasattr(source, 'seek'):
+        source.seek(0)
+
+
+def _match_header(line: str) -> Optional[Tuple[str, int, int]]:
+    """열 번호 헤더 줄이면 (구분자, 첫 값 열 위치, 열 수), 아니면 None"""
+    for delimiter in DELIMITERS:
+        if delimiter not in line:
+            continue
+        cells = [cell.strip().strip('"') for cell in line.split(delimiter)]
+        try:
+            offset = cells.index('1')
+        except ValueError:
+            continue
+        if offset < 1:
+            continue
+        n_cols = 0
+        for cell in cells[offset:]:
+            if cell != str(n_cols + 1):
+                break
+            n_cols += 1
+        if n_cols >= 2 and not any(cells[offset + n_cols:]):
+            return delimiter, offset, n_cols
+    return None
+
+
+def _clean_label(line: str) -> str:
+    """블록 앞의 설명 줄에서 구분자/공백 정리"""
+    text = line
+    for delimiter in DELIMITERS:
+        text = text.replace(delimiter, ' ')
+    return ' '.join(text.split())
+
+
+class PlateExportParser:
+    """
+    플레이트 리더 출력 파일을 한 줄씩 읽으며 매트릭스 블록을 찾아 tidy 형태로 변환
+
+    블록 = 열 번호 헤더 줄(1, 2, ..., N) + 행 이름(A, B, ...)으로 시작하는 연속된 줄.
+    블록 앞의 설명 줄에서 'Plate ...'는 플레이트 이름, 'Read ...'/'450nm' 등은 측정(read)
+    이름으로 사용합니다. 블록의 원문 줄은 레이아웃별로 모아 두었다가 마지막에 한 번의
+    pd.read_csv로 숫자 행렬을 만들고, 행/열/웰 인덱스는 NumPy repeat/tile로 계산합니다.
+    """
+
+    def __init__(self, max_rows: int = MAX_PLATE_ROWS):
+        self.max_rows = min(max_rows, MAX_PLATE_ROWS)
+
+    def iter_blocks(self, lines: Iterable[str]
+                    ) -> Iterator[Tuple[str, int, int, List[str], List[str]]]:
+        """
+        (구분자, 첫 값 열 위치, 열 수, 블록 앞 설명 줄들, 데이터 줄들)을 블록마다 생성
+
+        줄은 한 번만 순회하며 데이터 줄은 행 이름 칸까지만 분할해 확인합니다.
+        """
+        context: List[str] = []
+        header = None
+        block: List[str] = []
+
+        for raw in lines:
+            line = raw.rstrip('\r\n')
+            if header is not None:
+                delimiter, offset, n_cols = header
+                parts = line.split(delimiter, offset)
+                if (len(block) < self.max_rows and len(parts) > offset
+                        and parts[offset - 1].strip().strip('"') == ROW_LABELS[len(block)]):
+                    block.append(line)
+                    continue
+                if block:
+                    yield delimiter, offset, n_cols, context, block
+                    context = []
+                header, block = None, []
+
+            if not line.strip():
+                continue
+            matched = _match_header(line)
+            if matched:
+                header = matched
+            else:
+                context.append(line)
+                del context[:-5]  # 블록 바로 앞 몇 줄만 레이블 후보로 유지
+
+        if header is not None and block:
+            yield header[0], header[1], header[2], context, block
+
+    def parse(self, source: Source) -> pd.DataFrame:
+        """
+        Returns:
+            ['plate', 'well', 'row', 'col', 'read', 'value'] DataFrame
+            (블록 순서 → 행 → 열 순, 숫자가 아닌 값(OVRFLW 등)은 NaN)
+        """
+        layouts = {}
+        plates: List[str] = []
+        reads: List[str] = []
+        current_plate = None
+        read_counter = 0
+        with _open_text(source) as stream:
+            blocks = enumerate(self.iter_blocks(stream))
+            for block_id, (delimiter, offset, n_cols, context, rows) in blocks:
+                plate_labels = [_clean_label(c) for c in context if _PLATE_LABEL.search(c)]
+                read_labels = [_clean_label(c) for c in context if _READ_LABEL.search(c)]
+                if plate_labels and plate_labels[-1] != current_plate:
+                    current_plate = plate_labels[-1]
+                    read_counter = 0
+                read_counter += 1
+                plates.append(current_plate)
+                reads.append(read_labels[-1] if read_labels else str(read_counter))
+
+                layout = layouts.setdefault(
+                    (delimiter, offset, n_cols), _Layout(delimiter, offset, n_cols)
+                )
+                layout.lines.extend(rows)
+                layout.max_fields = max(layout.max_fields,
+                                        max(r.count(delimiter) for r in rows) + 1)
+                layout.block_ids.append(block_id)
+                layout.block_rows.append(len(rows))
+
+        if not plates:
+            return pd.DataFrame(columns=['plate', 'well', 'row', 'col', 'read', 'value'])
+
+        # 플레이트 레이블이 하나도 없으면: 블록마다 별도 플레이트 (read 레이블이 있으면 같은 플레이트)
+        if all(p is None for p in plates):
+            if any(not r.isdigit() for r in reads):
+                plates = ['1'] * len(plates)
+            else:
+                plates = [str(i + 1) for i in range(len(plates))]
+                reads = ['1'] * len(reads)
+        plate_arr = np.asarray([p if p is not None else '1' for p in plates], dtype=object)
+        read_arr = np.asarray(reads, dtype=object)
+
+        frames = [self._tidy_layout(layout, plate_arr, read_arr) for layout in layouts.values()]
+        tidy = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+        if len(frames) > 1:
+            tidy = tidy.sort_values('_block', kind='stable', ignore_index=True)
+        return tidy.drop(columns='_block')
+
+    @staticmethod
+    def _tidy_layout(layout: _Layout, plate_arr: np.ndarray, read_arr: np.ndarray) -> pd.DataFrame:
+        """레이아웃 하나의 모든 블록을 read_csv 한 번 + repeat/tile로 tidy 변환"""
+        matrix = pd.read_csv(
+            io.StringIO('\n'.join(layout.lines)),
+            sep=layout.delimiter,
+            header=None,
+            names=list(range(layout.max_fields)),
+            usecols=list(range(layout.offset, layout.offset + layout.n_cols)),
+            dtype=str,
+            skipinitialspace=True,
+            keep_default_na=False,
+            engine='c'
+        )
+        values = matrix.apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float)
+
+        block_rows = np.asarray(layout.block_rows)
+        line_block = np.repeat(np.asarray(layout.block_ids), block_rows)
+        starts = np.repeat(np.cumsum(block_rows) - block_rows, block_rows)
+        line_row = np.arange(len(line_block)) - starts
+
+        n_cols = layout.n_cols
+        row_idx = np.repeat(line_row, n_cols)
+        col_idx = np.tile(np.arange(n_cols), len(line_block))
+        block_idx = np.repeat(line_block, n_cols)
+
+        row_names = np.asarray(ROW_LABELS, dtype=object)
+        well_grid = np.asarray(
+            [[f"{r}{c + 1}" for c in range(n_cols)] for r in ROW_LABELS], dtype=object
+        )
+        return pd.DataFrame({
+            'plate': plate_arr[block_idx],
+            'well': well_grid[row_idx, col_idx],
+            'row': row_names[row_idx],
+            'col': col_idx + 1,
+            'read': read_arr[block_idx],
+            'value': values.ravel(),
+            '_block': block_idx
+        })
+
+
+def parse_plate_export(source: Source, max_rows: int = MAX_PLATE_ROWS) -> pd.DataFrame:
+    """플레이트 리더 출력 파일(경로, 바이트, 업로드 파일 객체)을 tidy DataFrame으로 변환"""
+    return PlateExportParser(max_rows=max_rows).parse(source)
+
+
+def looks_like_plate_export(source: Source, max_lines: int = 200) -> bool:
+    """앞부분 max_lines 줄 안에 매트릭스 블록(열 번호 헤더 + A행)이 있으면 True"""
+    with _open_text(source) as stream:
+        head = [line for _, line in zip(range(max_lines), stream)]
+    return any(True for _ in PlateExportParser().iter_blocks(head))
@@ -8,6 +8,10 @@ from pathlib import Path
 from typing import Optional, List
 import textwrap
 
+from utils.data_profiler import DataProfile, WIDE_COLUMN_THRESHOLD
+
+PROJECT_ROOT = str(Path(__file__).resolve().parent.parent)
+
 class QuartoRenderer:
     """Quarto 문서 생성 및 렌더링"""
     
@@ -24,9 +28,15 @@ class QuartoRenderer:
         theme: str = "cosmo",
         code_fold: bool = True,
         output_path: Optional[str] = None,
-        data_file_path: Optional[str] = None
+        data_file_path: Optional[str] = None,
+        data_profile: Optional[DataProfile] = None
     ) -> Path:
-        """Quarto 문서 생성 (v3.0 - 들여쓰기 완벽 제거 버전)"""
+        """
+        Quarto 문서 생성 (v3.0 - 들여쓰기 완벽 제거 버전)
+
+        data_profile을 주면 업로드 때 계산한 프로파일로 '데이터 개요' 절을 추가합니다
+        (리포트 렌더링 중에 통계를 다시 계산하지 않음).
+        """
         
         # Determine processing engine based on language
         is_r = any(chunk.get('language', '').lower() == 'r' for chunk in code_chunks)
@@ -191,17 +201,15 @@ class QuartoRenderer:
         lines.append("---")
         lines.append("")
 
+        if data_profile is not None:
+            lines.extend(self._data_overview_lines(data_profile))
+
         # Content Blocks
         for i, chunk in enumerate(code_chunks, 1):
             lang = chunk.get('language', 'python').lower()
 
-            # Handle code that might be a list or string
-            code_raw = chunk.get('code', '')
-            if isinstance(code_raw, list):
-                code = '\n'.join(str(item) for item in code_raw)
-            else:
-                code = str(code_raw) if code_raw else ''
-            code = code.strip()
+            # 코드는 생성 단계(AnalysisResult)에서 이미 검증/정리된 문자열
+            code = (chunk.get('code') or '').strip()
 
             # Handle caption that might be a list
             caption_raw = chunk.get('caption', f'Analysis {i}')
@@ -312,25 +320,6 @@ class QuartoRenderer:
             
             # Add the actual code
             if code:
-                # Safety check: Remove JSON wrapper if it exists (belt and suspenders)
-                code = code.strip()
-                if code.startswith('{') and '"code"' in code:
-                    try:
-                        # Try to parse as JSON and extract code field
-                        import json as json_lib
-                        json_obj = json_lib.loads(code)
-                        if isinstance(json_obj, dict) and 'code' in json_obj:
-                            code = json_obj['code']
-                            if isinstance(code, list):
-                                code = '\n'.join(str(item) for item in code)
-                    except:
-                        # If JSON parsing fails, try regex extraction
-                        code_match = re.search(r'"code"\s*:\s*"([^"]*(?:\\.[^"]*)*)"', code, re.DOTALL)
-                        if code_match:
-                            code = code_match.group(1)
-                            # Unescape JSON strings
-                            code = code.replace('\\n', '\n').replace('\\t', '\t').replace('\\"', '"')
-
                 # Clean up code: ensure proper line breaks and comment handling
                 code_lines = code.split('\n')
                 cleaned_code_lines = []
@@ -491,6 +480,49 @@ class QuartoRenderer:
         
         return output_path
     
+    @staticmethod
+    def _data_overview_lines(profile: DataProfile, max_correlations: int = 10) -> List[str]:
+        """데이터 개요 절 (크기, 컬럼 요약 표, 강한 상관관계, 넓은 표는 열 묶음 요약 표)"""
+        lines = ["## 데이터 개요 {.unnumbered}", ""]
+        lines.append(f"- **크기**: {profile.n_rows:,}행 × {profile.n_cols:,}열")
+        if profile.approximate:
+            lines.append(f"- **참고**: {profile.approximation_note}")
+        lines.append("")
+        if profile.n_cols > WIDE_COLUMN_THRESHOLD:
+            lines.append("이름 패턴(숫자 → #)과 타입이 같은 열을 묶은 요약입니다.")
+            lines.append("")
+            table = profile.column_groups().drop(columns=['numeric']).rename(columns={
+                'group': '열 묶음', 'dtype': '타입', 'n_columns': '열 수', 'examples': '예시',
+                'null_columns': '결측 있는 열', 'max_null_pct': '최대 결측률(%)',
+                'mean_min': '평균(최소)', 'mean_max': '평균(최대)', 'std_min': '표준편차(최소)',
+                'std_max': '표준편차(최대)', 'min': '최소', 'max': '최대',
+                'constant_columns': '상수 열', 'unique_min': '고유값 수(최소)',
+                'unique_max': '고유값 수(최대)', 'top_values': '흔한 최빈값'
+            })
+        else:
+            table = profile.to_frame().rename(columns={
+                'name': '컬럼', 'dtype': '타입', 'null_count': '결측치', 'null_pct': '결측률(%)',
+                'mean': '평균', 'std': '표준편차', 'min': '최소', 'max': '최대',
+                'unique_count': '고유값 수', 'top_values': '상위 항목'
+            })
+        # 파이프(|)는 마크다운 표 구분자이므로 이스케이프
+        table = table.astype(object).where(table.notna(), '').replace(r'\|', r'\\|', regex=True)
+        lines.append(table.to_markdown(index=False, floatfmt='.4g'))
+        lines.append("")
+
+        strong = profile.strong_correlations()[:max_correlations]
+        if strong:
+            basis = (f"{profile.correlation_rows:,}행 무작위 표본 기준"
+                     if profile.correlation_rows < profile.n_rows else "전체 행 기준")
+            lines.append(f"**강한 상관관계 (|r| ≥ 0.7, {basis})**")
+            lines.append("")
+            for a, b, r in strong:
+                lines.append(f"- {a} ↔ {b}: r = {r:.3f}")
+            lines.append("")
+        lines.append("---")
+        lines.append("")
+        return lines
+
     def _decode_output(self, output_bytes: bytes) -> str:
         """한글 윈도우(CP949)와 UTF-8 모두 대응하는 디코딩"""
         for encoding in ['utf-8', 'cp949', 'euc-kr']:
@@ -514,6 +546,8 @@ class QuartoRenderer:
         env['PYTHONIOENCODING'] = 'utf-8'
         env['LANG'] = 'ko_KR.UTF-8'
         env['LC_ALL'] = 'ko_KR.UTF-8'
+        # 생성 코드가 내장 분석 모듈(agents.qpcr 등)을 import할 수 있도록 프로젝트 루트 추가
+        env['PYTHONPATH'] = os.pathsep.join(filter(None, [PROJECT_ROOT, env.get('PYTHONPATH')]))
         
         # Ensure working directory is correct
         work_dir = str(qmd_path.parent)
@@ -613,6 +647,8 @@ class QuartoRenderer:
         env['PYTHONIOENCODING'] = 'utf-8'
         env['LANG'] = 'ko_KR.UTF-8'
         env['LC_ALL'] = 'ko_KR.UTF-8'
+        # 생성 코드가 내장 분석 모듈(agents.qpcr 등)을 import할 수 있도록 프로젝트 루트 추가
+        env['PYTHONPATH'] = os.pathsep.join(filter(None, [PROJECT_ROOT, env.get('PYTHONPATH')]))
         
         work_dir = str(qmd_path.parent)
         
@@ -4,7 +4,11 @@
 from datetime import datetime
 from pathlib import Path
 import base64
+import html as html_lib
 import io
+from typing import Optional
+
+from utils.data_profiler import DataProfile, WIDE_COLUMN_THRESHOLD
 
 class SimpleHTMLRenderer:
     """Quarto CLI 없이 Python만으로 HTML 생성"""
@@ -16,7 +20,8 @@ class SimpleHTMLRenderer:
         experiment_date: str,
         code_chunks: list,
         theme: str = "cosmo",
-        include_code: bool = True
+        include_code: bool = True,
+        data_profile: Optional[DataProfile] = None
     ) -> str:
         """
         간단한 HTML 리포트 생성
@@ -28,6 +33,7 @@ class SimpleHTMLRenderer:
             code_chunks: 코드 블록 리스트 [{'code': str, 'caption': str, 'interpretation': str}]
             theme: 테마 (현재는 cosmo만 지원)
             include_code: 코드 포함 여부
+            data_profile: 주면 컬럼 요약 표와 강한 상관관계로 '데이터 개요' 절 추가
 
         Returns:
             HTML 문자열
@@ -226,7 +232,12 @@ class SimpleHTMLRenderer:
 
         html += """            </ol>
         </div>
+"""
 
+        if data_profile is not None:
+            html += SimpleHTMLRenderer._data_overview_html(data_profile)
+
+        html += """
         <!-- Analysis Sections -->
 """
 
@@ -291,3 +302,33 @@ class SimpleHTMLRenderer:
 """
 
         return html
+
+    @staticmethod
+    def _data_overview_html(profile: DataProfile, max_correlations: int = 10) -> str:
+        """데이터 개요 절 (크기, 컬럼 요약 표, 강한 상관관계)"""
+        # 넓은 표는 열마다 한 행 대신 열 묶음 요약 표 (리포트 크기 제한)
+        wide = profile.n_cols > WIDE_COLUMN_THRESHOLD
+        frame = profile.column_groups() if wide else profile.to_frame()
+        frame = frame.astype(object).where(frame.notna(), '')
+        table = frame.to_html(
+            index=False, float_format=lambda v: f"{v:.4g}",
+            classes='table table-sm table-striped', border=0
+        )
+        note = (f'<p class="text-muted">{html_lib.escape(profile.approximation_note)}</p>'
+                if profile.approximate else '')
+        correlations = ''.join(
+            f'<li>{html_lib.escape(str(a))} ↔ {html_lib.escape(str(b))}: r = {r:.3f}</li>'
+            for a, b, r in profile.strong_correlations()[:max_correlations]
+        )
+        if correlations:
+            correlations = f'<h4>강한 상관관계 (|r| ≥ 0.7)</h4><ul>{correlations}</ul>'
+        return f"""
+        <!-- Data Overview -->
+        <div class="analysis-section" id="data-overview">
+            <h2>📋 데이터 개요</h2>
+            <p>{profile.n_rows:,}행 × {profile.n_cols:,}열</p>
+            {note}
+            <div style="overflow-x: auto;">{table}</div>
+            {correlations}
+        </div>
+"""
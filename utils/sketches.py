@@ -0,0 +1,215 @@
+"""대용량 데이터 근사 프로파일용 스트리밍 스케치 (HyperLogLog, Misra-Gries, 행 저수지 표본)
+
+모든 스케치는 청크 단위로 갱신(update/add)하고 같은 종류끼리 병합(merge)할 수 있어,
+메모리에 다 올라가지 않는 파일이나 병렬 처리 결과도 같은 방식으로 요약합니다.
+"""
+
+import math
+from typing import Any, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def hash_values(values: Any) -> np.ndarray:
+    """값 배열 → uint64 해시 (문자열/숫자 공통, NaN은 호출 전에 제거)"""
+    array = np.asarray(values)
+    if array.dtype.kind not in 'biufcmM':
+        array = array.astype(object)
+    return pd.util.hash_array(array, categorize=False)
+
+
+def _bit_length(values: np.ndarray) -> np.ndarray:
+    """uint64 배열의 비트 길이 (float64로 정확히 표현되도록 상/하위 32비트로 나눠 계산)"""
+    high = (values >> np.uint64(32)).astype(np.float64)
+    low = (values & np.uint64(0xFFFFFFFF)).astype(np.float64)
+    high_bits = np.frexp(high)[1]
+    low_bits = np.frexp(low)[1]
+    return np.where(high > 0, 32 + high_bits, low_bits)
+
+
+class HyperLogLog:
+    """
+    고유값 수 추정 (HyperLogLog, 2^precision개 레지스터)
+
+    상대 표준오차는 약 1.04 / sqrt(2^precision) (precision=12 → 1.6%)이고,
+    작은 수는 선형 계수(linear counting)로 보정합니다.
+    """
+
+    def __init__(self, precision: int = 12):
+        if not 4 <= precision <= 18:
+            raise ValueError("precision은 4~18 사이여야 합니다.")
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    @property
+    def relative_error(self) -> float:
+        return 1.04 / math.sqrt(len(self.registers))
+
+    def add_hashes(self, hashes: np.ndarray):
+        if len(hashes) == 0:
+            return
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        remainder_bits = 64 - self.precision
+        index = (hashes >> np.uint64(remainder_bits)).astype(np.intp)
+        remainder = hashes & np.uint64((1 << remainder_bits) - 1)
+        rank = (remainder_bits - _bit_length(remainder) + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def add(self, values: Any):
+        self.add_hashes(hash_values(values))
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        if other.precision != self.precision:
+            raise ValueError("precision이 다른 HyperLogLog는 병합할 수 없습니다.")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def count(self) -> int:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+
+class MisraGries:
+    """
+    빈도 상위 항목 (Misra-Gries 요약, capacity개 카운터)
+
+    청크별 정확한 (값, 개수)를 받아 병합하며, 카운터가 넘치면 (capacity+1)번째 개수만큼
+    모든 카운터를 줄입니다. 추정 개수는 실제보다 최대 error만큼 작을 수 있고
+    (실제 ∈ [추정, 추정 + error]), 전체의 1/(capacity+1)보다 자주 나오는 값은 반드시 남습니다.
+    """
+
+    def __init__(self, capacity: int = 64):
+        self.capacity = capacity
+        self.counts = pd.Series(dtype=np.int64)
+        self.total = 0
+        self.error = 0
+
+    def update_counts(self, keys: Sequence, counts: Sequence[int]):
+        """미리 집계한 (값, 개수) 병합 (값 순서 = 처음 등장 순서)"""
+        counts = np.asarray(counts, dtype=np.int64)
+        self.total += int(counts.sum())
+        if len(counts) > self.capacity:
+            # 청크를 먼저 capacity개 요약으로 줄인 뒤 병합 (오차 상한은 그대로 N/(capacity+1))
+            cutoff = int(np.partition(counts, -(self.capacity + 1))[-(self.capacity + 1)])
+            keep = np.flatnonzero(counts > cutoff)
+            keys, counts = np.asarray(keys, dtype=object)[keep], counts[keep] - cutoff
+            self.error += cutoff
+        incoming = pd.Series(counts, index=pd.Index(keys, dtype=object), dtype=np.int64)
+        self._absorb(incoming)
+
+    def update(self, values: Any):
+        codes, uniques = pd.factorize(np.asarray(values, dtype=object))
+        counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+        self.update_counts(uniques, counts)
+
+    def merge(self, other: "MisraGries") -> "MisraGries":
+        self.total += other.total
+        self.error += other.error
+        self._absorb(other.counts)
+        return self
+
+    def _absorb(self, incoming: pd.Series):
+        if len(self.counts):
+            combined = pd.concat([self.counts, incoming])
+            combined = combined.groupby(level=0, sort=False).sum()
+        elif incoming.index.is_unique:
+            combined = incoming
+        else:
+            combined = incoming.groupby(level=0, sort=False).sum()
+        if len(combined) > self.capacity:
+            kth = -(self.capacity + 1)
+            cutoff = int(np.partition(combined.to_numpy(), kth)[kth])
+            combined = combined - cutoff
+            combined = combined[combined > 0]
+            self.error += cutoff
+        self.counts = combined
+
+    def top(self, n: int = 3) -> List[Tuple[Any, int]]:
+        """추정 개수 내림차순 상위 n개 [(값, 추정 개수)] (동률이면 먼저 나온 값 우선)"""
+        ordered = self.counts.sort_values(ascending=False, kind='stable').head(n)
+        return list(zip(ordered.index.tolist(), ordered.to_numpy().tolist()))
+
+
+class RowReservoir:
+    """
+    행 저수지 표본 (Algorithm R, 청크 단위 벡터화)
+
+    지금까지 본 모든 행에서 균등하게 size개를 뽑은 표본을 유지합니다. 분위수는 표본에서
+    계산하며, 순위 오차는 DKW 부등식으로 sqrt(ln(2/α) / 2k) 이하입니다 (신뢰수준 1-α).
+    """
+
+    def __init__(self, size: int = 10_000, seed: Optional[int] = 0):
+        self.size = size
+        self.n_seen = 0
+        self._rng = np.random.default_rng(seed)
+        self._pieces: List[pd.DataFrame] = []
+        self._slots: List[np.ndarray] = []
+        self._pending = 0
+        self._sorted: Optional[pd.DataFrame] = None   # sample 캐시 (add 전까지 유효)
+
+    def add(self, chunk: pd.DataFrame):
+        n = len(chunk)
+        if n == 0:
+            return
+        self._sorted = None
+        positions = np.arange(self.n_seen, self.n_seen + n)
+        slots = positions.copy()
+        fill = positions >= self.size
+        slots[fill] = self._rng.integers(0, positions[fill] + 1)
+        accepted = slots < self.size
+        if accepted.any():
+            piece = chunk.iloc[np.flatnonzero(accepted)]
+            piece.index = pd.RangeIndex(self.n_seen, self.n_seen + n)[accepted]
+            self._pieces.append(piece)
+            self._slots.append(slots[accepted])
+            self._pending += int(accepted.sum())
+        self.n_seen += n
+        if self._pending > 4 * self.size:
+            self._compact()
+
+    def _compact(self):
+        """슬롯마다 마지막으로 들어온 행만 남김"""
+        if len(self._pieces) <= 1 and self._pending <= self.size:
+            return
+        rows = pd.concat(self._pieces)
+        slots = np.concatenate(self._slots)
+        _, last_in_reversed = np.unique(slots[::-1], return_index=True)
+        keep = np.sort(len(slots) - 1 - last_in_reversed)
+        self._pieces = [rows.iloc[keep]]
+        self._slots = [slots[keep]]
+        self._pending = len(keep)
+
+    @property
+    def sample(self) -> pd.DataFrame:
+        """표본 행 (원래 행 번호 인덱스, 원래 순서, 열이 많은 표에서 열마다 정렬하지 않도록 캐시)"""
+        if not self._pieces:
+            return pd.DataFrame()
+        if self._sorted is None:
+            self._compact()
+            self._sorted = self._pieces[0].sort_index()
+        return self._sorted
+
+    @property
+    def is_exact(self) -> bool:
+        """본 행 수가 표본 크기 이하라 표본 = 전체인지"""
+        return self.n_seen <= self.size
+
+    def rank_error(self, confidence: float = 0.95) -> float:
+        """분위수 순위 오차 상한 (DKW, 전체를 담고 있으면 0)"""
+        if self.is_exact:
+            return 0.0
+        k = min(self.size, self.n_seen)
+        return math.sqrt(math.log(2 / (1 - confidence)) / (2 * k))
+
+    def quantiles(self, column: Any, qs: Sequence[float] = (0.25, 0.5, 0.75)) -> np.ndarray:
+        values = pd.to_numeric(self.sample[column], errors='coerce').to_numpy(dtype=float)
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return np.full(len(qs), np.nan)
+        return np.quantile(values, qs)
@@ -0,0 +1,121 @@
+"""CSV/Parquet 파일을 청크 단위로 읽어 전체를 메모리에 올리지 않고 프로파일 생성"""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, List, Optional, Union
+
+import pandas as pd
+
+from utils.data_profiler import DataProfile, SketchProfiler
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet 업로드를 쓰지 않으면 필요 없음
+    pq = None
+
+PARQUET_AVAILABLE = pq is not None
+DEFAULT_CHUNK_ROWS = 100_000
+PARQUET_SUFFIXES = ('.parquet', '.pq')
+
+PathLike = Union[str, Path]
+
+
+@dataclass
+class FileProfile:
+    """파일 스트리밍 프로파일 결과"""
+
+    path: str
+    n_rows: int
+    columns: List[str]
+    profile: DataProfile      # 작은 파일은 정확한, 큰 파일은 근사 프로파일
+    sample: pd.DataFrame      # 작은 파일은 전체, 큰 파일은 무작위 표본 행
+    is_complete: bool         # sample이 전체 데이터인지
+    csv_path: Optional[str] = None   # 코드 실행/리포트용 CSV (write_csv를 준 경우)
+
+    @property
+    def text(self) -> str:
+        """LLM에 전달할 프로파일 텍스트 (get_data_profile과 같은 구성)"""
+        return self.profile.to_markdown()
+
+
+def is_parquet(path: PathLike) -> bool:
+    return Path(path).suffix.lower() in PARQUET_SUFFIXES
+
+
+def iter_file_chunks(path: PathLike, chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                     sep: Optional[str] = None) -> Iterator[pd.DataFrame]:
+    """
+    CSV/TSV/Parquet 파일을 chunk_rows행씩 DataFrame으로 생성
+
+    Parquet은 pyarrow의 배치 읽기를 사용합니다 (pyarrow가 없으면 ImportError).
+    sep이 없으면 .tsv/.txt는 탭, 그 외는 쉼표로 읽습니다.
+    """
+    path = Path(path)
+    if is_parquet(path):
+        if pq is None:
+            raise ImportError("Parquet 파일을 읽으려면 pyarrow가 필요합니다: pip install pyarrow")
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows):
+            yield batch.to_pandas()
+        return
+
+    if sep is None:
+        sep = '\t' if path.suffix.lower() in ('.tsv', '.txt') else ','
+    with pd.read_csv(path, sep=sep, chunksize=chunk_rows) as reader:
+        yield from reader
+
+
+def profile_file(path: PathLike, chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                 sep: Optional[str] = None, write_csv: Optional[PathLike] = None,
+                 **sketch_options) -> FileProfile:
+    """
+    파일을 한 번 순회하며 프로파일 생성 (메모리 사용량 ≈ 청크 하나 + 표본)
+
+    파일 전체가 첫 청크에 들어가면 get_data_profile과 같은 정확한 프로파일을,
+    그보다 크면 청크별 통계를 병합하는 SketchProfiler 근사 프로파일을 만듭니다.
+
+    Args:
+        write_csv: 주면 같은 순회에서 쉼표 구분 UTF-8 CSV로 복사 (Parquet/TSV를
+                   'data.csv'를 읽는 생성 코드에 넘길 때)
+        sketch_options: SketchProfiler 옵션 (sample_size, hll_precision, top_capacity, seed)
+    """
+    chunks = iter_file_chunks(path, chunk_rows, sep)
+    first = next(chunks, None)
+    if first is None:
+        first = pd.DataFrame()
+    second = next(chunks, None)
+
+    if write_csv is not None:
+        first.to_csv(write_csv, index=False, encoding='utf-8')
+
+    if second is None:
+        return FileProfile(
+            path=str(path),
+            n_rows=len(first),
+            columns=first.columns.tolist(),
+            profile=DataProfile.from_frame(first),
+            sample=first,
+            is_complete=True,
+            csv_path=str(write_csv) if write_csv is not None else None
+        )
+
+    profiler = SketchProfiler(**sketch_options)
+    profiler.update(first)
+    columns = first.columns.tolist()
+    del first
+
+    chunk = second
+    while chunk is not None:
+        profiler.update(chunk)
+        if write_csv is not None:
+            chunk.to_csv(write_csv, mode='a', header=False, index=False, encoding='utf-8')
+        chunk = next(chunks, None)
+
+    return FileProfile(
+        path=str(path),
+        n_rows=profiler.n_rows,
+        columns=columns,
+        profile=DataProfile.from_sketch(profiler),
+        sample=profiler.reservoir.sample.reset_index(drop=True),
+        is_complete=False,
+        csv_path=str(write_csv) if write_csv is not None else None
+    )